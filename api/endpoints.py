@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional, List, Dict, Any
+import asyncio
 from utils.logger import logger
+from utils.post_store import get_post_store, SORT_COLUMNS
+from utils.topic_analytics import topic_trend_report
+from utils.run_queue import QueueFullError
 from config.settings import Config
 
 router = APIRouter()
@@ -14,37 +19,48 @@ class ExecutionResponse(BaseModel):
     timestamp: datetime
     execution_id: str
 
+class PostsPage(BaseModel):
+    total: int
+    page: int
+    page_size: int
+    posts: List[Dict[str, Any]]
+
+class RunsPage(BaseModel):
+    total: int
+    page: int
+    page_size: int
+    runs: List[Dict[str, Any]]
+
 def verify_api_key(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Verify API key for protected endpoints"""
     if credentials.credentials != Config.API_KEY:
         raise HTTPException(status_code=401, detail="Invalid API key")
     return credentials
 
-@router.post("/execute", response_model=ExecutionResponse)
+@router.post("/execute", response_model=ExecutionResponse, status_code=202)
 async def execute_workflow(request: Request, credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)):
-    """Endpoint to trigger workflow execution on demand"""
+    """Endpoint to trigger workflow execution on demand; poll /executions/{execution_id} for progress"""
     try:
         # Get scheduler instance from app state
         scheduler = request.app.state.scheduler
         
-        if scheduler.is_job_running:
+        # Queue the execution ahead of scheduled runs and answer right away
+        try:
+            record = scheduler.start_execution(trigger='api')
+        except QueueFullError as e:
             raise HTTPException(
-                status_code=409,
-                detail="Workflow already running"
+                status_code=429,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
             )
-        
-        # Execute the workflow
-        execution_id = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        logger.info(f"Starting on-demand execution {execution_id}")
-        
-        # Schedule the execution
-        await scheduler.execute_crew_workflow()
+        attached = record['coalesced'] > 0
+        logger.info(f"{'Attached to' if attached else 'Queued'} on-demand execution {record['execution_id']}")
         
         return ExecutionResponse(
-            status="success",
-            message="Workflow execution initiated",
+            status="attached" if attached else "accepted",
+            message="Joined the identical workflow execution in flight" if attached else "Workflow execution queued",
             timestamp=datetime.utcnow(),
-            execution_id=execution_id
+            execution_id=record['execution_id']
         )
         
     except HTTPException:
@@ -53,22 +69,90 @@ async def execute_workflow(request: Request, credentials: HTTPAuthorizationCrede
         logger.error(f"Error executing workflow: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/executions/{execution_id}")
+async def get_execution(execution_id: str, request: Request, credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)):
+    """Status, current stage, per-stage timing and result of an execution"""
+    try:
+        record = await asyncio.to_thread(request.app.state.scheduler.executions.get, execution_id)
+    except Exception as e:
+        logger.error(f"Error getting execution {execution_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Unknown execution: {execution_id}")
+    return record
+
 @router.get("/status")
 async def get_status(request: Request, credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)):
     """Get current workflow status"""
     try:
-        scheduler = request.app.state.scheduler
-        next_run = None
-        
-        job = scheduler.scheduler.get_job('daily_crew_job')
-        if job:
-            next_run = job.next_run_time
-            
-        return {
-            "is_running": scheduler.is_job_running,
-            "next_scheduled_run": next_run,
-            "timestamp": datetime.utcnow()
-        }
+        status = await request.app.state.scheduler.get_status()
+        return {**status, "timestamp": datetime.utcnow()}
     except Exception as e:
         logger.error(f"Error getting status: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/runs", response_model=RunsPage)
+async def list_runs(
+    request: Request,
+    status: Optional[str] = None,
+    trigger: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)
+):
+    """Workflow execution history, newest first, with per-stage timings"""
+    try:
+        total, runs = await asyncio.to_thread(
+            request.app.state.scheduler.executions.history.list_runs,
+            status=status,
+            trigger=trigger,
+            limit=page_size,
+            offset=(page - 1) * page_size
+        )
+        return RunsPage(total=total, page=page, page_size=page_size, runs=runs)
+    except Exception as e:
+        logger.error(f"Error listing runs: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/posts", response_model=PostsPage)
+async def list_posts(
+    topic: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    min_score: Optional[float] = None,
+    sort: str = Query('engagement_score', description=f"One of: {', '.join(SORT_COLUMNS)}"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)
+):
+    """Query stored posts by topic, scrape time and engagement, one page at a time"""
+    if sort not in SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(SORT_COLUMNS)}")
+    try:
+        total, posts = await asyncio.to_thread(
+            get_post_store().query_posts,
+            topic=topic,
+            since=since,
+            until=until,
+            min_score=min_score,
+            sort=sort,
+            limit=page_size,
+            offset=(page - 1) * page_size
+        )
+        return PostsPage(total=total, page=page, page_size=page_size, posts=posts)
+    except Exception as e:
+        logger.error(f"Error querying posts: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/analytics/topics")
+async def topic_analytics(
+    window_days: int = Query(7, ge=1, le=90),
+    limit: Optional[int] = Query(None, ge=1),
+    credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)
+):
+    """Per-topic engagement velocity, volume and week-over-week growth across archived runs"""
+    try:
+        return await asyncio.to_thread(topic_trend_report, window_days, limit)
+    except Exception as e:
+        logger.error(f"Error computing topic analytics: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -3,11 +3,13 @@
 from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from utils.logger import logger
 from config.settings import Config
 from utils.share_agent import ShareAgent
+from utils.notification_slack_tool import run_id_from_block_id
 import hmac
+import re
 import hashlib
 import json
 import time
@@ -35,6 +37,35 @@ def verify_slack_signature(request_body: bytes, timestamp: str, signature: str)
     )
     return hmac.compare_digest(computed_signature, signature)
 
+def extract_post_from_blocks(blocks: List[Dict[str, Any]], block_id: Optional[str]) -> Tuple[str, str]:
+    """
+    Title and content of the post whose actions block was clicked
+
+    The post is made of the header and content sections between the previous
+    actions block and the clicked one. Messages whose buttons carry no
+    block_id hold a single post.
+    """
+    end = next(
+        (i for i, block in enumerate(blocks) if block.get("type") == "actions" and block.get("block_id") == block_id),
+        None
+    ) if block_id else None
+    if end is None:
+        end = next((i for i, block in enumerate(blocks) if block.get("type") == "actions"), len(blocks))
+    start = next(
+        (i + 1 for i in range(end - 1, -1, -1) if blocks[i].get("type") == "actions"),
+        0
+    )
+    post_blocks = blocks[start:end]
+
+    headers = [block for block in post_blocks if block.get("type") == "header"]
+    title = headers[-1].get("text", {}).get("text", "").replace("📝 ", "") if headers else ""
+    content = "".join(
+        re.sub(r'^\*?Content(?: \(Part \d+/\d+\))?:\*?\n', '', block.get("text", {}).get("text", ""))
+        for block in post_blocks
+        if block.get("type") == "section"
+    ).strip()
+    return title, content
+
 @router.post("")  # Changed from "/" to "" since the router is already mounted at /slack/interactive
 async def slack_interactive(request: Request):
     """Handle interactive actions from Slack"""
@@ -62,38 +93,24 @@ async def slack_interactive(request: Request):
         
         # Extract action and relevant data
         action = payload.get("actions", [{}])[0].get("value")
+        run_id = run_id_from_block_id(payload.get("actions", [{}])[0].get("block_id"))
         user = payload.get("user", {}).get("name", "unknown")
+
+        # A digest holds several posts; answering one of them must not replace the others
+        message_blocks = payload.get("message", {}).get("blocks", [])
+        block_id = payload.get("actions", [{}])[0].get("block_id")
+        replace_original = sum(1 for block in message_blocks if block.get("type") == "actions") <= 1
         
         if action == "approve":
-            # Extract message blocks
-            message_blocks = payload.get("message", {}).get("blocks", [])
-            
-            # Extract title from header block
-            header_block = next(
-                (block for block in message_blocks if block.get("type") == "header"), 
-                None
-            )
-            title = header_block.get("text", {}).get("text", "").replace("📝 ", "") if header_block else ""
+            # Extract the post the clicked buttons belong to
+            title, content = extract_post_from_blocks(message_blocks, block_id)
             
-            # Extract content from section block
-            content_block = next(
-                (block for block in message_blocks if block.get("type") == "section"), 
-                None
-            )
-            
-            if not content_block:
+            if not content:
                 logger.error("Could not find post content")
                 return JSONResponse(
                     status_code=400,
                     content={"error": "Could not find post content"}
                 )
-                
-            content = (
-                content_block.get("text", {})
-                .get("text", "")
-                .replace("*Content:*\n", "")
-                .strip()
-            )
             
             try:
                 # Initialize ShareAgent
@@ -110,7 +127,7 @@ async def slack_interactive(request: Request):
                     logger.info(f"Post successfully shared by {user}")
                     return JSONResponse(content={
                         "response_type": "in_channel",
-                        "replace_original": True,
+                        "replace_original": replace_original,
                         "text": f"✅ Post approved and shared successfully by {user}!"
                     })
                 else:
@@ -118,7 +135,7 @@ async def slack_interactive(request: Request):
                     logger.error(f"Failed to share post: {error_msg}")
                     return JSONResponse(content={
                         "response_type": "in_channel",
-                        "replace_original": True,
+                        "replace_original": replace_original,
                         "text": f"❌ Error sharing post: {error_msg}"
                     })
                     
@@ -128,28 +145,21 @@ async def slack_interactive(request: Request):
                     status_code=500,
                     content={
                         "response_type": "in_channel",
-                        "replace_original": True,
+                        "replace_original": replace_original,
                         "text": f"❌ Internal error while sharing post: {str(e)}"
                     }
                 )
                 
         elif action == "regenerate":
-            logger.info(f"Content regeneration requested by {user}")
+            logger.info(f"Content regeneration requested by {user} for run {run_id}")
             
             try:
                 # Get scheduler from app state
                 scheduler = request.app.state.scheduler
                 notification_tool = request.app.state.notification_tool
                 
-                # Extract the original message content
-                message_blocks = payload.get("message", {}).get("blocks", [])
-                
-                # Get original title from header block
-                header_block = next(
-                    (block for block in message_blocks if block.get("type") == "header"), 
-                    None
-                )
-                original_title = header_block.get("text", {}).get("text", "").replace("📝 ", "") if header_block else ""
+                # Get original title of the post being regenerated
+                original_title, _ = extract_post_from_blocks(message_blocks, block_id)
                 
                 # Send initial notification about regeneration
                 notification_result = notification_tool._run({
@@ -162,12 +172,12 @@ async def slack_interactive(request: Request):
                 if not notification_result.get("sent"):
                     raise Exception("Failed to send notification")
                 
-                # Trigger new workflow execution
-                await scheduler.execute_crew_workflow()
+                # Queue a redraft from the original run's checkpoints (full run if it has none)
+                scheduler.start_regeneration(run_id)
                 
                 return JSONResponse(content={
                     "response_type": "in_channel",
-                    "replace_original": True,
+                    "replace_original": replace_original,
                     "text": f"🔄 Content regeneration initiated by {user}. A new post will be generated and sent for review."
                 })
                 
@@ -175,7 +185,7 @@ async def slack_interactive(request: Request):
                 logger.error(f"Error during regeneration: {str(e)}")
                 return JSONResponse(content={
                     "response_type": "in_channel",
-                    "replace_original": True,
+                    "replace_original": replace_original,
                     "text": f"❌ Error regenerating content: {str(e)}"
                 })
             
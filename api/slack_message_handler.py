@@ -5,6 +5,7 @@ from typing import Dict, Any
 import requests
 from utils.logger import logger
 from utils.topic_manager import TopicManager
+from utils.run_queue import QueueFullError
 from config.settings import Config
 import hmac
 import hashlib
@@ -103,17 +104,32 @@ async def handle_message_event(event_data: Dict[str, Any], request: Request) ->
             scheduler = request.app.state.scheduler
             current_topics = topic_manager.get_current_topics()
             
-            # Simplified input structure
-            await scheduler.execute_crew_workflow({
-                'topics': current_topics  # Just pass topics directly
-            })
+            # Queue the scan and answer right away
+            try:
+                record = scheduler.start_execution({
+                    'topics': current_topics  # Just pass topics directly
+                }, trigger='slack')
+            except QueueFullError as e:
+                return {
+                    'response_type': 'in_channel',
+                    'channel': channel,
+                    'text': f"⏳ Too many scans waiting. Please try again in {e.retry_after} seconds."
+                }
+            
+            if record['coalesced']:
+                return {
+                    'response_type': 'in_channel',
+                    'channel': channel,
+                    'text': f"🔁 A scan of these topics is already in progress ({record['execution_id']}); its results will be shared."
+                }
             
             return {
                 'response_type': 'in_channel',
                 'channel': channel,
                 'text': (
                     "🚀 Starting LinkedIn post scan with the following topics:\n" +
-                    "\n".join(f"• {topic}" for topic in current_topics)
+                    "\n".join(f"• {topic}" for topic in current_topics) +
+                    f"\n\nExecution: {record['execution_id']}"
                 )
             }
             
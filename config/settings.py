@@ -20,6 +20,9 @@ class Config:
     LOG_DIR = Path(BASE_DIR / 'logs')
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG') if os.getenv('ENVIRONMENT') == 'development' else 'INFO'
     LOG_FILE = Path(LOG_DIR / 'app.log')
+    LOG_ROTATION = os.getenv('LOG_ROTATION', '50 MB')
+    LOG_RETENTION_DAYS = int(os.getenv('LOG_RETENTION_DAYS', '7'))
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(200 * 1024 * 1024)))
 
     # Ensure log directory exists
     if not LOG_DIR.exists():    
@@ -60,11 +63,128 @@ class Config:
     MAX_POSTS = int(os.getenv('MAX_POSTS', '100'))
     SCROLL_PAUSE_TIME = float(os.getenv('SCROLL_PAUSE_TIME', '2.0'))
     MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
+
+    # Google search settings
+    SEARCH_MAX_CONCURRENCY = int(os.getenv('SEARCH_MAX_CONCURRENCY', '4'))
+    SEARCH_MIN_NEW_RATIO = float(os.getenv('SEARCH_MIN_NEW_RATIO', '0.3'))
+    SEARCH_INCREMENTAL = os.getenv('SEARCH_INCREMENTAL', 'False').lower() == 'true'
+    NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.7'))
+    SEARCH_BATCH_QUERIES = os.getenv('SEARCH_BATCH_QUERIES', 'False').lower() == 'true'
+    SEARCH_BATCH_MAX_TOPICS = int(os.getenv('SEARCH_BATCH_MAX_TOPICS', '5'))
+    SEARCH_BATCH_MAX_WORDS = int(os.getenv('SEARCH_BATCH_MAX_WORDS', '32'))
+
+    # Post ranking (SEARCH_TOP_K=0 returns every post)
+    SEARCH_TOP_K = int(os.getenv('SEARCH_TOP_K', '0'))
+    RANKING_WEIGHT_REACTIONS = float(os.getenv('RANKING_WEIGHT_REACTIONS', '1.0'))
+    RANKING_WEIGHT_COMMENTS = float(os.getenv('RANKING_WEIGHT_COMMENTS', '2.0'))
+    RANKING_WEIGHT_SHARES = float(os.getenv('RANKING_WEIGHT_SHARES', '3.0'))
+    RANKING_HALF_LIFE_HOURS = float(os.getenv('RANKING_HALF_LIFE_HOURS', '72'))
+    GOOGLE_CSE_DAILY_QUOTA = int(os.getenv('GOOGLE_CSE_DAILY_QUOTA', '100'))
+    GOOGLE_CSE_PER_MINUTE = int(os.getenv('GOOGLE_CSE_PER_MINUTE', '60'))
+    GOOGLE_CSE_BURST = int(os.getenv('GOOGLE_CSE_BURST', '10'))
+    GOOGLE_CSE_MAX_WAIT = float(os.getenv('GOOGLE_CSE_MAX_WAIT', '120'))
+    GOOGLE_CSE_PERSIST_QUOTA = os.getenv('GOOGLE_CSE_PERSIST_QUOTA', 'True').lower() == 'true'
+
+    # Search response cache
+    CACHE_DIR = Path(DATA_DIR / 'cache')
+    SEARCH_CACHE_PATH = Path(CACHE_DIR / 'search_cache.db')
+    SEARCH_CACHE_TTL_GOOGLE_CSE = int(os.getenv('SEARCH_CACHE_TTL_GOOGLE_CSE', '21600'))
+    SEARCH_CACHE_TTL_SERPER = int(os.getenv('SEARCH_CACHE_TTL_SERPER', '43200'))
+    SEARCH_CACHE_MAX_BYTES = int(os.getenv('SEARCH_CACHE_MAX_BYTES', str(50 * 1024 * 1024)))
+    SEARCH_CACHE_BYPASS = os.getenv('SEARCH_CACHE_BYPASS', 'False').lower() == 'true'
+    SEEN_URL_INDEX_PATH = Path(CACHE_DIR / 'seen_urls.db')
+    GOOGLE_CSE_QUOTA_PATH = Path(CACHE_DIR / 'cse_quota.db')
+
+    # Append-only post archive (gzip JSONL segments + offset index)
+    ARCHIVE_DIR = Path(os.getenv('ARCHIVE_DIR', str(DATA_DIR / 'archive')))
+    ARCHIVE_SEGMENT_MAX_BYTES = int(os.getenv('ARCHIVE_SEGMENT_MAX_BYTES', str(64 * 1024 * 1024)))
+
+    # Indexed post store
+    POST_STORE_PATH = Path(os.getenv('POST_STORE_PATH', str(DATA_DIR / 'posts.db')))
+
+    # Parquet analytics export (0 disables the periodic compaction job)
+    PARQUET_DIR = Path(os.getenv('PARQUET_DIR', str(DATA_DIR / 'parquet')))
+    PARQUET_COMPACTION_INTERVAL_MINUTES = int(os.getenv('PARQUET_COMPACTION_INTERVAL_MINUTES', '60'))
+
+    # Topic trend analytics: posts dated more than this many days ago age out (two of the largest 90-day windows)
+    TOPIC_TRENDS_RETENTION_DAYS = int(os.getenv('TOPIC_TRENDS_RETENTION_DAYS', '180'))
+
+    # Housekeeping (retention limits of 0 are disabled; interval 0 disables the job)
+    HOUSEKEEPING_INTERVAL_MINUTES = int(os.getenv('HOUSEKEEPING_INTERVAL_MINUTES', '360'))
+    OUTPUT_COMPACT_AFTER_HOURS = int(os.getenv('OUTPUT_COMPACT_AFTER_HOURS', '24'))
+    OUTPUT_RETENTION_DAYS = int(os.getenv('OUTPUT_RETENTION_DAYS', '30'))
+    OUTPUT_MAX_BYTES = int(os.getenv('OUTPUT_MAX_BYTES', str(200 * 1024 * 1024)))
+    ARCHIVE_RETENTION_DAYS = int(os.getenv('ARCHIVE_RETENTION_DAYS', '180'))
+    ARCHIVE_MAX_BYTES = int(os.getenv('ARCHIVE_MAX_BYTES', str(1024 * 1024 * 1024)))
+    
+    # HTTP record/replay harness (off | record | replay)
+    HTTP_REPLAY_MODE = os.getenv('HTTP_REPLAY_MODE', 'off').lower()
+    HTTP_CASSETTE_DIR = Path(os.getenv('HTTP_CASSETTE_DIR', str(DATA_DIR / 'cassettes')))
+    HTTP_REPLAY_SERVER_URL = os.getenv('HTTP_REPLAY_SERVER_URL')
+    HTTP_REPLAY_LATENCY_MS = float(os.getenv('HTTP_REPLAY_LATENCY_MS', '0'))
+    HTTP_REPLAY_JITTER_MS = float(os.getenv('HTTP_REPLAY_JITTER_MS', '0'))
+    HTTP_REPLAY_TAIL_MS = float(os.getenv('HTTP_REPLAY_TAIL_MS', '0'))
+    HTTP_REPLAY_TAIL_RATIO = float(os.getenv('HTTP_REPLAY_TAIL_RATIO', '0'))
     
     # LLM Settings
     DEFAULT_LLM_MODEL = os.getenv('DEFAULT_LLM_MODEL', 'gpt-4')
     LLM_TEMPERATURE = float(os.getenv('LLM_TEMPERATURE', '0.7'))
     MAX_TOKENS = int(os.getenv('MAX_TOKENS', '500'))
+
+    # Crew execution (sequential | dag); dag runs tasks whose context is done concurrently
+    CREW_EXECUTION_MODE = os.getenv('CREW_EXECUTION_MODE', 'sequential').lower()
+    CREW_DAG_MAX_WORKERS = int(os.getenv('CREW_DAG_MAX_WORKERS', '3'))
+
+    # Where crews run: thread (in the server process) or process (pre-warmed spawn workers, one per run queue worker,
+    # recycled after CREW_PROCESS_MAX_JOBS runs or once above CREW_PROCESS_MAX_RSS_MB; 0 disables either limit)
+    CREW_EXECUTION_BACKEND = os.getenv('CREW_EXECUTION_BACKEND', 'thread').lower()
+    CREW_PROCESS_MAX_JOBS = int(os.getenv('CREW_PROCESS_MAX_JOBS', '20'))
+    CREW_PROCESS_MAX_RSS_MB = int(os.getenv('CREW_PROCESS_MAX_RSS_MB', '1536'))
+
+    # Multi-topic fan-out: one pipeline per topic cluster in separate processes, merged into one Slack digest
+    CREW_FANOUT_ENABLED = os.getenv('CREW_FANOUT_ENABLED', 'False').lower() == 'true'
+    CREW_FANOUT_MAX_WORKERS = int(os.getenv('CREW_FANOUT_MAX_WORKERS', '2'))
+    CREW_FANOUT_CLUSTER_SIZE = int(os.getenv('CREW_FANOUT_CLUSTER_SIZE', '1'))
+    CREW_FANOUT_TIMEOUT_SECONDS = int(os.getenv('CREW_FANOUT_TIMEOUT_SECONDS', '1800'))
+
+    # Run queue: workers executing crew runs concurrently, and waiting runs accepted before rejecting with 429
+    RUN_QUEUE_WORKERS = int(os.getenv('RUN_QUEUE_WORKERS', '1'))
+    RUN_QUEUE_MAX_DEPTH = int(os.getenv('RUN_QUEUE_MAX_DEPTH', '10'))
+    RUN_QUEUE_RETRY_AFTER_SECONDS = int(os.getenv('RUN_QUEUE_RETRY_AFTER_SECONDS', '60'))
+
+    # Scheduler state: APScheduler job store and run history share one SQLite file
+    SCHEDULER_DB_PATH = Path(os.getenv('SCHEDULER_DB_PATH', str(DATA_DIR / 'scheduler.db')))
+    RUN_HISTORY_RETENTION_DAYS = int(os.getenv('RUN_HISTORY_RETENTION_DAYS', '90'))
+
+    # Execution tracking for the status API: recent records in memory, the rest in the run history
+    EXECUTION_STORE_MAX_IN_MEMORY = int(os.getenv('EXECUTION_STORE_MAX_IN_MEMORY', '200'))
+
+    # Per-task checkpoints of crew runs, used to resume interrupted runs
+    CHECKPOINT_DB_PATH = Path(os.getenv('CHECKPOINT_DB_PATH', str(DATA_DIR / 'checkpoints.db')))
+    CHECKPOINT_RESUME_MAX_AGE_HOURS = int(os.getenv('CHECKPOINT_RESUME_MAX_AGE_HOURS', '24'))
+    CHECKPOINT_RETENTION_DAYS = int(os.getenv('CHECKPOINT_RETENTION_DAYS', '7'))
+
+    # LLM response cache (opt-in); per-agent TTLs as "agent=seconds,agent=seconds"
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'False').lower() == 'true'
+    LLM_CACHE_PATH = Path(os.getenv('LLM_CACHE_PATH', str(DATA_DIR / 'cache' / 'llm_cache.db')))
+    LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', str(100 * 1024 * 1024)))
+    LLM_CACHE_DEFAULT_TTL = int(os.getenv('LLM_CACHE_DEFAULT_TTL', '86400'))
+    LLM_CACHE_AGENTS = [
+        agent.strip()
+        for agent in os.getenv('LLM_CACHE_AGENTS', 'brainstorm_agent,linkedin_analyze_agent,web_search_agent').split(',')
+        if agent.strip()
+    ]
+    LLM_CACHE_TTLS = {
+        agent.strip(): int(ttl)
+        for agent, _, ttl in (
+            item.partition('=')
+            for item in os.getenv(
+                'LLM_CACHE_TTLS',
+                'brainstorm_agent=86400,linkedin_analyze_agent=43200,web_search_agent=21600'
+            ).split(',')
+        )
+        if ttl.strip()
+    }
     
     # MongoDB Configuration (if needed)
     MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
@@ -1,21 +1,34 @@
 from utils.logger import logger
 import os
 from crewai import Agent, Task, Crew, Process
-from crewai_tools import SerperDevTool
+from crewai.tools import BaseTool
+from crewai.llms.base_llm import BaseLLM
 from utils.linkedin_google_search import LinkedInGoogleSearchTool
+from utils.search_cache import CachedSerperDevTool
 from utils.notification_slack_tool import NotificationSlackTool
 from utils.blog_agent import HashNodePublisher
 from utils.models import LinkedInPostContent
 from utils.topic_manager import TopicManager
+from utils.http_replay import install_from_env
+from utils.llm_cache import build_llm, reset_llm_state, start_llm_cache_report, log_llm_cache_report
+from utils.dag_executor import DagCrew
+from utils.crew_fanout import run_topic_fanout
+from utils.run_checkpoints import get_checkpoint_store, apply_checkpoints, crew_output_from_checkpoints, current_run_id
+from config.settings import Config
 import ssl
 import logging
 import yaml
 import requests
 import json
-from typing import Optional, Dict, Any, List
+import threading
+import time
+from typing import Optional, Dict, Any, List, Tuple, Callable
 
 ssl._create_default_https_context = ssl._create_unverified_context
 
+# Record or replay external API traffic when HTTP_REPLAY_MODE is set
+install_from_env()
+
 logging.basicConfig(level=logging.DEBUG)
 
 class SetupConfig:
@@ -28,7 +41,9 @@ class SetupConfig:
     def __init__(self):
         # Load configurations from YAML files
         self.configs = {}
+        self.mtimes = {}
         for config_type, file_path in self.files.items():
+            self.mtimes[config_type] = os.stat(file_path).st_mtime_ns
             with open(file_path, 'r') as file:
                 self.configs[config_type] = yaml.safe_load(file)
 
@@ -36,6 +51,17 @@ class SetupConfig:
         self.agents_config = self.configs['agents']
         self.tasks_config = self.configs['tasks']
 
+    def is_stale(self) -> bool:
+        """Whether any YAML file changed since it was loaded"""
+        try:
+            return any(
+                os.stat(file_path).st_mtime_ns != self.mtimes[config_type]
+                for config_type, file_path in self.files.items()
+            )
+        except OSError as e:
+            logger.warning(f"Could not check config files, keeping loaded config: {e}")
+            return False
+
 def test_api():
     base_url = "https://www.googleapis.com/customsearch/v1"
     params = {
@@ -49,182 +75,379 @@ def test_api():
     print(f"Status Code: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
 
-def create_crew(config: SetupConfig, topics: Optional[List[str]] = None) -> Crew:
-    """Create and configure the CrewAI crew with agents and tasks"""
-    try:
-        logger.debug(f"Creating crew with topics: {topics}")
-        logger.debug(f"Topics type: {type(topics)}")
-
-        # Validate and prepare topics
-        if not topics:
-            logger.warning("No topics provided, using defaults from topic manager")
-            topic_manager = TopicManager()
-            topics = topic_manager.get_current_topics()
-
-        # Initialize tools
-        linkedin_tool = LinkedInGoogleSearchTool()
-        serper_tool = SerperDevTool()
-        notification_slack_tool = NotificationSlackTool()
-        hashnode_publisher = HashNodePublisher()
-
-        # Initialize agents
-        linkedin_post_search_agent = Agent(
-            config=config.agents_config["linkedin_post_search_agent"],
-            tools=[linkedin_tool, serper_tool],
-            llm="gpt-4o",
-            verbose=True
-        )
-
-        linkedin_analyze_agent = Agent(
-            config=config.agents_config["linkedin_interaction_analyze_agent"],
-            llm="gpt-4o",
-            verbose=True
-        )
-
-        brainstorm_agent = Agent(
-            config=config.agents_config["brainstorm_agent"],
-            llm="gpt-4o",
-            verbose=True
-        )
-
-        web_search_agent = Agent(
-            config=config.agents_config["web_search_agent"],
-            tools=[serper_tool],
-            llm="gpt-3.5-turbo",
-            verbose=True
-        )
-
-        post_create_agent = Agent(
-            config=config.agents_config["post_create_agent"],
-            llm="gpt-4o",
-            verbose=True
-        )
-
-        notification_agent = Agent(
-            config=config.agents_config["notification_agent"],
-            tools=[notification_slack_tool],
-            llm="gpt-3.5-turbo",
-            verbose=True
-        )
-
-        blog_agent = Agent(
-            config=config.agents_config["blog_agent"],
-            tools=[hashnode_publisher],
-            llm="gpt-4o",
-            verbose=True
-)
-
-        search_task = Task(
-            config=config.tasks_config["search_linkedin_posts"],
-            agent=linkedin_post_search_agent,
-            tools=[linkedin_tool, serper_tool],
-            task_kwargs={
-                'topics': topics if isinstance(topics, list) else [topics]
-            }
-        )
-
-        analyze_task = Task(
-            config=config.tasks_config["analyze_engagement"],
-            agent=linkedin_analyze_agent,
-            context=[search_task]
-        )
-
-        brainstorm_task = Task(
-            config=config.tasks_config["generate_ideas"],
-            agent=brainstorm_agent,
-            context=[analyze_task]
-        )
-
-        web_search_task = Task(
-            config=config.tasks_config["conduct_web_search"],
-            agent=web_search_agent,
-            context=[brainstorm_task]
-        )
-
-        compose_blog_task = Task(
-            config=config.tasks_config["compose_blog_content"],
-            agent=blog_agent,
-            context=[web_search_task],
-            verbose=True
+# Model each agent runs on
+AGENT_MODELS = {
+    'linkedin_post_search_agent': "gpt-4o",
+    'linkedin_analyze_agent': "gpt-4o",
+    'brainstorm_agent': "gpt-4o",
+    'web_search_agent': "gpt-3.5-turbo",
+    'post_create_agent': "gpt-4o",
+    'notification_agent': "gpt-3.5-turbo",
+    'blog_agent': "gpt-4o"
+}
+
+class CrewFactory:
+    """
+    Builds a crew for each run from long-lived parts.
+
+    Parsed YAML configs are cached until a file's mtime changes, and tools
+    (with their HTTP sessions) are created once per process. LLM clients are
+    slow to build, so each thread keeps its own LLMs and clears their token
+    usage before every run. Agents, tasks and the crew carry per-run
+    execution state and are built on every run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._config: Optional[SetupConfig] = None
+        self._tools: Optional[Dict[str, BaseTool]] = None
+        self._local = threading.local()
+        self.topic_manager = TopicManager()
+
+    def get_config(self) -> SetupConfig:
+        with self._lock:
+            if self._config is None or self._config.is_stale():
+                if self._config is not None:
+                    logger.info("Agent or task YAML changed, reloading crew configuration")
+                self._config = SetupConfig()
+            return self._config
+
+    def get_tools(self) -> Dict[str, BaseTool]:
+        with self._lock:
+            if self._tools is None:
+                self._tools = {
+                    'linkedin_tool': LinkedInGoogleSearchTool(),
+                    'serper_tool': CachedSerperDevTool(),
+                    'notification_slack_tool': NotificationSlackTool(),
+                    'hashnode_publisher': HashNodePublisher()
+                }
+            return self._tools
+
+    def get_llms(self) -> Dict[str, BaseLLM]:
+        """Return this thread's LLMs, clearing the usage and state left over from its previous run"""
+        llms = getattr(self._local, 'llms', None)
+        if llms is None:
+            llms = {agent: build_llm(model, agent) for agent, model in AGENT_MODELS.items()}
+            self._local.llms = llms
+        else:
+            for llm in llms.values():
+                reset_llm_state(llm)
+        return llms
+
+    def _build_agents(self, config: SetupConfig, tools: Dict[str, BaseTool], llms: Dict[str, BaseLLM]) -> Dict[str, Agent]:
+        return {
+            'linkedin_post_search_agent': Agent(
+                config=config.agents_config["linkedin_post_search_agent"],
+                tools=[tools['linkedin_tool'], tools['serper_tool']],
+                llm=llms['linkedin_post_search_agent'],
+                verbose=True
+            ),
+            'linkedin_analyze_agent': Agent(
+                config=config.agents_config["linkedin_interaction_analyze_agent"],
+                llm=llms['linkedin_analyze_agent'],
+                verbose=True
+            ),
+            'brainstorm_agent': Agent(
+                config=config.agents_config["brainstorm_agent"],
+                llm=llms['brainstorm_agent'],
+                verbose=True
+            ),
+            'web_search_agent': Agent(
+                config=config.agents_config["web_search_agent"],
+                tools=[tools['serper_tool']],
+                llm=llms['web_search_agent'],
+                verbose=True
+            ),
+            'post_create_agent': Agent(
+                config=config.agents_config["post_create_agent"],
+                llm=llms['post_create_agent'],
+                verbose=True
+            ),
+            'notification_agent': Agent(
+                config=config.agents_config["notification_agent"],
+                tools=[tools['notification_slack_tool']],
+                llm=llms['notification_agent'],
+                verbose=True
+            ),
+            'blog_agent': Agent(
+                config=config.agents_config["blog_agent"],
+                tools=[tools['hashnode_publisher']],
+                llm=llms['blog_agent'],
+                verbose=True
             )
-        
-        create_post_task = Task(
-            config=config.tasks_config["create_post"],
-            agent=post_create_agent,
-            context=[compose_blog_task],
-            output_pydantic=LinkedInPostContent,
-            verbose=True
-        )
-
-        notify_user_task = Task(
-            config=config.tasks_config["notify_user"],
-            agent=notification_agent,
-            context=[create_post_task],
-            verbose=True
-        )
-
-        # Create crew
-        crew = Crew(
-            agents=[
-                linkedin_post_search_agent,
-                linkedin_analyze_agent,
-                brainstorm_agent,
-                web_search_agent,
-                blog_agent,          
-                post_create_agent,
-                notification_agent
-            ],
-            tasks=[
+        }
+
+    def get_agents(self, config: SetupConfig) -> Dict[str, Agent]:
+        """Build the agents of one run from the cached config, tools and this thread's LLMs"""
+        return self._build_agents(config, self.get_tools(), self.get_llms())
+
+    def create_crew(
+        self,
+        topics: Optional[List[str]] = None,
+        mode: Optional[str] = None,
+        run_id: Optional[str] = None,
+        rerun: Optional[List[str]] = None,
+        notify: bool = True
+    ) -> Crew:
+        """
+        Create the crew for one run, binding the run's topics
+
+        In 'dag' mode the LinkedIn post is drafted from the brainstormed ideas
+        (the create_post_from_ideas prompt) rather than the published blog, so
+        drafting overlaps the blog research and the Slack notification overlaps
+        blog publishing.
+
+        With a run_id, every finished task output is checkpointed under that
+        run, and tasks already checkpointed for it are restored rather than
+        run again, except those named in rerun; the crew then only holds the
+        remaining tasks. Without notify the run ends with the drafted post
+        and nothing is sent to Slack.
+        """
+        try:
+            logger.debug(f"Creating crew with topics: {topics}")
+
+            mode = (mode or Config.CREW_EXECUTION_MODE).lower()
+            if mode not in ('sequential', 'dag'):
+                raise ValueError(f"Unknown crew execution mode '{mode}', expected 'sequential' or 'dag'")
+
+            # Validate and prepare topics
+            if not topics:
+                logger.warning("No topics provided, using defaults from topic manager")
+                topics = self.topic_manager.get_current_topics()
+
+            config = self.get_config()
+            tools = self.get_tools()
+            agents = self.get_agents(config)
+
+            search_task = Task(
+                name='search_linkedin_posts',
+                config=config.tasks_config["search_linkedin_posts"],
+                agent=agents['linkedin_post_search_agent'],
+                tools=[tools['linkedin_tool'], tools['serper_tool']],
+                task_kwargs={
+                    'topics': topics if isinstance(topics, list) else [topics]
+                }
+            )
+
+            analyze_task = Task(
+                name='analyze_engagement',
+                config=config.tasks_config["analyze_engagement"],
+                agent=agents['linkedin_analyze_agent'],
+                context=[search_task]
+            )
+
+            brainstorm_task = Task(
+                name='generate_ideas',
+                config=config.tasks_config["generate_ideas"],
+                agent=agents['brainstorm_agent'],
+                context=[analyze_task]
+            )
+
+            web_search_task = Task(
+                name='conduct_web_search',
+                config=config.tasks_config["conduct_web_search"],
+                agent=agents['web_search_agent'],
+                context=[brainstorm_task]
+            )
+
+            compose_blog_task = Task(
+                name='compose_blog_content',
+                config=config.tasks_config["compose_blog_content"],
+                agent=agents['blog_agent'],
+                context=[web_search_task],
+                verbose=True
+            )
+
+            create_post_task = Task(
+                name='create_post',
+                config=config.tasks_config["create_post_from_ideas" if mode == 'dag' else "create_post"],
+                agent=agents['post_create_agent'],
+                context=[brainstorm_task] if mode == 'dag' else [compose_blog_task],
+                output_pydantic=LinkedInPostContent,
+                verbose=True
+            )
+
+            notify_user_task = Task(
+                name='notify_user',
+                config=config.tasks_config["notify_user"],
+                agent=agents['notification_agent'],
+                context=[create_post_task],
+                verbose=True
+            )
+
+            tasks = [
                 search_task,
                 analyze_task,
                 brainstorm_task,
                 web_search_task,
-                compose_blog_task, 
+                compose_blog_task,
                 create_post_task,
                 notify_user_task
-            ],
-            process=Process.sequential,
-            verbose=True
-        )
+            ]
+            if not notify:
+                tasks.remove(notify_user_task)
 
-        return crew
+            crew_kwargs: Dict[str, Any] = {'max_workers': Config.CREW_DAG_MAX_WORKERS} if mode == 'dag' else {}
+            if run_id is not None:
+                checkpoints = get_checkpoint_store()
+                tasks = apply_checkpoints(tasks, checkpoints.load_outputs(run_id), rerun or [])
+                crew_kwargs['task_callback'] = lambda output: checkpoints.save_output(run_id, output)
 
-    except Exception as e:
-        logger.error(f"Error creating crew: {e}")
+            # Create crew
+            return (DagCrew if mode == 'dag' else Crew)(
+                agents=[
+                    agents['linkedin_post_search_agent'],
+                    agents['linkedin_analyze_agent'],
+                    agents['brainstorm_agent'],
+                    agents['web_search_agent'],
+                    agents['blog_agent'],
+                    agents['post_create_agent'],
+                    agents['notification_agent']
+                ],
+                tasks=tasks,
+                process=Process.sequential,
+                verbose=True,
+                **crew_kwargs
+            )
+
+        except Exception as e:
+            logger.error(f"Error creating crew: {e}")
+            raise
+
+
+_crew_factory: Optional[CrewFactory] = None
+_crew_factory_lock = threading.Lock()
+
+
+def get_crew_factory() -> CrewFactory:
+    """Return the process-wide crew factory"""
+    global _crew_factory
+    with _crew_factory_lock:
+        if _crew_factory is None:
+            _crew_factory = CrewFactory()
+        return _crew_factory
+
+
+def create_crew(topics: Optional[List[str]] = None) -> Crew:
+    """Create and configure the CrewAI crew with agents and tasks"""
+    return get_crew_factory().create_crew(topics)
+
+# Tasks rerun when the reviewer asks for a different draft of the same post
+REGENERATE_TASKS = ['create_post', 'notify_user']
+
+
+def run_crew_workflow(
+    topics: List[str],
+    run_id: Optional[str] = None,
+    rerun: Optional[List[str]] = None,
+    notify: bool = True,
+    on_begin: Optional[Callable[[str], None]] = None
+) -> Tuple[str, Any]:
+    """
+    Run one crew pipeline over a set of topics
+
+    Every finished task is checkpointed under the run id. Without an explicit
+    run_id, an earlier run with the same inputs that was interrupted (e.g. cut
+    short by a container restart) is resumed from its first unfinished task;
+    failed runs are only resumed by run_id. Tasks named in rerun have their
+    checkpoints discarded and are executed again. on_begin is called with the
+    run id as soon as the run is registered, before any task runs.
+
+    Returns:
+        Tuple[str, Any]: Run id and crew output
+    """
+    # Pass topics in inputs
+    inputs = {
+        'topics': topics,
+        'task_data': {
+            'search_linkedin_posts': {
+                'topics': topics
+            }
+        }
+    }
+    checkpoints = get_checkpoint_store()
+    run_id, resumed = checkpoints.begin_run(inputs, run_id)
+    if on_begin is not None:
+        on_begin(run_id)
+    if rerun:
+        checkpoints.discard_outputs(run_id, rerun)
+    
+    # Create crew WITH topics
+    setup_start = time.perf_counter()
+    crew = get_crew_factory().create_crew(topics=topics, run_id=run_id, rerun=rerun, notify=notify)
+    logger.debug(f"Crew setup took {(time.perf_counter() - setup_start) * 1000:.1f} ms")
+    
+    llm_cache_report = start_llm_cache_report()
+    run_token = current_run_id.set(run_id)
+    run_start = time.perf_counter()
+    try:
+        if crew.tasks:
+            result = crew.kickoff(inputs=inputs)
+        else:
+            logger.info(f"All tasks of run {run_id} were already checkpointed")
+            result = crew_output_from_checkpoints(checkpoints.load_outputs(run_id))
+    except Exception:
+        checkpoints.finish_run(run_id, 'failed')
         raise
+    finally:
+        current_run_id.reset(run_token)
+        log_llm_cache_report(llm_cache_report)
+    checkpoints.finish_run(run_id, 'completed')
+    
+    logger.info(
+        f"Crew run {run_id} completed successfully in {time.perf_counter() - run_start:.1f}s "
+        f"({'dag' if isinstance(crew, DagCrew) else 'sequential'} mode{', resumed' if resumed else ''})"
+    )
+    return run_id, result
 
-def main(custom_topics: Optional[List[str]] = None) -> Dict[str, Any]:
-    """Main function to execute the crew workflow"""
+
+def main(
+    custom_topics: Optional[List[str]] = None,
+    run_id: Optional[str] = None,
+    rerun: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Main function to execute the crew workflow
+
+    With CREW_FANOUT_ENABLED, several topics are split into one pipeline per
+    topic cluster, run in parallel worker processes and sent as one Slack
+    digest. Otherwise all topics go through a single crew run (see
+    run_crew_workflow for run_id and rerun).
+    """
     try:
-        # Initialize configuration
-        config = SetupConfig()
-        
+        factory = get_crew_factory()
+
         # Get topics from parameter or topic manager
-        topic_manager = TopicManager()
-        topics = custom_topics or topic_manager.get_current_topics()
+        topics = custom_topics or factory.topic_manager.get_current_topics()
+        topics = topics if isinstance(topics, list) else [topics]
         
         logger.info(f"Executing crew with topics: {topics}")
-        
-        # Create crew WITH topics
-        crew = create_crew(config, topics=topics)  # Pass topics here
-        
-        # Pass topics in inputs
-        result = crew.kickoff(inputs={
-            'topics': topics,
-            'task_data': {
-                'search_linkedin_posts': {
-                    'topics': topics
-                }
-            }
-        })
-        
-        logger.info("Crew execution completed successfully.")
-        return result
+
+        if Config.CREW_FANOUT_ENABLED and run_id is None and len(topics) > 1:
+            return run_topic_fanout(topics)
+        return run_crew_workflow(topics, run_id=run_id, rerun=rerun)[1]
 
     except Exception as e:
         logger.exception(f"An error occurred: {e}")
         raise
 
+def regenerate_post(run_id: Optional[str]) -> Dict[str, Any]:
+    """
+    Draft a new LinkedIn post for an earlier run
+
+    The run's upstream task outputs (search through blog) are restored from
+    its checkpoints and only the post creation and notification tasks run
+    again. Runs without checkpoints, e.g. purged ones or review messages
+    sent before runs were tagged, fall back to a full run.
+    """
+    run = get_checkpoint_store().get_run(run_id) if run_id else None
+    if run is None:
+        logger.warning(f"No checkpoints for run {run_id}, regenerating with a full run")
+        return main()
+
+    logger.info(f"Regenerating post of run {run_id} from its checkpoints")
+    return main(custom_topics=run['inputs']['topics'], run_id=run_id, rerun=REGENERATE_TASKS)
+
 if __name__ == "__main__":
     test_api()
     main()
\ No newline at end of file
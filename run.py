@@ -9,6 +9,7 @@ from api.endpoints import router as api_router
 from scheduler import CrewScheduler
 from utils.logger import logger
 from utils.notification_slack_tool import NotificationSlackTool
+from utils.rate_limiter import get_cse_rate_limiter
 import signal
 import sys
 import os
@@ -33,8 +34,10 @@ async def lifespan(app: FastAPI):
         
         # Initialize scheduler
         scheduler = CrewScheduler()
-        scheduler.schedule_daily_job()
         scheduler.start()
+        # Jobs are (re)registered once the persistent job store is loaded
+        scheduler.schedule_daily_job()
+        scheduler.schedule_maintenance_jobs()
         
         # Initialize state
         app.state.scheduler = scheduler
@@ -122,6 +125,7 @@ async def health_check():
             "scheduler": scheduler_status,
             "active_requests": len(request_tracking),
             "processed_events": len(app.state.processed_events) if hasattr(app.state, 'processed_events') else 0,
+            "search_quota": get_cse_rate_limiter().status(),
             "timestamp": time.time()
         }
     except Exception as e:
@@ -1,109 +1,309 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from utils.topic_manager import TopicManager
 from utils.logger import logger
+from utils.parquet_export import compact_archive_to_parquet
+from utils.housekeeping import run_housekeeping
+from utils.execution_store import get_execution_store, current_execution_id
+from utils.run_queue import RunQueue, RunPriority, QueueFullError
+from utils.crew_process_pool import CrewProcessPool
+from utils.run_checkpoints import input_fingerprint
+from config.settings import Config
 from datetime import datetime
 import pytz
 import asyncio
-import time
-from typing import Optional, Dict, Any, List
-from main import main
+from typing import Optional, Dict, Any, List, Union, Callable, Tuple
+from main import main, regenerate_post
 
 class CrewScheduler:
     """Handles scheduled and on-demand execution of the CrewAI workflow"""
     
     def __init__(self):
         self.topic_manager = TopicManager()
-        self.scheduler = AsyncIOScheduler()
-        self.is_job_running = False
-        self._last_execution_time = None
-        self._execution_lock = asyncio.Lock()
-        self._cooldown_period = 300  # 5 minutes in seconds
+        # Jobs and their next run times live in SQLite, so missed runs are caught up after a restart
+        self.scheduler = AsyncIOScheduler(
+            jobstores={'default': SQLAlchemyJobStore(url=f"sqlite:///{Config.SCHEDULER_DB_PATH}")}
+        )
+        self.executions = get_execution_store()
+        # Runs wait here for one of RUN_QUEUE_WORKERS workers; manual runs go ahead of scheduled ones
+        self.queue = RunQueue(
+            workers=Config.RUN_QUEUE_WORKERS,
+            max_depth=Config.RUN_QUEUE_MAX_DEPTH,
+            default_retry_after=Config.RUN_QUEUE_RETRY_AFTER_SECONDS
+        )
+        # Worker processes crews run in with the 'process' backend; created by start()
+        self.process_pool: Optional[CrewProcessPool] = None
+        # Queued or running executions by single-flight key
+        self._in_flight: Dict[str, Tuple[Dict[str, Any], asyncio.Future]] = {}
+
+    @property
+    def is_job_running(self) -> bool:
+        return self.queue.running > 0
+
+    @staticmethod
+    def _topics_from_inputs(custom_inputs: Optional[Dict[str, Any]]) -> Optional[Union[List[str], str]]:
+        """Extract topics from custom inputs"""
+        if custom_inputs and 'topics' in custom_inputs:
+            if isinstance(custom_inputs['topics'], (list, str)):
+                logger.info(f"Received topics for execution: {custom_inputs['topics']}")
+                return custom_inputs['topics']
+            logger.warning(f"Invalid topics format received: {type(custom_inputs['topics'])}")
+        return None
+
+    async def _run_workflow(self, execution_id: str, workflow: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a workflow function off the event loop, reporting progress on its execution record"""
+        self.executions.start(execution_id)
+        # to_thread copies the context, so crew task events are recorded against this execution
+        execution_token = current_execution_id.set(execution_id)
+        try:
+            if self.process_pool is not None:
+                # The thread only waits on the worker's pipe; the crew runs in the worker process
+                result = await asyncio.to_thread(
+                    self.process_pool.run,
+                    workflow,
+                    *args,
+                    on_progress=lambda stage, status, at, run_id: self.executions.record_stage(
+                        execution_id, stage, status, datetime.fromisoformat(at), run_id
+                    ),
+                    **kwargs
+                )
+            else:
+                result = await asyncio.to_thread(workflow, *args, **kwargs)
+        except Exception as e:
+            logger.error(f"Error executing crew workflow: {e}")
+            self.executions.finish(execution_id, 'failed', error=str(e))
+            raise
+        finally:
+            current_execution_id.reset(execution_token)
+        self.executions.finish(execution_id, 'succeeded', result=result)
+        return result
+
+    @staticmethod
+    def flight_key(topics: List[str]) -> str:
+        """Single-flight key of a workflow run: fingerprint of its normalized topic list"""
+        normalized = sorted({topic.strip().lower() for topic in topics if topic and topic.strip()})
+        return f"workflow:{input_fingerprint({'topics': normalized})}"
+
+    def _resolve_topics(self, topics: Optional[Union[List[str], str]]) -> List[str]:
+        """Topics a run will use; the current topic list when none are given"""
+        topics = topics or self.topic_manager.get_current_topics()
+        return topics if isinstance(topics, list) else [topics]
+
+    def _submit(
+        self,
+        key: str,
+        trigger: str,
+        priority: RunPriority,
+        topics: Optional[List[str]],
+        workflow: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any
+    ) -> Tuple[Dict[str, Any], asyncio.Future]:
+        """
+        Queue a run, or attach to the identical run already queued or running
+
+        Requests with the same key share one execution record and one result
+        future. Lookup and registration happen without awaiting, so requests
+        arriving together on the event loop cannot both start a run.
+        Rejected runs are recorded as such.
+        """
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            record, future = in_flight
+            logger.info(f"Attaching {trigger} request to in-flight execution {record['execution_id']}")
+            return self.executions.attach(record['execution_id'], trigger) or record, future
+
+        record = self.executions.create(trigger, topics)
+        execution_id = record['execution_id']
+        try:
+            future = self.queue.submit(
+                lambda: self._run_workflow(execution_id, workflow, *args, **kwargs),
+                priority=priority,
+                name=f"execution {execution_id}"
+            )
+        except QueueFullError as e:
+            logger.warning(f"Rejected {trigger} execution {execution_id}: {e}")
+            self.executions.finish(execution_id, 'rejected', error=str(e))
+            raise
+
+        self._in_flight[key] = (record, future)
+        future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        future.add_done_callback(self._log_background_failure)
+        return record, future
+
+    @staticmethod
+    def _log_background_failure(future: asyncio.Future) -> None:
+        # Retrieves the exception so failures of runs nobody awaits are not reported as unhandled
+        if not future.cancelled() and future.exception() is not None:
+            logger.debug(f"Queued execution failed: {future.exception()}")
+
+    def start_execution(
+        self,
+        custom_inputs: Optional[Dict[str, Any]] = None,
+        trigger: str = 'api',
+        priority: RunPriority = RunPriority.MANUAL
+    ) -> Dict[str, Any]:
+        """
+        Queue the crew workflow and return its execution record at once
+
+        Args:
+            custom_inputs: Optional dictionary containing custom configuration
+            trigger: What requested the execution (api, slack, schedule)
+            priority: Priority class of the run
+
+        Returns:
+            The queued execution record; poll the execution store for progress
+
+        Raises:
+            QueueFullError: If the run queue is full
+        """
+        topics = self._resolve_topics(self._topics_from_inputs(custom_inputs))
+        record, future = self._submit(self.flight_key(topics), trigger, priority, topics, main, custom_topics=topics)
+        return record
+
+    def start_regeneration(self, run_id: Optional[str] = None, trigger: str = 'slack') -> Dict[str, Any]:
+        """
+        Queue a redraft of the LinkedIn post of an earlier run, reusing its upstream task outputs
+
+        Args:
+            run_id: Run whose post should be redrafted; None falls back to a full run
+            trigger: What requested the regeneration
+
+        Returns:
+            The queued execution record
+
+        Raises:
+            QueueFullError: If the run queue is full
+        """
+        if run_id is None:
+            # Falls back to a full run on the current topics, so it coalesces with scans of them
+            topics = self._resolve_topics(None)
+            record, future = self._submit(self.flight_key(topics), trigger, RunPriority.MANUAL, topics, main, custom_topics=topics)
+        else:
+            record, future = self._submit(f"regenerate:{run_id}", trigger, RunPriority.MANUAL, None, regenerate_post, run_id)
+        return record
         
-    async def execute_crew_workflow(self, custom_inputs: Optional[Dict[str, Any]] = None) -> None:
+    async def execute_crew_workflow(
+        self,
+        custom_inputs: Optional[Dict[str, Any]] = None,
+        trigger: str = 'schedule',
+        priority: RunPriority = RunPriority.SCHEDULED
+    ) -> Any:
         """
-        Execute the crew workflow with cooldown and locking
+        Queue the crew workflow and wait for it to finish
         
         Args:
             custom_inputs: Optional dictionary containing custom configuration
+            trigger: What requested the execution
+            priority: Priority class of the run
             
         Returns:
-            None
+            The crew result, or None if the queue was full
         """
+        topics = self._resolve_topics(self._topics_from_inputs(custom_inputs))
         try:
-            # Check if execution is already in progress
-            if self.is_job_running:
-                logger.warning("Job already running, skipping execution")
-                return
-                
-            # Check cooldown period
-            current_time = time.time()
-            if self._last_execution_time and (current_time - self._last_execution_time < self._cooldown_period):
-                cooldown_remaining = self._cooldown_period - (current_time - self._last_execution_time)
-                logger.warning(f"Cooldown period active. Please wait {cooldown_remaining:.0f} seconds")
-                return
-                
-            # Acquire execution lock
-            async with self._execution_lock:
-                self.is_job_running = True
-                self._last_execution_time = current_time
-                
-                try:
-                    # Extract topics from custom inputs
-                    topics = None
-                    if custom_inputs and 'topics' in custom_inputs:
-                        if isinstance(custom_inputs['topics'], (list, str)):
-                            topics = custom_inputs['topics']
-                            logger.info(f"Received topics for execution: {topics}")
-                        else:
-                            logger.warning(f"Invalid topics format received: {type(custom_inputs['topics'])}")
-                    
-                    # Execute crew workflow
-                    logger.info(f"Executing crew with topics: {topics}")
-                    result = await asyncio.to_thread(
-                        main,
-                        custom_topics=topics
-                    )
-                    
-                    logger.info(f"Crew execution completed with topics: {topics}")
-                    return result
-                    
-                finally:
-                    self.is_job_running = False
-                    
-        except Exception as e:
-            logger.error(f"Error executing crew workflow: {e}")
-            self.is_job_running = False
-            raise
-            
+            _, future = self._submit(self.flight_key(topics), trigger, priority, topics, main, custom_topics=topics)
+        except QueueFullError:
+            return None
+        logger.info(f"Executing crew with topics: {topics}")
+        # Shielded so that a cancelled waiter does not cancel a run other requests share
+        result = await asyncio.shield(future)
+        logger.info(f"Crew execution completed with topics: {topics}")
+        return result
+
+    def _ensure_job(self, func: Callable[..., Any], trigger: Any, job_id: str, name: str, **options: Any) -> None:
+        """
+        Add a job unless the job store already holds it with the same function and trigger
+
+        A persisted job keeps its next run time, so a run missed while the
+        service was down is still caught up within its misfire grace time;
+        re-adding it would compute a fresh next run time instead.
+        """
+        existing = self.scheduler.get_job(job_id)
+        if (
+            existing is not None
+            and existing.func == func
+            and str(existing.trigger) == str(trigger)
+            and getattr(existing.trigger, 'timezone', None) == getattr(trigger, 'timezone', None)
+        ):
+            logger.info(f"Restored job '{name}' from the job store, next run at {existing.next_run_time}")
+            return
+        self.scheduler.add_job(func, trigger=trigger, id=job_id, name=name, replace_existing=True, **options)
+
+    def _remove_job(self, job_id: str) -> None:
+        if self.scheduler.get_job(job_id) is not None:
+            self.scheduler.remove_job(job_id)
+
     def schedule_daily_job(self):
-        """Schedule daily job at 8 AM CET"""
+        """Schedule daily job at 8 AM CET; call after start() so the persisted job is found"""
         trigger = CronTrigger(
             hour=8,
             minute=0,
             timezone=pytz.timezone('Europe/Paris')
         )
         
-        self.scheduler.add_job(
-            self.execute_crew_workflow,
-            trigger=trigger,
-            id='daily_crew_job',
-            name='Daily CrewAI Workflow',
-            replace_existing=True,
+        self._ensure_job(
+            run_scheduled_workflow,
+            trigger,
+            'daily_crew_job',
+            'Daily CrewAI Workflow',
             coalesce=True,  # Prevents multiple executions if previous job is still running
             misfire_grace_time=3600  # 1 hour grace time for missed executions
         )
         
         logger.info("Scheduled daily job for 8 AM CET")
+
+    def schedule_maintenance_jobs(self):
+        """Schedule periodic background maintenance; call after start()"""
+        if Config.PARQUET_COMPACTION_INTERVAL_MINUTES > 0:
+            self._ensure_job(
+                run_scheduled_parquet_compaction,
+                IntervalTrigger(minutes=Config.PARQUET_COMPACTION_INTERVAL_MINUTES),
+                'parquet_compaction_job',
+                'Parquet Compaction',
+                coalesce=True,
+                max_instances=1
+            )
+            logger.info(f"Scheduled Parquet compaction every {Config.PARQUET_COMPACTION_INTERVAL_MINUTES} minutes")
+        else:
+            self._remove_job('parquet_compaction_job')
+
+        if Config.HOUSEKEEPING_INTERVAL_MINUTES > 0:
+            self._ensure_job(
+                run_scheduled_housekeeping,
+                IntervalTrigger(minutes=Config.HOUSEKEEPING_INTERVAL_MINUTES),
+                'housekeeping_job',
+                'Housekeeping',
+                coalesce=True,
+                max_instances=1
+            )
+            logger.info(f"Scheduled housekeeping every {Config.HOUSEKEEPING_INTERVAL_MINUTES} minutes")
+        else:
+            self._remove_job('housekeeping_job')
         
     def start(self):
-        """Start the scheduler"""
+        """Start the scheduler and the run queue workers"""
+        global _active_scheduler
+        _active_scheduler = self
+        if Config.CREW_EXECUTION_BACKEND == 'process' and self.process_pool is None:
+            self.process_pool = CrewProcessPool(
+                workers=Config.RUN_QUEUE_WORKERS,
+                max_jobs_per_worker=Config.CREW_PROCESS_MAX_JOBS,
+                max_rss_mb=Config.CREW_PROCESS_MAX_RSS_MB
+            )
+            self.process_pool.start()
+        self.queue.start()
         if not self.scheduler.running:
             self.scheduler.start()
             logger.info("Scheduler started")
             
     def shutdown(self):
         """Shutdown the scheduler"""
+        self.queue.stop()
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
         if self.scheduler.running:
             self.scheduler.shutdown()
             logger.info("Scheduler shutdown complete")
@@ -114,13 +314,36 @@ class CrewScheduler:
         return job.next_run_time if job else None
         
     async def get_status(self) -> Dict[str, Any]:
-        """Get current scheduler status"""
+        """Get current scheduler status; past executions come from the run history"""
+        history = await asyncio.to_thread(self.executions.history.summary)
         return {
             "is_running": self.is_job_running,
-            "last_execution": self._last_execution_time,
+            **history,
             "next_scheduled_run": await self.get_next_run_time(),
-            "cooldown_active": bool(
-                self._last_execution_time and 
-                (time.time() - self._last_execution_time < self._cooldown_period)
-            )
-        }
\ No newline at end of file
+            "queue": self.queue.metrics(),
+            "process_pool": self.process_pool.metrics() if self.process_pool is not None else None
+        }
+
+
+# Scheduler the persisted jobs run against; set by CrewScheduler.start()
+_active_scheduler: Optional[CrewScheduler] = None
+
+
+# Job store entry points: persisted jobs need module-level functions, not bound methods
+
+async def run_scheduled_workflow() -> Any:
+    """Daily crew run"""
+    if _active_scheduler is None:
+        logger.warning("No scheduler running, skipping scheduled workflow")
+        return None
+    return await _active_scheduler.execute_crew_workflow()
+
+
+async def run_scheduled_parquet_compaction() -> Dict[str, int]:
+    """Export newly archived search runs to Parquet off the event loop"""
+    return await asyncio.to_thread(compact_archive_to_parquet)
+
+
+async def run_scheduled_housekeeping() -> Dict[str, Any]:
+    """Apply disk retention off the event loop"""
+    return await asyncio.to_thread(run_housekeeping)
\ No newline at end of file
@@ -0,0 +1,76 @@
+import sys
+import textwrap
+import pytest
+from config.settings import Config
+import utils.crew_fanout as crew_fanout
+from utils.crew_fanout import cluster_topics, run_topic_fanout
+
+# Stands in for main.run_crew_workflow in the spawned pipeline processes
+FAKE_MAIN = textwrap.dedent(
+    """
+    import os
+    import time
+    from types import SimpleNamespace
+
+    def run_crew_workflow(topics, notify=True, on_begin=None):
+        run_id = f"run-{topics[0]}"
+        on_begin(run_id)
+        if topics[0] == 'crash':
+            os._exit(3)
+        if topics[0] == 'slow':
+            time.sleep(300)
+        if topics[0] == 'error':
+            raise RuntimeError('crew failed')
+        return run_id, SimpleNamespace(pydantic=None, raw=f"post about {topics[0]}")
+    """
+)
+
+
+class FakeCheckpointStore:
+    def __init__(self):
+        self.finished = []
+
+    def finish_run(self, run_id, status):
+        self.finished.append((run_id, status))
+
+
+class FakeSlackTool:
+    digests = []
+
+    def send_digest(self, results):
+        self.digests.append(results)
+        return {'sent': True}
+
+
+def test_cluster_topics_groups_related_topics_up_to_max_size():
+    topics = ['LLM agents', 'AI agents', 'Rust async', 'agents in production', 'LLM agents']
+
+    assert cluster_topics(topics, max_size=1) == [['LLM agents'], ['AI agents'], ['Rust async'], ['agents in production']]
+    assert cluster_topics(topics, max_size=2) == [['LLM agents', 'AI agents'], ['Rust async'], ['agents in production']]
+
+
+def test_fanout_reports_each_pipeline_and_fails_runs_it_had_to_stop(tmp_path, monkeypatch):
+    (tmp_path / 'main.py').write_text(FAKE_MAIN)
+    monkeypatch.setattr(sys, 'path', [str(tmp_path), *sys.path])
+    monkeypatch.delitem(sys.modules, 'main', raising=False)
+    monkeypatch.setattr(Config, 'CREW_FANOUT_CLUSTER_SIZE', 1)
+    monkeypatch.setattr(Config, 'CREW_FANOUT_MAX_WORKERS', 4)
+    monkeypatch.setattr(Config, 'CREW_FANOUT_TIMEOUT_SECONDS', 40)
+    checkpoints = FakeCheckpointStore()
+    monkeypatch.setattr(crew_fanout, 'get_checkpoint_store', lambda: checkpoints)
+    monkeypatch.setattr(crew_fanout, 'NotificationSlackTool', FakeSlackTool)
+
+    report = run_topic_fanout(['ok', 'crash', 'slow', 'error'])
+
+    pipelines = {pipeline['topics'][0]: pipeline for pipeline in report['pipelines']}
+    assert report['succeeded'] == 1
+    assert report['failed'] == 3
+    assert report['digest_sent']
+    assert pipelines['ok']['error'] is None
+    assert pipelines['ok']['run_id'] == 'run-ok'
+    assert 'exited with code 3' in pipelines['crash']['error']
+    assert 'timed out' in pipelines['slow']['error']
+    assert pipelines['error']['error'] == 'crew failed'
+    # Only the runs whose process was stopped are closed out by the parent
+    assert sorted(checkpoints.finished) == [('run-crash', 'failed'), ('run-slow', 'failed')]
+    assert FakeSlackTool.digests[-1][0]['post'] == {'title': 'LinkedIn post: ok', 'content': 'post about ok'}
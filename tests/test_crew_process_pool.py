@@ -0,0 +1,77 @@
+import sys
+import textwrap
+import pytest
+from utils.crew_process_pool import CrewProcessPool, CrewWorkerError
+
+# Stands in for main in the spawned workers; jobs are sent by reference, so they live here too
+FAKE_MAIN = textwrap.dedent(
+    """
+    import os
+    from crewai import Task
+    from crewai.events.event_bus import crewai_event_bus
+    from crewai.events.types.task_events import TaskStartedEvent
+
+    def get_crew_factory():
+        return None
+
+    def echo(value):
+        task = Task(name='research_task', description='research', expected_output='notes')
+        crewai_event_bus.emit(task, TaskStartedEvent(task=task, context=''))
+        return {'echo': value, 'pid': os.getpid()}
+
+    def boom():
+        raise RuntimeError('crew failed')
+
+    def crash():
+        os._exit(3)
+    """
+)
+
+
+@pytest.fixture
+def fake_main(tmp_path, monkeypatch):
+    (tmp_path / 'main.py').write_text(FAKE_MAIN)
+    monkeypatch.setattr(sys, 'path', [str(tmp_path), *sys.path])
+    monkeypatch.delitem(sys.modules, 'main', raising=False)
+    import main
+    yield main
+    sys.modules.pop('main', None)
+
+
+def test_workers_are_recycled_after_max_jobs_and_when_they_die(fake_main):
+    pool = CrewProcessPool(workers=1, max_jobs_per_worker=2, max_rss_mb=0)
+    pool.start()
+    try:
+        progress = []
+        first = pool.run(fake_main.echo, 1, on_progress=lambda *event: progress.append(event))
+        second = pool.run(fake_main.echo, 2)
+        assert first['echo'] == 1 and second['pid'] == first['pid']
+        assert [event[:2] for event in progress] == [('research_task', 'running')]
+        # The first worker retired after its second job
+        assert pool.metrics()['recycled'] == 1
+
+        with pytest.raises(CrewWorkerError, match='crew failed'):
+            pool.run(fake_main.boom)
+        # A failed job keeps its worker, which then retires after this, its second job
+        third = pool.run(fake_main.echo, 3)
+        assert third['pid'] != first['pid']
+        assert pool.metrics()['recycled'] == 2
+
+        with pytest.raises(CrewWorkerError, match='died while running crash'):
+            pool.run(fake_main.crash)
+        metrics = pool.metrics()
+        assert metrics['recycled'] == 3
+        assert len(metrics['workers']) == 1 and metrics['workers'][0]['jobs'] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_worker_over_the_memory_cap_is_retired_after_its_job(fake_main):
+    pool = CrewProcessPool(workers=1, max_jobs_per_worker=0, max_rss_mb=1)
+    pool.start()
+    try:
+        first = pool.run(fake_main.echo, 1)
+        assert pool.metrics()['recycled'] == 1
+        assert pool.run(fake_main.echo, 2)['pid'] != first['pid']
+    finally:
+        pool.shutdown()
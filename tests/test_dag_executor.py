@@ -0,0 +1,45 @@
+import pytest
+from crewai import Task
+from utils.dag_executor import critical_path, task_dependencies
+
+
+def _task(name, context=None):
+    if context is None:
+        return Task(name=name, description=f"{name} task", expected_output=name)
+    return Task(name=name, description=f"{name} task", expected_output=name, context=context)
+
+
+def test_dependencies_follow_context_and_default_to_every_earlier_task():
+    research = _task('research', context=[])
+    trends = _task('trends', context=[])
+    ideas = _task('ideas', context=[research, trends])
+    post = _task('post')
+
+    assert task_dependencies([research, trends, ideas, post]) == {0: set(), 1: set(), 2: {0, 1}, 3: {0, 1, 2}}
+
+
+def test_context_cycle_is_rejected():
+    first = _task('first', context=[])
+    second = _task('second', context=[first])
+    first.context = [second]
+
+    with pytest.raises(ValueError, match='cycle'):
+        task_dependencies([first, second])
+
+
+def test_context_outside_the_crew_needs_an_output():
+    outside = _task('outside', context=[])
+    inside = _task('inside', context=[outside])
+
+    with pytest.raises(ValueError, match="'inside' refers to a task outside the crew"):
+        task_dependencies([inside])
+
+
+def test_critical_path_is_the_longest_chain_by_duration():
+    dependencies = {0: set(), 1: set(), 2: {0, 1}, 3: {2}}
+
+    total, path = critical_path({0: 1.0, 1: 4.0, 2: 2.0, 3: 0.5}, dependencies)
+
+    assert total == 6.5
+    assert path == [1, 2, 3]
+    assert critical_path({}, {}) == (0.0, [])
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from pydantic import BaseModel
+from utils.execution_store import ExecutionStore, summarize_result
+from utils.run_history import RunHistoryStore
+
+AT = datetime(2024, 3, 15, 9, 0)
+
+
+class Post(BaseModel):
+    title: str
+
+
+@pytest.fixture
+def history(tmp_path):
+    return RunHistoryStore(tmp_path / 'scheduler.db')
+
+
+def test_execution_lifecycle_records_stages_and_outcome(history):
+    store = ExecutionStore(history)
+    execution_id = store.create('api', topics=['AI'])['execution_id']
+
+    store.start(execution_id)
+    store.record_stage(execution_id, 'research_task', 'running', AT, run_id='run-1')
+    assert store.get(execution_id)['stage'] == 'research_task'
+    store.record_stage(execution_id, 'research_task', 'succeeded', AT + timedelta(seconds=12.5))
+    store.finish(execution_id, 'succeeded', result=SimpleNamespace(raw='post', pydantic=Post(title='Agents')))
+
+    record = store.get(execution_id)
+    assert record['status'] == 'succeeded'
+    assert record['run_id'] == 'run-1'
+    assert record['stage'] is None
+    assert [(stage['name'], stage['status'], stage['duration_s']) for stage in record['stages']] == [
+        ('research_task', 'succeeded', 12.5)
+    ]
+    assert record['result'] == {'raw': 'post', 'pydantic': {'title': 'Agents'}}
+    assert history.get(execution_id)['status'] == 'succeeded'
+
+
+def test_evicted_executions_are_read_back_from_history(history):
+    store = ExecutionStore(history, max_in_memory=2)
+    ids = [store.create('scheduled')['execution_id'] for _ in range(3)]
+
+    assert [record['execution_id'] for record in store.recent()] == ids[:0:-1]
+    assert store.get(ids[0])['status'] == 'queued'
+    assert store.attach(ids[0], 'api')['coalesced'] == 1
+
+
+def test_executions_left_running_are_interrupted_on_restart(history):
+    store = ExecutionStore(history)
+    running = store.create('api')['execution_id']
+    store.start(running)
+    done = store.create('api')['execution_id']
+    store.finish(done, 'failed', error='boom')
+
+    restarted = ExecutionStore(history)
+
+    assert restarted.get(running)['status'] == 'interrupted'
+    assert restarted.get(done)['error'] == 'boom'
+    assert restarted.get('unknown') is None
+
+
+def test_results_are_summarized_to_json_friendly_values():
+    assert summarize_result({'a': 1}) == {'a': 1}
+    assert summarize_result(SimpleNamespace(raw='x' * 5000, pydantic=None)) == {'raw': 'x' * 4000, 'pydantic': None}
+    assert summarize_result(object()).startswith('<object object')
@@ -0,0 +1,88 @@
+import json
+import os
+import time
+import pytest
+from config.settings import Config
+from utils.housekeeping import Housekeeper
+from utils.post_archive import PostArchive
+from utils.run_checkpoints import CheckpointStore
+from utils.run_history import RunHistoryStore
+
+DAY = 86400
+
+
+def _write(path, size=100, age_days=0):
+    path.write_bytes(b'x' * size)
+    mtime = time.time() - age_days * DAY
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def housekeeper(tmp_path, monkeypatch):
+    for name in ('output', 'logs'):
+        (tmp_path / name).mkdir()
+    monkeypatch.setattr(Config, 'OUTPUT_DIR', tmp_path / 'output')
+    monkeypatch.setattr(Config, 'LOG_DIR', tmp_path / 'logs')
+    monkeypatch.setattr(Config, 'LOG_FILE', tmp_path / 'logs' / 'app.log')
+    return Housekeeper(
+        PostArchive(tmp_path / 'archive'),
+        CheckpointStore(tmp_path / 'checkpoints.db'),
+        RunHistoryStore(tmp_path / 'scheduler.db')
+    )
+
+
+def test_old_output_files_are_compacted_into_the_archive(housekeeper, monkeypatch):
+    monkeypatch.setattr(Config, 'OUTPUT_COMPACT_AFTER_HOURS', 24)
+    old = Config.OUTPUT_DIR / 'linkedin_posts_20240301_101500.json'
+    old.write_text(json.dumps({'metadata': {}, 'posts': [{'url': 'https://www.linkedin.com/posts/a-1', 'text': 'a'}]}))
+    os.utime(old, (time.time() - 2 * DAY, time.time() - 2 * DAY))
+    recent = _write(Config.OUTPUT_DIR / 'linkedin_posts_20240310_101500.json')
+
+    stats = housekeeper.compact_output()
+
+    assert stats['files_compacted'] == 1
+    assert not old.exists() and recent.exists()
+    assert [entry['run_id'] for entry in housekeeper.archive.runs()] == ['20240301_101500_legacy']
+
+
+def test_unreadable_output_is_left_to_age_and_size_retention(housekeeper, monkeypatch):
+    monkeypatch.setattr(Config, 'OUTPUT_RETENTION_DAYS', 30)
+    monkeypatch.setattr(Config, 'OUTPUT_MAX_BYTES', 250)
+    expired = _write(Config.OUTPUT_DIR / 'linkedin_posts_1.json', age_days=40)
+    oldest_kept = _write(Config.OUTPUT_DIR / 'linkedin_posts_2.json', age_days=10)
+    newer = [_write(Config.OUTPUT_DIR / f'linkedin_posts_{i}.json', age_days=10 - i) for i in (3, 4)]
+
+    stats = housekeeper.compact_output()
+
+    assert stats['files_compacted'] == 0
+    assert stats['files_removed'] == 2
+    assert not expired.exists() and not oldest_kept.exists()
+    assert all(path.exists() for path in newer)
+
+
+def test_rotated_logs_are_pruned_but_the_live_log_is_kept(housekeeper, monkeypatch):
+    monkeypatch.setattr(Config, 'LOG_RETENTION_DAYS', 7)
+    monkeypatch.setattr(Config, 'LOG_MAX_BYTES', 0)
+    live = _write(Config.LOG_FILE, age_days=30)
+    rotated = _write(Config.LOG_DIR / 'app.2024-03-01.log.gz', age_days=30)
+    fresh = _write(Config.LOG_DIR / 'app.2024-03-14.log.gz', age_days=1)
+
+    assert housekeeper.prune_logs()['files_removed'] == 1
+    assert live.exists() and fresh.exists() and not rotated.exists()
+
+
+def test_failing_step_is_reported_without_stopping_the_others(housekeeper, monkeypatch):
+    monkeypatch.setattr(Config, 'LOG_RETENTION_DAYS', 7)
+    _write(Config.LOG_DIR / 'app.2024-03-01.log.gz', size=1000, age_days=30)
+
+    def broken(*args, **kwargs):
+        raise OSError('disk on fire')
+    monkeypatch.setattr(housekeeper.archive, 'prune', broken)
+
+    report = housekeeper.run()
+
+    assert report['archive']['error'] == 'disk on fire'
+    assert report['logs']['bytes_reclaimed'] == 1000
+    assert report['bytes_reclaimed'] == sum(report[step]['bytes_reclaimed']
+                                            for step in ('output', 'archive', 'logs', 'checkpoints', 'run_history'))
@@ -0,0 +1,53 @@
+import base64
+import requests
+from utils.http_replay import CassetteLibrary, request_signature
+
+SEARCH_URL = 'https://www.googleapis.com/customsearch/v1?q=site%3Alinkedin.com+AI&key=SECRET-KEY&cx=SECRET-CX&start=1'
+
+
+def _response(body, status=200):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers['Content-Type'] = 'application/json'
+    return response
+
+
+def test_signature_drops_credentials_but_keeps_the_query():
+    loose, exact = request_signature('get', SEARCH_URL, None)
+
+    assert loose == 'GET www.googleapis.com/customsearch/v1?q=site%3Alinkedin.com+AI&start=1'
+    assert 'SECRET' not in exact
+    assert request_signature('GET', SEARCH_URL.replace('SECRET-KEY', 'OTHER-KEY'), None) == (loose, exact)
+
+
+def test_slack_webhook_token_is_not_part_of_the_signature():
+    loose, _ = request_signature('POST', 'https://hooks.slack.com/services/T000/B000/XXXXSECRET', b'{}')
+
+    assert loose == 'POST hooks.slack.com/services/*?'
+
+
+def test_body_only_changes_the_exact_key():
+    first = request_signature('POST', 'https://gql.hashnode.com/', b'{"query": "a"}')
+    second = request_signature('POST', 'https://gql.hashnode.com/', b'{"query": "b"}')
+
+    assert first[0] == second[0]
+    assert first[1] != second[1]
+
+
+def test_recorded_cassettes_hold_no_secrets_and_replay_in_order(tmp_path):
+    library = CassetteLibrary(tmp_path)
+    library.record('GET', SEARCH_URL, None, _response(b'{"page": 1}'))
+    library.record('GET', SEARCH_URL, None, _response(b'{"page": 2}'))
+
+    cassette = (tmp_path / 'www.googleapis.com.json').read_text()
+    assert 'SECRET' not in cassette
+
+    replay = CassetteLibrary(tmp_path)
+    assert replay.load() == 2
+    bodies = [
+        base64.b64decode(replay.match('GET', SEARCH_URL.replace('SECRET-KEY', 'k'), None)['response']['body'])
+        for _ in range(3)
+    ]
+    assert bodies == [b'{"page": 1}', b'{"page": 2}', b'{"page": 1}']
+    assert replay.match('GET', 'https://www.googleapis.com/customsearch/v1?q=other', None) is None
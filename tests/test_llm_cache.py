@@ -0,0 +1,64 @@
+from typing import Any, List
+import pytest
+from crewai.llms.base_llm import BaseLLM
+from pydantic import BaseModel
+import utils.llm_cache as llm_cache
+from utils.disk_cache import DiskCache
+from utils.llm_cache import CachedLLM, start_llm_cache_report, log_llm_cache_report
+
+MESSAGES = [{'role': 'user', 'content': 'Summarize the viral posts'}]
+SEARCH_TOOL = [{'type': 'function', 'function': {'name': 'linkedin_search', 'parameters': {}}}]
+
+
+class Idea(BaseModel):
+    title: str
+
+
+class FakeLLM(BaseLLM):
+    """Counts the calls that reach it and answers with the call number"""
+    calls: List[Any] = []
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        self.calls.append(tools)
+        if response_model is not None:
+            return response_model(title=f"idea {len(self.calls)}")
+        return f"answer {len(self.calls)}"
+
+
+@pytest.fixture
+def cached_llm(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, '_llm_cache', DiskCache(tmp_path / 'llm.db'))
+    return CachedLLM.wrap(FakeLLM(model='fake-model', calls=[]), 'brainstorm_agent')
+
+
+def test_repeated_text_call_is_served_from_cache(cached_llm):
+    report = start_llm_cache_report()
+
+    assert cached_llm.call(MESSAGES) == 'answer 1'
+    assert cached_llm.call(MESSAGES) == 'answer 1'
+
+    assert len(cached_llm.inner.calls) == 1
+    assert report == {'brainstorm_agent': {'hits': 1, 'misses': 1}}
+    log_llm_cache_report(report)
+
+
+def test_structured_answer_is_revalidated_on_hit(cached_llm):
+    first = cached_llm.call(MESSAGES, response_model=Idea)
+    second = cached_llm.call(MESSAGES, response_model=Idea)
+
+    assert isinstance(second, Idea)
+    assert second == first
+    assert len(cached_llm.inner.calls) == 1
+
+
+def test_calls_with_tools_always_reach_the_inner_llm(cached_llm):
+    assert cached_llm.call(MESSAGES) == 'answer 1'
+
+    assert cached_llm.call(MESSAGES, tools=SEARCH_TOOL) == 'answer 2'
+    assert cached_llm.call(MESSAGES, tools=SEARCH_TOOL) == 'answer 3'
+    assert cached_llm.call(MESSAGES, available_functions={'linkedin_search': lambda: []}) == 'answer 4'
+
+    assert cached_llm.inner.calls == [None, SEARCH_TOOL, SEARCH_TOOL, None]
+    # Tool-call answers were never stored, so the plain call still hits its own entry
+    assert cached_llm.call(MESSAGES) == 'answer 1'
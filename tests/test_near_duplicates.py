@@ -0,0 +1,47 @@
+from utils.near_duplicates import MinHashDeduplicator, canonical_url, deduplicate_posts
+
+TEXT = (
+    "Five lessons from shipping LLM agents to production: evaluate every tool call, "
+    "keep prompts versioned, cache deterministic steps and watch token costs weekly"
+)
+
+
+def test_canonical_url_collapses_tracking_variants():
+    assert canonical_url("https://nl.linkedin.com/posts/jane_post-123/?utm_source=share&trk=feed") == \
+        canonical_url("https://www.linkedin.com/posts/jane_post-123")
+    assert canonical_url("https://www.linkedin.com/feed/update/urn:li:activity:7123456789012345678/") == \
+        "linkedin:activity:7123456789012345678"
+
+
+def test_clusters_group_near_duplicates_only():
+    deduplicator = MinHashDeduplicator(threshold=0.7)
+    texts = [
+        TEXT,
+        TEXT + " #AI",
+        "A completely different post about hiring frontend engineers in Amsterdam this spring"
+    ]
+
+    clusters = sorted(sorted(cluster) for cluster in deduplicator.clusters(texts))
+
+    assert clusters == [[0, 1], [2]]
+
+
+def test_deduplicate_posts_keeps_the_most_engaged_and_merges_topics():
+    posts = [
+        {'url': 'https://www.linkedin.com/posts/a-1', 'title': 'Agents', 'text': TEXT,
+         'metrics': {'likes': 10}, 'matched_topics': ['AI']},
+        {'url': 'https://www.linkedin.com/posts/a-1?trk=x', 'title': 'Agents', 'text': TEXT,
+         'metrics': {'likes': 10}, 'matched_topics': ['LLM']},
+        {'url': 'https://www.linkedin.com/posts/b-2', 'title': 'Agents', 'text': TEXT + " #AI",
+         'metrics': {'likes': 500}, 'matched_topics': ['Python']}
+    ]
+
+    unique, stats = deduplicate_posts(posts, MinHashDeduplicator(threshold=0.7))
+
+    assert stats == {'url_duplicates_merged': 1, 'near_duplicates_merged': 1}
+    assert len(unique) == 1
+    assert unique[0]['url'] == 'https://www.linkedin.com/posts/b-2'
+    assert sorted(unique[0]['matched_topics']) == ['AI', 'LLM', 'Python']
+    assert unique[0]['duplicate_urls'] == [
+        'https://www.linkedin.com/posts/a-1', 'https://www.linkedin.com/posts/a-1?trk=x'
+    ]
@@ -0,0 +1,71 @@
+from datetime import date
+import pytest
+from utils.parquet_export import ParquetExporter
+from utils.post_archive import PostArchive
+
+
+def _post(slug, topics, scraped_at, reactions=0):
+    return {
+        'url': f'https://www.linkedin.com/posts/{slug}?trk=feed',
+        'text': slug,
+        'scraped_at': scraped_at,
+        'matched_topics': topics,
+        'metrics': {'reactions': reactions, 'comments': 0, 'shares': 0}
+    }
+
+
+def _archive_run(archive, run_id, posts):
+    writer = archive.open_run(run_id)
+    writer.write_many(posts)
+    writer.close()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return PostArchive(tmp_path / 'archive')
+
+
+@pytest.fixture
+def exporter(tmp_path, archive):
+    return ParquetExporter(tmp_path / 'parquet', archive)
+
+
+def test_runs_are_exported_once_into_scrape_day_partitions(archive, exporter):
+    _archive_run(archive, 'run-1', [
+        _post('a-1', ['AI'], '2024-03-10T23:59:00', reactions=10),
+        _post('a-1', ['LLM'], '2024-03-10T23:59:00', reactions=10),
+        _post('b-2', ['AI'], '2024-03-11T00:01:00')
+    ])
+
+    assert exporter.compact() == {'runs': 1, 'files': 2, 'posts': 2}
+    assert [path.name for path in exporter.partitions()] == ['date=2024-03-10', 'date=2024-03-11']
+
+    _archive_run(archive, 'run-2', [_post('c-3', ['Rust'], '2024-03-11T09:00:00')])
+    assert exporter.compact() == {'runs': 1, 'files': 1, 'posts': 1}
+    assert exporter.compact()['runs'] == 0
+    assert exporter.compacted_runs() == ['run-1', 'run-2']
+
+
+def test_load_reads_only_the_requested_days_and_columns(archive, exporter):
+    _archive_run(archive, 'run-1', [
+        _post('a-1', ['AI'], '2024-03-10T10:00:00', reactions=10),
+        _post('a-1', ['LLM'], '2024-03-10T10:00:00', reactions=10),
+        _post('b-2', ['Rust'], '2024-03-12T10:00:00', reactions=3)
+    ])
+    exporter.compact()
+
+    frame = exporter.load(start=date(2024, 3, 10), end=date(2024, 3, 11), columns=['url', 'topics', 'reactions'])
+
+    assert list(frame.columns) == ['url', 'topics', 'reactions']
+    assert frame['url'].tolist() == ['https://www.linkedin.com/posts/a-1']
+    assert list(frame['topics'][0]) == ['AI', 'LLM']
+    assert frame['reactions'].tolist() == [10]
+    assert len(exporter.load()) == 2
+
+
+def test_load_without_exports_returns_an_empty_typed_frame(exporter):
+    frame = exporter.load(columns=['url', 'scraped_at'])
+
+    assert frame.empty
+    assert list(frame.columns) == ['url', 'scraped_at']
+    assert str(frame['scraped_at'].dtype).startswith('datetime64')
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+import json
+import pytest
+from utils.post_archive import PostArchive
+
+
+def _post(i):
+    return {'url': f'https://www.linkedin.com/posts/p-{i}', 'text': f'post {i}'}
+
+
+def _archive_run(archive, run_id, posts, started_at=None, **metadata):
+    writer = archive.open_run(run_id, **metadata)
+    if started_at:
+        writer.started_at = started_at.isoformat()
+    writer.write_many(posts)
+    return writer.close()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return PostArchive(tmp_path / 'archive')
+
+
+def test_runs_round_trip_through_a_shared_segment(archive):
+    first = _archive_run(archive, 'run-1', [_post(1), _post(2)], topics=['AI'])
+    second = _archive_run(archive, 'run-2', [_post(3)])
+
+    assert first['segment'] == second['segment']
+    assert second['offset'] == first['length']
+    assert first['count'] == 2 and first['topics'] == ['AI']
+    assert list(archive.read_run('run-1')) == [_post(1), _post(2)]
+    assert list(archive.read_run('run-2')) == [_post(3)]
+    assert list(archive.read_run('unknown')) == []
+    assert not list(archive.spool_dir.glob('*.part'))
+
+
+def test_read_range_only_reads_runs_started_within_it(archive):
+    day = datetime(2024, 3, 10, 12, 0)
+    for i in range(3):
+        _archive_run(archive, f'run-{i}', [_post(i)], started_at=day + timedelta(days=i))
+
+    posts = list(archive.read_range(start=day + timedelta(days=1), end=day + timedelta(days=2)))
+
+    assert posts == [_post(1), _post(2)]
+    assert [entry['segment'] for entry in archive.runs()] == [
+        'posts-20240310-000.jsonl.gz', 'posts-20240311-000.jsonl.gz', 'posts-20240312-000.jsonl.gz'
+    ]
+
+
+def test_prune_drops_old_segments_and_their_index_entries(archive):
+    old = datetime.now() - timedelta(days=30)
+    _archive_run(archive, 'old', [_post(1)], started_at=old)
+    _archive_run(archive, 'new', [_post(2)])
+
+    stats = archive.prune(max_age_days=7)
+
+    assert stats['segments_removed'] == 1
+    assert [entry['run_id'] for entry in archive.runs()] == ['new']
+    assert list(archive.read_run('new')) == [_post(2)]
+
+
+def test_new_segment_after_prune_does_not_reuse_a_live_name(tmp_path):
+    archive = PostArchive(tmp_path / 'archive', segment_max_bytes=1)
+    _archive_run(archive, 'run-1', [_post(1)])
+    second = _archive_run(archive, 'run-2', [_post(2)])
+    assert second['segment'].endswith('-001.jsonl.gz')
+
+    assert archive.prune(max_bytes=1)['segments_removed'] == 1
+    kept_size = (archive.segment_dir / second['segment']).stat().st_size
+
+    third = _archive_run(archive, 'run-3', [_post(3)])
+
+    assert third['segment'].endswith('-002.jsonl.gz')
+    assert (archive.segment_dir / second['segment']).stat().st_size == kept_size
+    assert list(archive.read_range()) == [_post(2), _post(3)]
+
+
+def test_legacy_output_file_is_imported_once(archive, tmp_path):
+    legacy = tmp_path / 'linkedin_posts_20240301_101500.json'
+    legacy.write_text(json.dumps({'metadata': {'topics_searched': ['AI']}, 'posts': [_post(1)]}))
+
+    entry = archive.import_json_file(legacy)
+
+    assert entry['run_id'] == '20240301_101500_legacy'
+    assert entry['started_at'] == '2024-03-01T10:15:00'
+    assert archive.import_json_file(legacy) == entry
+    assert len(archive.runs()) == 1
+    assert list(archive.read_run(entry['run_id'])) == [_post(1)]
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+import pytest
+from utils.linkedin_google_search import LinkedInGoogleSearchTool
+from utils.post_ranking import EngagementScorer, top_k_posts
+
+NOW = datetime(2024, 3, 15, 12, 0)
+
+
+def _post(url, date=None, scraped_at=None, **metrics):
+    return {'url': url, 'date': date, 'scraped_at': scraped_at or NOW.isoformat(), 'metrics': metrics}
+
+
+def test_score_is_the_weighted_sum_of_metrics():
+    scorer = EngagementScorer(weights={'reactions': 1.0, 'comments': 2.0, 'shares': 3.0}, now=NOW)
+
+    assert scorer(_post('a', reactions=10, comments=5, shares=2)) == 26.0
+    assert scorer(_post('b')) == 0.0
+
+
+def test_score_halves_every_half_life_from_the_post_date():
+    scorer = EngagementScorer(weights={'reactions': 1.0}, half_life_hours=24, now=NOW)
+
+    assert scorer(_post('a', date=NOW.isoformat(), reactions=100)) == pytest.approx(100)
+    assert scorer(_post('b', date=(NOW - timedelta(hours=24)).isoformat(), reactions=100)) == pytest.approx(50)
+    assert scorer(_post('c', date=(NOW - timedelta(hours=72)).isoformat(), reactions=100)) == pytest.approx(12.5)
+
+
+def test_age_falls_back_to_scraped_at_and_ignores_bad_dates():
+    scorer = EngagementScorer(weights={'reactions': 1.0}, half_life_hours=24, now=NOW)
+    scraped = (NOW - timedelta(hours=48)).isoformat()
+
+    assert scorer(_post('a', date='not a date', scraped_at=scraped, reactions=100)) == pytest.approx(25)
+
+
+def test_no_half_life_means_no_decay():
+    scorer = EngagementScorer(weights={'reactions': 1.0}, now=NOW)
+
+    assert scorer(_post('a', date='2020-01-01T00:00:00', reactions=100)) == 100
+
+
+def test_recent_post_outranks_an_older_more_engaged_one():
+    scorer = EngagementScorer(weights={'reactions': 1.0}, half_life_hours=24, now=NOW)
+    old = _post('old', date=(NOW - timedelta(days=4)).isoformat(), reactions=500)
+    recent = _post('recent', date=(NOW - timedelta(hours=6)).isoformat(), reactions=100)
+
+    assert [post['url'] for post in top_k_posts([old, recent], score=scorer)] == ['recent', 'old']
+
+
+def test_top_k_keeps_the_best_k_and_input_order_on_ties():
+    posts = [_post(str(i), reactions=reactions) for i, reactions in enumerate([5, 9, 5, 1, 9])]
+    scorer = EngagementScorer(weights={'reactions': 1.0}, now=NOW)
+
+    assert [post['url'] for post in top_k_posts(posts, 3, scorer)] == ['1', '4', '0']
+    assert [post['url'] for post in top_k_posts(posts, None, scorer)] == ['1', '4', '0', '2', '3']
+    assert len(top_k_posts(posts, 0, scorer)) == 5
+
+
+@pytest.mark.parametrize('snippet, expected', [
+    ('Jane Doe · 12 Mar 2024 · Five lessons from shipping agents', '2024-03-12T00:00:00'),
+    ('posted 3 March 2025', '2025-03-03T00:00:00'),
+    ('Published 2024-07-01 on LinkedIn', '2024-07-01T00:00:00'),
+    ('12 Marvel 2024 heroes, then 2023-01-05', '2023-01-05T00:00:00'),
+    ('3 days ago', None)
+])
+def test_extract_date_parses_each_pattern_with_its_own_format(snippet, expected):
+    assert LinkedInGoogleSearchTool()._extract_date(snippet) == expected
@@ -0,0 +1,109 @@
+from datetime import datetime
+import json
+import pytest
+from utils.post_store import PostStore
+
+
+def _post(url, scraped_at, topics, reactions=0, comments=0, text='post text'):
+    return {
+        'url': url,
+        'text': text,
+        'scraped_at': scraped_at,
+        'matched_topics': topics,
+        'metrics': {'reactions': reactions, 'comments': comments, 'shares': 0}
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PostStore(tmp_path / 'posts.db')
+
+
+def test_rescrape_refreshes_metrics_and_merges_topics(store):
+    store.upsert_posts([_post('https://www.linkedin.com/posts/a-1', '2024-03-01T10:00:00', ['AI'], reactions=10)])
+    store.upsert_posts([_post('https://nl.linkedin.com/posts/a-1/?trk=feed', '2024-03-02T10:00:00', ['LLM'], reactions=50)])
+
+    total, posts = store.query_posts()
+
+    assert total == 1
+    assert posts[0]['metrics']['reactions'] == 50
+    assert posts[0]['first_seen'] == '2024-03-01T10:00:00'
+    assert posts[0]['scraped_at'] == '2024-03-02T10:00:00'
+    assert sorted(posts[0]['topics']) == ['ai', 'llm']
+
+
+def test_older_scrape_only_adds_its_topics(store):
+    store.upsert_posts([_post('https://www.linkedin.com/posts/a-1', '2024-03-02T10:00:00', ['AI'], reactions=50)])
+    store.upsert_posts([_post('https://www.linkedin.com/posts/a-1', '2024-03-01T10:00:00', ['Python'], reactions=10)])
+
+    _, posts = store.query_posts()
+
+    assert posts[0]['metrics']['reactions'] == 50
+    assert posts[0]['first_seen'] == '2024-03-01T10:00:00'
+    assert sorted(posts[0]['topics']) == ['ai', 'python']
+
+
+def test_posts_without_url_or_text_are_skipped(store):
+    stored = store.upsert_posts([
+        {'text': 'no url', 'metrics': {}},
+        {'url': 'https://www.linkedin.com/posts/b-2'},
+        _post('https://www.linkedin.com/posts/c-3', '2024-03-01T10:00:00', ['AI'])
+    ])
+
+    assert stored == 1
+    assert store.stats() == {'posts': 1, 'topics': 1}
+
+
+def test_query_filters_sorts_and_pages(store):
+    store.upsert_posts([
+        _post(f'https://www.linkedin.com/posts/p-{i}', f'2024-03-{i + 1:02d}T10:00:00',
+              ['AI'] if i % 2 else ['Rust'], reactions=i * 10, comments=10 - i)
+        for i in range(6)
+    ])
+
+    total, page = store.query_posts(topic='ai', sort='reactions', limit=2)
+    assert total == 3
+    assert [post['metrics']['reactions'] for post in page] == [50, 30]
+
+    total, page = store.query_posts(topic='AI', sort='reactions', limit=2, offset=2)
+    assert total == 3
+    assert [post['metrics']['reactions'] for post in page] == [10]
+
+    total, page = store.query_posts(since=datetime(2024, 3, 3), until=datetime(2024, 3, 5), sort='scraped_at')
+    assert total == 2
+    assert [post['scraped_at'][:10] for post in page] == ['2024-03-04', '2024-03-03']
+
+    _, page = store.query_posts(sort='comments', limit=1)
+    assert page[0]['metrics']['comments'] == 10
+
+    # Scores weigh comments double: 20, 28, 36, 44, 52, 60
+    total, _ = store.query_posts(min_score=50)
+    assert total == 2
+
+
+def test_query_rejects_unknown_sort(store):
+    with pytest.raises(ValueError, match='Unsupported sort'):
+        store.query_posts(sort='url; DROP TABLE posts')
+
+
+def test_ingest_skips_malformed_files_and_loads_the_rest(store, tmp_path):
+    good = tmp_path / 'linkedin_posts_1.json'
+    good.write_text(json.dumps({
+        'metadata': {'topics_searched': ['AI']},
+        'posts': [
+            {'url': 'https://www.linkedin.com/posts/a-1', 'text': 'one'},
+            {'url': 'https://www.linkedin.com/posts/b-2', 'text': 'two', 'matched_topics': ['LLM']}
+        ]
+    }))
+    not_a_dict = tmp_path / 'linkedin_posts_2.json'
+    not_a_dict.write_text(json.dumps([{'url': 'https://www.linkedin.com/posts/c-3'}]))
+    broken = tmp_path / 'linkedin_posts_3.json'
+    broken.write_text('{"posts": [')
+    missing = tmp_path / 'linkedin_posts_4.json'
+
+    stats = store.ingest_output_files([not_a_dict, broken, missing, good], max_workers=2)
+
+    assert stats == {'files': 1, 'failed': 3, 'posts': 2}
+    total, posts = store.query_posts(topic='ai')
+    assert total == 1
+    assert posts[0]['url'] == 'https://www.linkedin.com/posts/a-1'
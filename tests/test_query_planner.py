@@ -0,0 +1,35 @@
+from utils.query_planner import QueryBatch, attribute_topics, plan_queries
+
+
+def _item(title, snippet=''):
+    return {'title': title, 'snippet': snippet}
+
+
+def test_short_topics_are_packed_into_or_queries():
+    batches = plan_queries(['LLM agents', 'Rust', 'vector databases', 'MLOps'], max_topics_per_query=3)
+
+    assert [batch.topics for batch in batches] == [['LLM agents', 'Rust', 'vector databases'], ['MLOps']]
+    assert batches[0].query == 'site:linkedin.com/posts/ ("LLM agents" OR Rust OR "vector databases")'
+    assert batches[1] == QueryBatch.single('MLOps')
+
+
+def test_long_topics_and_word_limit_get_their_own_queries():
+    long_topic = 'retrieval augmented generation in production'
+    batches = plan_queries(['Rust', long_topic, 'Go', 'Zig', 'Rust'], max_query_words=4)
+
+    assert [batch.topics for batch in batches] == [[long_topic], ['Rust', 'Go'], ['Zig']]
+    assert all(len(batch.query.replace('(', ' ').replace(')', ' ').split()) <= 4 for batch in batches[1:])
+
+
+def test_result_goes_to_the_topics_whose_keywords_it_contains():
+    topics = ['LLM agents', 'vector databases', 'Rust']
+
+    assert attribute_topics(_item('Building LLM agents', 'with Rust'), topics) == ['LLM agents', 'Rust']
+    # Best partial match wins when no topic matches fully
+    assert attribute_topics(_item('Why vector search matters'), topics) == ['vector databases']
+
+
+def test_unmatched_batched_result_is_attributed_to_no_topic():
+    assert attribute_topics(_item('Hiring a product designer'), ['LLM agents', 'Rust']) == []
+    # A single-topic query is trusted as is
+    assert attribute_topics(_item('Hiring a product designer'), ['Rust']) == ['Rust']
@@ -0,0 +1,58 @@
+import time
+import pytest
+from utils.rate_limiter import RateLimiter, QuotaExceededError
+
+
+def test_burst_is_served_without_waiting():
+    limiter = RateLimiter(per_minute=60, daily_quota=100, burst=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+
+    assert time.monotonic() - start < 0.1
+    assert limiter.status()['used_today'] == 3
+
+
+def test_tokens_refill_at_the_per_minute_rate():
+    limiter = RateLimiter(per_minute=600, daily_quota=100, burst=1)
+    limiter.acquire()
+
+    start = time.monotonic()
+    limiter.acquire()
+
+    # One token every 0.1s at 600 per minute
+    assert 0.05 <= time.monotonic() - start < 0.5
+
+
+def test_acquire_times_out_instead_of_waiting_past_max_wait():
+    limiter = RateLimiter(per_minute=1, daily_quota=100, burst=1, max_wait=0.2)
+    limiter.acquire()
+
+    with pytest.raises(TimeoutError):
+        limiter.acquire()
+
+
+def test_daily_quota_is_enforced():
+    limiter = RateLimiter(per_minute=600, daily_quota=2, burst=5)
+    limiter.acquire()
+    limiter.acquire()
+
+    with pytest.raises(QuotaExceededError):
+        limiter.acquire()
+
+
+def test_backoff_and_retry_after_are_capped_at_max_wait():
+    limiter = RateLimiter(per_minute=60, daily_quota=100, max_wait=5.0, max_backoff=300.0)
+
+    assert limiter.report_rate_limited(retry_after=120) == 5.0
+    assert limiter.status()['backoff_remaining'] <= 5.0
+
+
+def test_backoff_grows_until_a_success_resets_it():
+    limiter = RateLimiter(per_minute=60, daily_quota=100, base_backoff=0.01)
+
+    assert limiter.report_rate_limited() == pytest.approx(0.01)
+    assert limiter.report_rate_limited() == pytest.approx(0.02)
+    limiter.report_success()
+    assert limiter.report_rate_limited() == pytest.approx(0.01)
@@ -0,0 +1,109 @@
+import pytest
+from crewai.tasks.task_output import TaskOutput
+from config.settings import Config
+from utils.run_checkpoints import CheckpointStore
+
+INPUTS = {'topics': ['LLM agents']}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / 'checkpoints.db'
+
+
+def _output(name: str, raw: str = 'done') -> TaskOutput:
+    return TaskOutput(description=name, raw=raw, agent='agent', name=name)
+
+
+def test_new_inputs_start_a_new_run(db_path):
+    store = CheckpointStore(db_path)
+
+    run_id, resumed = store.begin_run(INPUTS)
+
+    assert not resumed
+    assert store.get_run(run_id)['status'] == 'running'
+
+
+def test_completed_run_is_not_resumed(db_path):
+    store = CheckpointStore(db_path)
+    first, _ = store.begin_run(INPUTS)
+    store.finish_run(first, 'completed')
+
+    second, resumed = store.begin_run(INPUTS)
+
+    assert second != first
+    assert not resumed
+
+
+def test_failed_run_is_not_resumed_automatically(db_path):
+    store = CheckpointStore(db_path)
+    failed, _ = store.begin_run(INPUTS)
+    store.save_output(failed, _output('search_linkedin_posts'))
+    store.finish_run(failed, 'failed')
+
+    run_id, resumed = store.begin_run(INPUTS)
+
+    assert run_id != failed
+    assert not resumed
+    assert store.load_outputs(run_id) == {}
+
+
+def test_failed_run_is_resumed_by_run_id(db_path):
+    store = CheckpointStore(db_path)
+    failed, _ = store.begin_run(INPUTS)
+    store.finish_run(failed, 'failed')
+
+    run_id, resumed = store.begin_run(INPUTS, failed)
+
+    assert run_id == failed
+    assert resumed
+    assert store.get_run(failed)['status'] == 'running'
+
+
+def test_interrupted_run_is_resumed_by_the_next_process(db_path):
+    interrupted, _ = CheckpointStore(db_path).begin_run(INPUTS)
+
+    run_id, resumed = CheckpointStore(db_path).begin_run(INPUTS)
+
+    assert run_id == interrupted
+    assert resumed
+
+
+def test_run_active_in_this_process_is_not_resumed(db_path):
+    store = CheckpointStore(db_path)
+    active, _ = store.begin_run(INPUTS)
+
+    run_id, resumed = store.begin_run(INPUTS)
+
+    assert run_id != active
+    assert not resumed
+
+
+def test_interrupted_run_older_than_max_age_is_not_resumed(db_path, monkeypatch):
+    interrupted, _ = CheckpointStore(db_path).begin_run(INPUTS)
+    monkeypatch.setattr(Config, 'CHECKPOINT_RESUME_MAX_AGE_HOURS', -1)
+
+    run_id, resumed = CheckpointStore(db_path).begin_run(INPUTS)
+
+    assert run_id != interrupted
+    assert not resumed
+
+
+def test_run_id_with_different_inputs_is_rejected(db_path):
+    store = CheckpointStore(db_path)
+    run_id, _ = store.begin_run(INPUTS)
+    store.finish_run(run_id, 'failed')
+
+    with pytest.raises(ValueError):
+        store.begin_run({'topics': ['something else']}, run_id)
+
+
+def test_discard_outputs_removes_only_the_rerun_tasks(db_path):
+    store = CheckpointStore(db_path)
+    run_id, _ = store.begin_run(INPUTS)
+    for name in ('generate_ideas', 'create_post', 'notify_user'):
+        store.save_output(run_id, _output(name))
+
+    assert store.discard_outputs(run_id, ['create_post', 'notify_user']) == 2
+    assert list(store.load_outputs(run_id)) == ['generate_ideas']
+    assert store.discard_outputs(run_id, []) == 0
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+import pytest
+from utils.run_history import RunHistoryStore
+
+START = datetime(2024, 3, 15, 9, 0)
+
+
+def _record(execution_id, status, minutes, trigger='manual'):
+    started = START + timedelta(minutes=minutes)
+    return {
+        'execution_id': execution_id,
+        'trigger': trigger,
+        'status': status,
+        'created_at': started.isoformat(),
+        'started_at': started.isoformat(),
+        'finished_at': (started + timedelta(minutes=5)).isoformat() if status not in ('queued', 'running') else None
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RunHistoryStore(tmp_path / 'scheduler.db')
+
+
+def test_summary_reports_last_started_and_last_succeeded(store):
+    store.upsert(_record('a', 'succeeded', 0))
+    store.upsert(_record('b', 'failed', 10))
+    store.upsert(_record('c', 'running', 20))
+
+    summary = store.summary()
+
+    assert summary['last_execution_id'] == 'c'
+    assert summary['last_execution_status'] == 'running'
+    assert summary['last_success'] == datetime.fromisoformat(_record('a', 'succeeded', 0)['finished_at']).timestamp()
+
+
+@pytest.mark.parametrize('query', [
+    "SELECT execution_id FROM run_history WHERE started_at IS NOT NULL ORDER BY started_at DESC LIMIT 1",
+    "SELECT execution_id FROM run_history WHERE status = 'failed' ORDER BY started_at DESC LIMIT 1"
+])
+def test_started_at_lookups_use_an_index(store, query):
+    plan = ' '.join(row['detail'] for row in store._conn.execute(f"EXPLAIN QUERY PLAN {query}"))
+
+    assert 'USING' in plan and 'INDEX' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_list_filters_pages_and_interrupts_active_runs(store):
+    for i, status in enumerate(['succeeded', 'failed', 'running', 'queued']):
+        store.upsert(_record(f'run-{i}', status, i, trigger='api' if i % 2 else 'scheduled'))
+
+    total, page = store.list_runs(trigger='api', limit=1)
+    assert total == 2
+    assert [record['execution_id'] for record in page] == ['run-3']
+
+    assert store.mark_interrupted() == 2
+    total, _ = store.list_runs(status='interrupted')
+    assert total == 2
+    assert store.get('run-2')['error'] == 'Process stopped before the execution finished'
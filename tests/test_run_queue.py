@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from utils.run_queue import RunQueue, RunPriority, QueueFullError
+
+
+def _recording_run(order, name):
+    async def run():
+        order.append(name)
+        return name
+    return run
+
+
+async def _hold_worker(queue: RunQueue) -> asyncio.Event:
+    """Occupy the queue's only worker until the returned event is set"""
+    release = asyncio.Event()
+    queue.submit(release.wait, RunPriority.MANUAL, name='blocker')
+    await asyncio.sleep(0)
+    assert queue.running == 1
+    return release
+
+
+@pytest.mark.asyncio
+async def test_runs_are_served_by_priority_then_submission_order():
+    queue = RunQueue(workers=1, max_depth=10)
+    queue.start()
+    try:
+        release = await _hold_worker(queue)
+        order = []
+        futures = [
+            queue.submit(_recording_run(order, 'speculative'), RunPriority.SPECULATIVE),
+            queue.submit(_recording_run(order, 'scheduled'), RunPriority.SCHEDULED),
+            queue.submit(_recording_run(order, 'manual-1'), RunPriority.MANUAL),
+            queue.submit(_recording_run(order, 'manual-2'), RunPriority.MANUAL)
+        ]
+        assert queue.metrics()['depth_by_priority'] == {'manual': 2, 'scheduled': 1, 'speculative': 1}
+
+        release.set()
+        results = await asyncio.gather(*futures)
+    finally:
+        queue.stop()
+
+    assert order == ['manual-1', 'manual-2', 'scheduled', 'speculative']
+    assert results == ['speculative', 'scheduled', 'manual-1', 'manual-2']
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_with_retry_after_when_full():
+    queue = RunQueue(workers=1, max_depth=2, default_retry_after=42)
+    queue.start()
+    try:
+        release = await _hold_worker(queue)
+        queue.submit(_recording_run([], 'first'), RunPriority.SCHEDULED)
+        queue.submit(_recording_run([], 'second'), RunPriority.SCHEDULED)
+
+        with pytest.raises(QueueFullError) as excinfo:
+            queue.submit(_recording_run([], 'third'), RunPriority.MANUAL)
+
+        # No run has finished yet, so the estimate falls back to the default
+        assert excinfo.value.retry_after == 42
+        metrics = queue.metrics()
+        assert metrics['rejected'] == 1
+        assert metrics['submitted'] == 3
+        assert metrics['depth'] == 2
+        release.set()
+    finally:
+        queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_estimated_from_recent_run_times():
+    queue = RunQueue(workers=1, max_depth=1, default_retry_after=600)
+    queue.start()
+    try:
+        await queue.submit(_recording_run([], 'warmup'))
+        release = await _hold_worker(queue)
+        queue.submit(_recording_run([], 'waiting'))
+
+        with pytest.raises(QueueFullError) as excinfo:
+            queue.submit(_recording_run([], 'rejected'))
+
+        assert excinfo.value.retry_after == 1
+        release.set()
+    finally:
+        queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_run_sets_exception_on_its_future():
+    async def failing():
+        raise RuntimeError("crew failed")
+
+    queue = RunQueue(workers=1)
+    queue.start()
+    try:
+        with pytest.raises(RuntimeError, match="crew failed"):
+            await queue.submit(failing)
+        assert await queue.submit(_recording_run([], 'next')) == 'next'
+    finally:
+        queue.stop()
+
+    metrics = queue.metrics()
+    assert metrics['failed'] == 1
+    assert metrics['completed'] == 1
+
+
+def test_submit_requires_started_queue():
+    with pytest.raises(RuntimeError):
+        RunQueue().submit(_recording_run([], 'run'))
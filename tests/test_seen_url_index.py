@@ -0,0 +1,54 @@
+from utils.seen_url_index import BloomFilter, SeenUrlIndex
+
+
+def _post(url, topics, text='text', likes=10):
+    return {'url': url, 'matched_topics': topics, 'text': text, 'metrics': {'likes': likes}}
+
+
+def test_bloom_filter_has_no_false_negatives_and_round_trips():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"https://www.linkedin.com/posts/{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    restored = BloomFilter(1000, 0.01, bloom.to_bytes())
+
+    assert all(item in bloom for item in items)
+    assert all(item in restored for item in items)
+
+
+def test_bloom_filter_false_positive_rate_stays_near_target():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"seen-{i}")
+
+    false_positives = sum(f"unseen-{i}" in bloom for i in range(10000))
+
+    assert false_positives < 300
+
+
+def test_partition_reports_only_new_or_changed_posts(tmp_path):
+    index = SeenUrlIndex(tmp_path / 'seen.db')
+    index.record([_post('https://a', ['AI']), _post('https://b', ['AI'])])
+
+    new_posts, unchanged = index.partition([
+        _post('https://a', ['AI']),
+        _post('https://b', ['AI'], likes=99),
+        _post('https://c', ['AI']),
+        _post('https://a', ['Python'])
+    ])
+
+    assert [post['url'] for post in unchanged] == ['https://a']
+    assert [(post['url'], post['matched_topics']) for post in new_posts] == [
+        ('https://b', ['AI']), ('https://c', ['AI']), ('https://a', ['Python'])
+    ]
+
+
+def test_was_seen_is_per_topic_and_survives_reopening(tmp_path):
+    SeenUrlIndex(tmp_path / 'seen.db').record([_post('https://a', ['AI'])])
+
+    index = SeenUrlIndex(tmp_path / 'seen.db')
+
+    assert index.was_seen('https://a', ['ai'])
+    assert not index.was_seen('https://a', ['Python'])
+    assert not index.was_seen('https://b', ['AI'])
@@ -0,0 +1,45 @@
+from api.slack_callback_handler import extract_post_from_blocks
+from utils.notification_slack_tool import NotificationSlackTool, run_id_from_block_id
+
+
+def _digest(*posts):
+    tool = NotificationSlackTool()
+    blocks = [{"type": "header", "text": {"type": "plain_text", "text": "Daily digest"}}]
+    for title, content, run_id in posts:
+        blocks.extend(tool._post_blocks(title, content, run_id))
+    return blocks
+
+
+def _block_id(blocks, run_id):
+    return next(block["block_id"] for block in blocks if block.get("block_id", "").endswith(run_id))
+
+
+def test_run_id_is_read_from_tagged_actions_blocks_only():
+    assert run_id_from_block_id("run:20240315_090000_abc123") == "20240315_090000_abc123"
+    assert run_id_from_block_id("run:") is None
+    assert run_id_from_block_id("xYz1") is None
+    assert run_id_from_block_id(None) is None
+
+
+def test_clicked_post_is_extracted_from_a_digest():
+    blocks = _digest(("First", "Agents in production", "run-a"), ("Second", "Rust for ML", "run-b"))
+
+    block_id = _block_id(blocks, "run-b")
+
+    assert run_id_from_block_id(block_id) == "run-b"
+    assert extract_post_from_blocks(blocks, block_id) == ("Second", "Rust for ML")
+    assert extract_post_from_blocks(blocks, _block_id(blocks, "run-a")) == ("First", "Agents in production")
+
+
+def test_long_post_parts_are_joined_back_together():
+    content = "x" * 2500 + "y" * 2500
+    blocks = _digest(("Long", content, "run-a"))
+
+    assert extract_post_from_blocks(blocks, _block_id(blocks, "run-a")) == ("Long", content)
+
+
+def test_untagged_message_falls_back_to_its_single_post():
+    blocks = _digest(("Only", "One post", None))
+
+    assert extract_post_from_blocks(blocks, "xYz1") == ("Only", "One post")
+    assert extract_post_from_blocks(blocks, None) == ("Only", "One post")
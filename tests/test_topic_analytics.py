@@ -0,0 +1,92 @@
+from datetime import datetime
+import pytest
+from config.settings import Config
+from utils.parquet_export import ParquetExporter
+from utils.post_archive import PostArchive
+from utils.topic_analytics import TopicTrendAnalyzer
+
+NOW = datetime(2024, 3, 15, 12, 0)
+WEIGHTS = {'reactions': 1.0, 'comments': 1.0, 'shares': 1.0}
+
+
+def _post(slug, topics, scraped_at, date=None, reactions=0):
+    return {
+        'url': f'https://www.linkedin.com/posts/{slug}',
+        'text': slug,
+        'date': date,
+        'scraped_at': scraped_at,
+        'matched_topics': topics,
+        'metrics': {'reactions': reactions, 'comments': 0, 'shares': 0}
+    }
+
+
+def _archive_run(archive, run_id, started_at, posts):
+    writer = archive.open_run(run_id)
+    writer.started_at = started_at
+    writer.write_many(posts)
+    writer.close()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return PostArchive(tmp_path / 'archive')
+
+
+@pytest.mark.parametrize('compact_first_run', [False, True])
+def test_rescrape_refreshes_engagement_without_counting_the_post_twice(archive, tmp_path, compact_first_run):
+    _archive_run(archive, 'run-1', '2024-03-10T09:00:00', [
+        _post('a-1', ['AI'], '2024-03-10T09:00:00', date='2024-03-09T00:00:00', reactions=10),
+        _post('b-2', ['AI', 'LLM'], '2024-03-10T09:00:00', reactions=5)
+    ])
+    exporter = ParquetExporter(tmp_path / 'parquet', archive) if compact_first_run else None
+    if exporter:
+        assert exporter.compact()['runs'] == 1
+    _archive_run(archive, 'run-2', '2024-03-12T09:00:00', [
+        _post('a-1', ['AI'], '2024-03-12T09:00:00', date='2024-03-09T00:00:00', reactions=100)
+    ])
+
+    analyzer = TopicTrendAnalyzer(archive, WEIGHTS, exporter)
+    topics = {topic['topic']: topic for topic in analyzer.trends(now=NOW)}
+
+    assert topics['ai']['volume'] == 2
+    assert topics['ai']['engagement'] == 105
+    assert topics['llm']['volume'] == 1
+    assert analyzer.status() == {'runs_folded': 2, 'topics': 2, 'topic_posts': 3}
+
+
+def test_older_scrape_folded_later_does_not_overwrite_newer_metrics(archive):
+    analyzer = TopicTrendAnalyzer(archive, WEIGHTS)
+    _archive_run(archive, 'run-2', '2024-03-12T09:00:00', [_post('a-1', ['AI'], '2024-03-12T09:00:00', reactions=100)])
+    analyzer.refresh(now=NOW)
+    _archive_run(archive, 'run-1', '2024-03-10T09:00:00', [_post('a-1', ['AI'], '2024-03-10T09:00:00', reactions=10)])
+
+    topics = analyzer.trends(now=NOW)
+
+    assert topics[0]['engagement'] == 100
+    assert topics[0]['volume'] == 1
+
+
+def test_posts_age_out_past_the_retention_horizon(archive, monkeypatch):
+    monkeypatch.setattr(Config, 'TOPIC_TRENDS_RETENTION_DAYS', 7)
+    _archive_run(archive, 'run-1', '2024-03-14T09:00:00', [
+        _post('old-1', ['AI'], '2024-03-14T09:00:00', date='2024-03-01T00:00:00', reactions=50),
+        _post('new-2', ['AI'], '2024-03-14T09:00:00', date='2024-03-14T00:00:00', reactions=5)
+    ])
+    analyzer = TopicTrendAnalyzer(archive, WEIGHTS)
+
+    assert analyzer.trends(now=NOW)[0]['total_engagement'] == 5
+    assert analyzer.status()['topic_posts'] == 1
+
+    assert analyzer.trends(now=datetime(2024, 3, 30)) == []
+    assert analyzer.status()['topic_posts'] == 0
+
+
+def test_runs_pruned_from_the_archive_are_forgotten(archive):
+    _archive_run(archive, 'run-1', '2024-03-14T09:00:00', [_post('a-1', ['AI'], '2024-03-14T09:00:00')])
+    analyzer = TopicTrendAnalyzer(archive, WEIGHTS)
+    assert analyzer.refresh(now=NOW) == 1
+
+    archive.index_path.write_text('')
+
+    assert analyzer.refresh(now=NOW) == 0
+    assert analyzer.status()['runs_folded'] == 0
@@ -1,5 +1,6 @@
 from crewai.tools import BaseTool
 from typing import Dict, Any, Optional
+from pydantic import Field
 import requests
 from config.settings import Config
 from utils.logger import logger
@@ -10,6 +11,7 @@ from datetime import datetime
 class HashNodePublisher(BaseTool):
     name: str = "HashNode Blog Publisher"
     description: str = "Creates and publishes technical blog posts on HashNode with length between 800-1000 words"
+    session: requests.Session = Field(default_factory=requests.Session, exclude=True)
 
     def __init__(self):
         super().__init__()
@@ -96,7 +98,7 @@ class HashNodePublisher(BaseTool):
                 "Content-Type": "application/json"
             }
 
-            response = requests.post(
+            response = self.session.post(
                 "https://gql.hashnode.com",
                 headers=headers,
                 json={
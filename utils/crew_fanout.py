@@ -0,0 +1,191 @@
+from typing import List, Dict, Any, Set, Optional
+from multiprocessing.connection import Connection, wait
+import multiprocessing
+import time
+from config.settings import Config
+from utils.logger import logger
+from utils.notification_slack_tool import NotificationSlackTool
+from utils.query_planner import TOKEN, STOPWORDS
+from utils.run_checkpoints import get_checkpoint_store
+
+
+def _content_tokens(topic: str) -> Set[str]:
+    tokens = set(TOKEN.findall(topic.lower()))
+    return (tokens - STOPWORDS) or tokens
+
+
+def cluster_topics(topics: List[str], max_size: int = 1) -> List[List[str]]:
+    """
+    Group topics into pipelines of at most max_size topics
+
+    A topic joins the first cluster with room that shares a content word with
+    it, so related topics are researched together; max_size=1 gives one
+    pipeline per topic.
+    """
+    clusters: List[List[str]] = []
+    cluster_tokens: List[Set[str]] = []
+    for topic in dict.fromkeys(topics):
+        tokens = _content_tokens(topic)
+        for cluster, shared in zip(clusters, cluster_tokens):
+            if len(cluster) < max_size and tokens & shared:
+                cluster.append(topic)
+                shared.update(tokens)
+                break
+        else:
+            clusters.append([topic])
+            cluster_tokens.append(set(tokens))
+    return clusters
+
+
+def _run_pipeline(topics: List[str], conn: Connection) -> None:
+    """
+    Draft a post for one topic cluster (runs in its own process)
+
+    The run id is sent to the parent as soon as the run is registered, so
+    the parent can close out the run if it has to stop this process; the
+    outcome follows as a single result message.
+    """
+    # Imported here so the parent process never builds a crew itself
+    from main import run_crew_workflow
+
+    start_time = time.perf_counter()
+    try:
+        run_id, result = run_crew_workflow(
+            topics, notify=False, on_begin=lambda run_id: conn.send(('run_id', run_id))
+        )
+        post = result.pydantic.model_dump() if result.pydantic is not None else {
+            'title': f"LinkedIn post: {', '.join(topics)}",
+            'content': result.raw
+        }
+        outcome = {'topics': topics, 'run_id': run_id, 'post': post, 'error': None,
+                   'seconds': round(time.perf_counter() - start_time, 1)}
+    except Exception as e:
+        logger.exception(f"Pipeline for {topics} failed: {e}")
+        outcome = {'topics': topics, 'run_id': None, 'post': None, 'error': str(e),
+                   'seconds': round(time.perf_counter() - start_time, 1)}
+    conn.send(('result', outcome))
+    conn.close()
+
+
+class _Pipeline:
+    """One topic cluster and the process drafting its post"""
+
+    def __init__(self, topics: List[str]):
+        self.topics = topics
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn: Optional[Connection] = None
+        self.run_id: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.started_at: Optional[float] = None
+        # Set when the parent ended the pipeline, so its run was never closed out
+        self.interrupted = False
+
+    def start(self, context: Any) -> None:
+        parent_conn, child_conn = context.Pipe(duplex=False)
+        self.process = context.Process(target=_run_pipeline, args=(self.topics, child_conn), name='crew-pipeline')
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.started_at = time.perf_counter()
+
+    def fail(self, error: str) -> None:
+        self.interrupted = True
+        seconds = round(time.perf_counter() - self.started_at, 1) if self.started_at is not None else 0.0
+        self.result = {'topics': self.topics, 'run_id': self.run_id, 'post': None, 'error': error, 'seconds': seconds}
+
+    def stop(self, kill: bool = False) -> None:
+        """Close the pipe and reap the process, terminating it first when kill is set"""
+        if self.process is None:
+            return
+        if kill and self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.conn.close()
+
+
+def run_topic_fanout(topics: List[str]) -> Dict[str, Any]:
+    """
+    Run one crew pipeline per topic cluster in parallel and send one Slack digest
+
+    Each pipeline runs in its own spawned process, at most
+    CREW_FANOUT_MAX_WORKERS at a time, so crews never share memory, agent
+    state or the GIL. A failing or slow topic only loses its own post:
+    failures are listed in the digest, and pipelines not finished after
+    CREW_FANOUT_TIMEOUT_SECONDS are terminated and listed as timed out. The
+    checkpointed runs of terminated or crashed pipelines are marked failed,
+    so a later run with the same topics starts over instead of silently
+    resuming them.
+
+    Args:
+        topics (List[str]): Topics to draft posts for
+
+    Returns:
+        Dict[str, Any]: Per-pipeline timings and errors, and whether the digest was sent
+    """
+    clusters = cluster_topics(topics, max(1, Config.CREW_FANOUT_CLUSTER_SIZE))
+    workers = max(1, min(Config.CREW_FANOUT_MAX_WORKERS, len(clusters)))
+    logger.info(f"Fanning out {len(clusters)} pipelines over {workers} worker processes: {clusters}")
+
+    start_time = time.perf_counter()
+    deadline = time.monotonic() + Config.CREW_FANOUT_TIMEOUT_SECONDS
+    context = multiprocessing.get_context('spawn')
+    pipelines = [_Pipeline(cluster) for cluster in clusters]
+    pending = list(pipelines)
+    running: Dict[Connection, _Pipeline] = {}
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                pipeline = pending.pop(0)
+                pipeline.start(context)
+                running[pipeline.conn] = pipeline
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for conn in wait(list(running), timeout=remaining):
+                pipeline = running[conn]
+                try:
+                    kind, value = conn.recv()
+                except EOFError:
+                    # The process died without reporting (e.g. out of memory)
+                    del running[conn]
+                    pipeline.stop()
+                    pipeline.fail(f"worker process exited with code {pipeline.process.exitcode}")
+                    continue
+                if kind == 'run_id':
+                    pipeline.run_id = value
+                else:
+                    del running[conn]
+                    pipeline.stop()
+                    pipeline.result = value
+    finally:
+        for pipeline in running.values():
+            pipeline.stop(kill=True)
+            pipeline.fail(f"timed out after {Config.CREW_FANOUT_TIMEOUT_SECONDS}s")
+        for pipeline in pending:
+            pipeline.fail(f"timed out after {Config.CREW_FANOUT_TIMEOUT_SECONDS}s")
+        for pipeline in pipelines:
+            if pipeline.interrupted and pipeline.run_id is not None:
+                # Stopped before run_crew_workflow could close out its own run
+                get_checkpoint_store().finish_run(pipeline.run_id, 'failed')
+
+    results = [pipeline.result for pipeline in pipelines]
+
+    for result in results:
+        if result['error']:
+            logger.error(f"Pipeline {result['topics']} failed after {result['seconds']}s: {result['error']}")
+        else:
+            logger.info(f"Pipeline {result['topics']} drafted a post in {result['seconds']}s (run {result['run_id']})")
+
+    digest = NotificationSlackTool().send_digest(results)
+    report = {
+        'wall_clock_s': round(time.perf_counter() - start_time, 1),
+        'succeeded': sum(1 for result in results if not result['error']),
+        'failed': sum(1 for result in results if result['error']),
+        'digest_sent': digest.get('sent', False),
+        'pipelines': [{key: value for key, value in result.items() if key != 'post'} for result in results]
+    }
+    logger.info(
+        f"Fan-out finished in {report['wall_clock_s']}s: {report['succeeded']} posts drafted, {report['failed']} failed"
+    )
+    return report
@@ -0,0 +1,247 @@
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from multiprocessing.connection import Connection
+import multiprocessing
+import queue
+import resource
+import threading
+import time
+import traceback
+from utils.logger import logger
+
+# Called with (stage, status, timestamp, run_id) for each crew task event of a job
+ProgressCallback = Callable[[str, str, str, Optional[str]], None]
+
+
+class CrewWorkerError(Exception):
+    """Raised when a job fails in a worker process or the worker dies while running it"""
+
+
+def _rss_mb() -> float:
+    """Resident memory of the current process in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker_main(conn: Connection, max_jobs: int, max_rss_mb: int) -> None:
+    """
+    Worker process loop
+
+    Imports crewai and builds the crew factory before reporting ready, so
+    the first job does not pay for it. Task events of a running job are
+    forwarded to the parent as progress messages. After each job the worker
+    retires itself once it has served max_jobs jobs or its memory exceeds
+    max_rss_mb.
+    """
+    from crewai.events.event_bus import crewai_event_bus
+    from crewai.events.types.task_events import TaskStartedEvent, TaskCompletedEvent, TaskFailedEvent
+    from utils.execution_store import summarize_result
+    from utils.run_checkpoints import current_run_id
+    import main
+
+    main.get_crew_factory()
+    # Event handlers run on the event bus's threads (and DAG runs on several), so sends are serialized
+    send_lock = threading.Lock()
+
+    def send(message: Tuple[Any, ...]) -> None:
+        with send_lock:
+            conn.send(message)
+
+    def forward(event: Any, status: str) -> None:
+        task = getattr(event, 'task', None)
+        if task is not None and task.name:
+            try:
+                send(('stage', task.name, status, event.timestamp.isoformat(), current_run_id.get()))
+            except OSError:
+                pass
+
+    crewai_event_bus.on(TaskStartedEvent)(lambda source, event: forward(event, 'running'))
+    crewai_event_bus.on(TaskCompletedEvent)(lambda source, event: forward(event, 'succeeded'))
+    crewai_event_bus.on(TaskFailedEvent)(lambda source, event: forward(event, 'failed'))
+
+    send(('ready', _rss_mb()))
+    jobs = 0
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+
+        _, func, args, kwargs = message
+        jobs += 1
+        try:
+            outcome: Tuple[Any, ...] = ('result', summarize_result(func(*args, **kwargs)))
+        except Exception as e:
+            outcome = ('error', f"{type(e).__name__}: {e}", traceback.format_exc())
+
+        # Deliver the job's last progress messages before its result
+        crewai_event_bus.flush()
+        rss = _rss_mb()
+        retire = None
+        if max_jobs and jobs >= max_jobs:
+            retire = f"served {jobs} jobs"
+        elif max_rss_mb and rss > max_rss_mb:
+            retire = f"using {rss:.0f} MB"
+        send((*outcome, rss, retire))
+        if retire:
+            return
+
+
+class _Worker:
+    def __init__(self, process: multiprocessing.Process, conn: Connection):
+        self.process = process
+        self.conn = conn
+        self.jobs = 0
+        self.rss_mb: Optional[float] = None
+
+
+class CrewProcessPool:
+    """
+    Runs crew workflows in pre-warmed worker processes.
+
+    Workers are spawned (not forked) so they start from a clean interpreter,
+    and they import crewai before their first job. Each job runs in its own
+    worker, which keeps crew parsing and LLM response handling off the
+    server's GIL and heap. Jobs, results and progress travel over one pipe
+    per worker: run() blocks the calling thread on the pipe, relaying task
+    progress to a callback until the result arrives. Results are the JSON
+    friendly summaries the execution store keeps. Workers are replaced once
+    they exceed the job count or memory cap, or if they die.
+    """
+
+    def __init__(self, workers: int = 1, max_jobs_per_worker: int = 20, max_rss_mb: int = 1536):
+        self.size = max(1, workers)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_rss_mb = max_rss_mb
+        self._context = multiprocessing.get_context('spawn')
+        self._idle: 'queue.Queue[_Worker]' = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._recycled = 0
+
+    def start(self) -> None:
+        """Spawn the workers; they warm up in the background"""
+        with self._lock:
+            while len(self._workers) < self.size:
+                self._idle.put(self._spawn())
+        logger.info(f"Crew process pool started with {self.size} workers")
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.max_jobs_per_worker, self.max_rss_mb),
+            name='crew-worker'
+        )
+        process.start()
+        child_conn.close()
+        worker = _Worker(process, parent_conn)
+        self._workers.append(worker)
+        return worker
+
+    def _replace(self, worker: _Worker, reason: str) -> None:
+        worker.conn.close()
+        worker.process.join(timeout=10)
+        if worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join()
+        with self._lock:
+            self._workers.remove(worker)
+            if self._closed:
+                return
+            self._recycled += 1
+            logger.info(f"Recycling crew worker {worker.process.pid} ({reason})")
+            self._idle.put(self._spawn())
+
+    def run(self, func: Callable[..., Any], *args: Any, on_progress: Optional[ProgressCallback] = None, **kwargs: Any) -> Any:
+        """
+        Run a module-level function in a worker process and wait for its result
+
+        Args:
+            func (Callable[..., Any]): Function to run; sent by reference, so it must be importable
+            on_progress (Optional[ProgressCallback]): Receives the job's crew task events
+            *args, **kwargs: Picklable arguments of func
+
+        Returns:
+            Any: JSON-friendly summary of what func returned
+
+        Raises:
+            CrewWorkerError: If func raised or the worker died
+        """
+        if self._closed:
+            raise RuntimeError("Crew process pool is shut down")
+        worker = self._idle.get()
+        retire: Optional[str] = None
+        finished = False
+        try:
+            try:
+                worker.conn.send(('run', func, args, kwargs))
+            except OSError:
+                retire = f"exited with code {worker.process.exitcode}"
+                raise CrewWorkerError(f"Crew worker {worker.process.pid} is gone")
+            worker.jobs += 1
+            while True:
+                try:
+                    message = worker.conn.recv()
+                except (EOFError, OSError):
+                    retire = f"exited with code {worker.process.exitcode}"
+                    raise CrewWorkerError(f"Crew worker {worker.process.pid} died while running {func.__name__}")
+
+                kind = message[0]
+                if kind == 'stage':
+                    if on_progress is not None:
+                        try:
+                            on_progress(*message[1:])
+                        except Exception as e:
+                            # The worker is mid-job, so keep reading its pipe until the result arrives
+                            logger.error(f"Progress callback failed for {func.__name__}: {str(e)}")
+                elif kind == 'result':
+                    _, result, worker.rss_mb, retire = message
+                    finished = True
+                    return result
+                elif kind == 'error':
+                    _, error, details, worker.rss_mb, retire = message
+                    finished = True
+                    logger.error(f"{func.__name__} failed in crew worker {worker.process.pid}:\n{details}")
+                    raise CrewWorkerError(error)
+        finally:
+            if not finished and retire is None:
+                # Interrupted before the job's outcome was read; its pipe may still hold that job's messages
+                retire = "interrupted mid-job"
+            if retire:
+                self._replace(worker, retire)
+            else:
+                self._idle.put(worker)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Worker processes, their job counts and memory after their last job"""
+        with self._lock:
+            workers = [
+                {'pid': worker.process.pid, 'alive': worker.process.is_alive(), 'jobs': worker.jobs, 'rss_mb': worker.rss_mb}
+                for worker in self._workers
+            ]
+        return {'workers': workers, 'idle': self._idle.qsize(), 'recycled': self._recycled}
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop idle workers and terminate those still running a job after timeout"""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            worker.process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+        logger.info("Crew process pool shut down")
@@ -0,0 +1,200 @@
+from typing import List, Dict, Any, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+import contextvars
+import time
+from crewai import Crew, Task
+from crewai.tasks.conditional_task import ConditionalTask
+from crewai.tasks.task_output import TaskOutput
+from crewai.crews.crew_output import CrewOutput
+from crewai.utilities.constants import NOT_SPECIFIED
+from pydantic import Field, PrivateAttr
+from utils.logger import logger
+
+
+def _task_name(task: Task, index: int) -> str:
+    return task.name or f"task_{index}"
+
+
+def task_dependencies(tasks: List[Task]) -> Dict[int, Set[int]]:
+    """
+    Derive each task's dependencies from its context list
+
+    A task without an explicit context gets every earlier output as context
+    in a sequential crew, so it depends on every earlier task here too.
+    Context tasks outside the crew must already have an output.
+
+    Args:
+        tasks (List[Task]): Tasks in crew order
+
+    Returns:
+        Dict[int, Set[int]]: Indexes of the tasks each task depends on
+
+    Raises:
+        ValueError: If a context task outside the crew has no output or the tasks form a cycle
+    """
+    positions = {id(task): index for index, task in enumerate(tasks)}
+    dependencies: Dict[int, Set[int]] = {}
+    for index, task in enumerate(tasks):
+        if task.context is NOT_SPECIFIED:
+            dependencies[index] = set(range(index))
+            continue
+        dependencies[index] = set()
+        for context_task in task.context or []:
+            if id(context_task) in positions:
+                dependencies[index].add(positions[id(context_task)])
+            elif context_task.output is None:
+                # Tasks outside the crew are fine once they have an output (e.g. restored from a checkpoint)
+                raise ValueError(f"Context of task '{_task_name(task, index)}' refers to a task outside the crew")
+
+    # Kahn's algorithm; anything left unvisited is on a cycle
+    remaining = {index: set(deps) for index, deps in dependencies.items()}
+    ready = [index for index, deps in remaining.items() if not deps]
+    visited = 0
+    while ready:
+        done = ready.pop()
+        visited += 1
+        for index, deps in remaining.items():
+            if done in deps:
+                deps.discard(done)
+                if not deps:
+                    ready.append(index)
+    if visited != len(tasks):
+        raise ValueError("Task context lists form a cycle")
+    return dependencies
+
+
+def critical_path(durations: Dict[int, float], dependencies: Dict[int, Set[int]]) -> Tuple[float, List[int]]:
+    """Longest chain of dependent tasks by measured duration, and its task indexes"""
+    finish: Dict[int, float] = {}
+    previous: Dict[int, Optional[int]] = {}
+
+    def longest(index: int) -> float:
+        if index not in finish:
+            upstream = max(dependencies[index], key=longest, default=None)
+            previous[index] = upstream
+            finish[index] = durations.get(index, 0.0) + (longest(upstream) if upstream is not None else 0.0)
+        return finish[index]
+
+    if not dependencies:
+        return 0.0, []
+    end = max(dependencies, key=longest)
+    path = []
+    node: Optional[int] = end
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    return finish[end], path[::-1]
+
+
+class DagCrew(Crew):
+    """
+    Crew that runs tasks as a dependency graph instead of one after another.
+
+    Dependencies come from each task's context list. A task starts as soon as
+    every task in its context has finished, with at most max_workers tasks in
+    flight; tasks that share an agent never run at the same time, since an
+    agent holds per-execution state. Kickoff, callbacks, interpolation and the
+    crew output behave as in a sequential crew, whose final output is the last
+    task's in crew order.
+
+    After each run, dag_report holds the wall-clock time next to the summed
+    task time (what a sequential run would have taken) and the critical path.
+    """
+
+    max_workers: int = Field(default=3, ge=1, description="Maximum number of tasks running at once")
+    _dag_report: Dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    @property
+    def dag_report(self) -> Dict[str, Any]:
+        return self._dag_report
+
+    def _run_sequential_process(self) -> CrewOutput:
+        return self._execute_dag(self.tasks)
+
+    def _run_task(self, task: Task, agent: Any, context: str, tools: List[Any]) -> Tuple[TaskOutput, float, float]:
+        started = time.perf_counter()
+        output = task.execute_sync(agent=agent, context=context, tools=tools)
+        return output, started, time.perf_counter()
+
+    def _execute_dag(self, tasks: List[Task]) -> CrewOutput:
+        if any(isinstance(task, ConditionalTask) for task in tasks):
+            raise ValueError("Conditional tasks are not supported in DAG execution mode")
+
+        dependencies = task_dependencies(tasks)
+        pending = {index: set(deps) for index, deps in dependencies.items()}
+        outputs: Dict[int, TaskOutput] = {}
+        timings: Dict[int, Tuple[float, float]] = {}
+        running: Dict[Future, Tuple[int, Any]] = {}
+        busy_agents: Set[int] = set()
+        run_start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crew-dag') as executor:
+            while pending or running:
+                for index in sorted(index for index, deps in pending.items() if not deps):
+                    if len(running) >= self.max_workers:
+                        break
+                    task = tasks[index]
+                    agent = self._get_agent_to_use(task)
+                    if agent is None:
+                        raise ValueError(f"No agent available for task: {task.description}")
+                    if id(agent) in busy_agents:
+                        continue
+
+                    tools = self._prepare_tools(agent, task, task.tools or agent.tools or [])
+                    self._log_task_start(task, agent.role)
+                    context = self._get_context(task, [outputs[dep] for dep in sorted(dependencies[index])])
+                    logger.debug(f"Starting task '{_task_name(task, index)}' after {sorted(dependencies[index])}")
+
+                    del pending[index]
+                    busy_agents.add(id(agent))
+                    # Each task gets its own copy of the caller's context (tracing, per-run reports)
+                    future = executor.submit(contextvars.copy_context().run, self._run_task, task, agent, context, tools)
+                    running[future] = (index, agent)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, agent = running.pop(future)
+                    busy_agents.discard(id(agent))
+                    output, started, finished = future.result()
+                    outputs[index] = output
+                    timings[index] = (started - run_start, finished - run_start)
+                    self._process_task_result(tasks[index], output)
+                    self._store_execution_log(tasks[index], output, index)
+                    for deps in pending.values():
+                        deps.discard(index)
+
+        self._dag_report = self._build_report(tasks, dependencies, timings, time.perf_counter() - run_start)
+        return self._create_crew_output([outputs[index] for index in range(len(tasks))])
+
+    def _build_report(
+        self,
+        tasks: List[Task],
+        dependencies: Dict[int, Set[int]],
+        timings: Dict[int, Tuple[float, float]],
+        wall_clock: float
+    ) -> Dict[str, Any]:
+        durations = {index: finished - started for index, (started, finished) in timings.items()}
+        sequential = sum(durations.values())
+        path_seconds, path = critical_path(durations, dependencies)
+        report = {
+            'wall_clock_s': round(wall_clock, 3),
+            'sequential_s': round(sequential, 3),
+            'saved_s': round(sequential - wall_clock, 3),
+            'speedup': round(sequential / wall_clock, 2) if wall_clock else None,
+            'critical_path_s': round(path_seconds, 3),
+            'critical_path': [_task_name(tasks[index], index) for index in path],
+            'max_workers': self.max_workers,
+            'tasks': {
+                _task_name(tasks[index], index): {
+                    'start_s': round(started, 3),
+                    'end_s': round(finished, 3),
+                    'depends_on': [_task_name(tasks[dep], dep) for dep in sorted(dependencies[index])]
+                }
+                for index, (started, finished) in sorted(timings.items())
+            }
+        }
+        logger.info(
+            f"DAG run took {report['wall_clock_s']}s against {report['sequential_s']}s of task time "
+            f"(critical path {report['critical_path_s']}s: {' -> '.join(report['critical_path'])})"
+        )
+        return report
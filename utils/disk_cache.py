@@ -0,0 +1,197 @@
+from typing import Dict, Any, Optional
+from pathlib import Path
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from utils.logger import logger
+
+
+class DiskCache:
+    """
+    SQLite-backed response cache with per-namespace TTLs and LRU eviction.
+
+    Entries are keyed by a content hash and grouped into namespaces (e.g. one
+    per upstream API) so each source can have its own time-to-live. When the
+    total payload size exceeds ``max_bytes`` the least recently used entries
+    are evicted.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttls: Optional[Dict[str, int]] = None,
+        default_ttl: int = 3600,
+        max_bytes: int = 50 * 1024 * 1024,
+        bypass: bool = False
+    ):
+        self.db_path = Path(db_path)
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache_entries (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(namespace: str, key_parts: Dict[str, Any]) -> str:
+        """Build a stable content hash from a namespace and key parts"""
+        raw = json.dumps({'ns': namespace, 'key': key_parts}, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _count(self, namespace: str, counter: str) -> None:
+        counters = self._counters.setdefault(
+            namespace, {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'bypassed': 0}
+        )
+        counters[counter] += 1
+
+    def ttl_for(self, namespace: str) -> int:
+        """Return the TTL in seconds configured for a namespace"""
+        return self.ttls.get(namespace, self.default_ttl)
+
+    def get(self, namespace: str, key_parts: Dict[str, Any], bypass: bool = False) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            namespace (str): Cache namespace (source)
+            key_parts (Dict[str, Any]): Normalized values identifying the request
+            bypass (bool): Skip the cache for this call
+
+        Returns:
+            Optional[Any]: Cached value, or None on miss/expiry/bypass
+        """
+        with self._lock:
+            if bypass or self.bypass:
+                self._count(namespace, 'bypassed')
+                return None
+
+            key = self.make_key(namespace, key_parts)
+            try:
+                row = self._conn.execute(
+                    "SELECT payload, created_at FROM cache_entries WHERE key = ?",
+                    (key,)
+                ).fetchone()
+
+                now = time.time()
+                if row is None:
+                    self._count(namespace, 'misses')
+                    return None
+
+                payload, created_at = row
+                if now - created_at > self.ttl_for(namespace):
+                    self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self._count(namespace, 'misses')
+                    return None
+
+                self._conn.execute(
+                    "UPDATE cache_entries SET last_access = ? WHERE key = ?",
+                    (now, key)
+                )
+                self._conn.commit()
+                self._count(namespace, 'hits')
+                return json.loads(payload)
+
+            except (sqlite3.Error, json.JSONDecodeError) as e:
+                logger.error(f"Cache read error in namespace {namespace}: {str(e)}")
+                self._count(namespace, 'misses')
+                return None
+
+    def set(self, namespace: str, key_parts: Dict[str, Any], value: Any, bypass: bool = False) -> None:
+        """
+        Store a value and evict least recently used entries if over the size cap
+
+        Args:
+            namespace (str): Cache namespace (source)
+            key_parts (Dict[str, Any]): Normalized values identifying the request
+            value (Any): JSON-serializable value to store
+            bypass (bool): Skip the cache for this call
+        """
+        with self._lock:
+            if bypass or self.bypass:
+                return
+
+            key = self.make_key(namespace, key_parts)
+            try:
+                payload = json.dumps(value, ensure_ascii=False, default=str)
+                now = time.time()
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO cache_entries
+                        (key, namespace, payload, size, created_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, namespace, payload, len(payload.encode('utf-8')), now, now)
+                )
+                self._count(namespace, 'writes')
+                self._evict()
+                self._conn.commit()
+
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.error(f"Cache write error in namespace {namespace}: {str(e)}")
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, namespace, size FROM cache_entries ORDER BY last_access ASC"
+        ).fetchall()
+        for key, namespace, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            self._count(namespace, 'evictions')
+            total -= size
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """Remove all entries, or only those of one namespace. Returns rows removed."""
+        with self._lock:
+            if namespace:
+                cursor = self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+            else:
+                cursor = self._conn.execute("DELETE FROM cache_entries")
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size per namespace"""
+        with self._lock:
+            sizes = {
+                namespace: {'entries': entries, 'bytes': size}
+                for namespace, entries, size in self._conn.execute(
+                    "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries GROUP BY namespace"
+                ).fetchall()
+            }
+            namespaces = set(sizes) | set(self._counters)
+            return {
+                namespace: {
+                    **self._counters.get(namespace, {}),
+                    **sizes.get(namespace, {'entries': 0, 'bytes': 0})
+                }
+                for namespace in sorted(namespaces)
+            }
@@ -0,0 +1,224 @@
+from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime
+import threading
+import uuid
+from crewai.events.event_bus import crewai_event_bus
+from crewai.events.types.task_events import TaskStartedEvent, TaskCompletedEvent, TaskFailedEvent
+from pydantic import BaseModel, Field
+from config.settings import Config
+from utils.logger import logger
+from utils.run_checkpoints import current_run_id
+from utils.run_history import RunHistoryStore, get_run_history_store
+
+# Execution the current context works for; stage events of its crew are recorded against it
+current_execution_id: ContextVar[Optional[str]] = ContextVar('current_execution_id', default=None)
+
+
+class StageRecord(BaseModel):
+    name: str
+    status: str = 'running'
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_s: Optional[float] = None
+
+
+class ExecutionRecord(BaseModel):
+    execution_id: str
+    trigger: str = Field(..., description="What started the execution: api, slack or schedule")
+    status: str = Field('queued', description="queued, running, succeeded, failed, rejected or interrupted")
+    topics: Optional[List[str]] = None
+    run_id: Optional[str] = Field(None, description="Crew run (checkpoint) id")
+    coalesced: int = Field(0, description="Identical requests that attached to this execution")
+    stage: Optional[str] = Field(None, description="Task currently running")
+    stages: List[StageRecord] = Field(default_factory=list)
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_s: Optional[float] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+
+def new_execution_id() -> str:
+    return f"exec_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+
+def summarize_result(result: Any) -> Any:
+    """JSON-friendly summary of what a crew workflow returned"""
+    if result is None or isinstance(result, (dict, list, str, int, float, bool)):
+        return result
+    raw = getattr(result, 'raw', None)
+    if raw is not None:
+        pydantic_output = getattr(result, 'pydantic', None)
+        return {
+            'raw': raw[:4000],
+            'pydantic': pydantic_output.model_dump(mode='json') if pydantic_output is not None else None
+        }
+    return str(result)[:4000]
+
+
+class ExecutionStore:
+    """
+    Tracks workflow executions for the status API.
+
+    The most recent records live in a bounded in-memory map. Every state
+    change is also written to the run history, so finished or evicted
+    executions can still be looked up and survive restarts; executions
+    still active when the process stopped are reported as interrupted.
+    """
+
+    def __init__(self, history: RunHistoryStore, max_in_memory: int = 200):
+        self.history = history
+        self.max_in_memory = max_in_memory
+        self._lock = threading.Lock()
+        self._records: 'OrderedDict[str, ExecutionRecord]' = OrderedDict()
+
+        interrupted = self.history.mark_interrupted()
+        if interrupted:
+            logger.warning(f"Marked {interrupted} executions from a previous process as interrupted")
+
+    def _save(self, record: ExecutionRecord) -> Dict[str, Any]:
+        self._records[record.execution_id] = record
+        self._records.move_to_end(record.execution_id)
+        while len(self._records) > self.max_in_memory:
+            self._records.popitem(last=False)
+        dumped = record.model_dump(mode='json')
+        self.history.upsert(dumped)
+        return dumped
+
+    def _load(self, execution_id: str) -> Optional[ExecutionRecord]:
+        record = self._records.get(execution_id)
+        if record is None:
+            stored = self.history.get(execution_id)
+            record = ExecutionRecord.model_validate(stored) if stored else None
+        return record
+
+    def create(self, trigger: str, topics: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Register a new queued execution"""
+        with self._lock:
+            return self._save(ExecutionRecord(execution_id=new_execution_id(), trigger=trigger, topics=topics))
+
+    def attach(self, execution_id: str, trigger: str) -> Optional[Dict[str, Any]]:
+        """Count an identical request that joined this execution instead of starting its own"""
+        with self._lock:
+            record = self._load(execution_id)
+            if record is None:
+                return None
+            record.coalesced += 1
+            logger.debug(f"Execution {execution_id} joined by a {trigger} request ({record.coalesced} attached)")
+            return self._save(record)
+
+    def start(self, execution_id: str) -> None:
+        with self._lock:
+            record = self._load(execution_id)
+            if record is None:
+                return
+            record.status = 'running'
+            record.started_at = datetime.now()
+            self._save(record)
+
+    def stage_started(self, execution_id: str, stage: str, at: datetime, run_id: Optional[str] = None) -> None:
+        with self._lock:
+            record = self._load(execution_id)
+            if record is None:
+                return
+            record.stage = stage
+            record.run_id = run_id or record.run_id
+            record.stages.append(StageRecord(name=stage, started_at=at))
+            # Stage starts are kept in memory only; completions are persisted
+            self._records[execution_id] = record
+
+    def stage_finished(self, execution_id: str, stage: str, at: datetime, status: str = 'succeeded') -> None:
+        with self._lock:
+            record = self._load(execution_id)
+            if record is None:
+                return
+            entry = next((s for s in reversed(record.stages) if s.name == stage and s.finished_at is None), None)
+            if entry is None:
+                entry = StageRecord(name=stage, started_at=at)
+                record.stages.append(entry)
+            entry.status = status
+            entry.finished_at = at
+            entry.duration_s = round((at - entry.started_at).total_seconds(), 3)
+            if record.stage == stage:
+                record.stage = None
+            self._save(record)
+
+    def record_stage(
+        self,
+        execution_id: str,
+        stage: str,
+        status: str,
+        at: datetime,
+        run_id: Optional[str] = None
+    ) -> None:
+        """Record a crew task event: status 'running' starts the stage, anything else ends it"""
+        if status == 'running':
+            self.stage_started(execution_id, stage, at, run_id)
+        else:
+            self.stage_finished(execution_id, stage, at, status)
+
+    def finish(self, execution_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        """Record the outcome of an execution"""
+        with self._lock:
+            record = self._load(execution_id)
+            if record is None:
+                return
+            record.status = status
+            record.stage = None
+            record.finished_at = datetime.now()
+            record.duration_s = round((record.finished_at - (record.started_at or record.created_at)).total_seconds(), 3)
+            record.result = summarize_result(result)
+            record.error = error
+            self._save(record)
+
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._load(execution_id)
+            return record.model_dump(mode='json') if record else None
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recently updated executions held in memory, newest first"""
+        with self._lock:
+            return [record.model_dump(mode='json') for record in list(self._records.values())[::-1][:limit]]
+
+
+def _record_stage(event: Any, status: str) -> None:
+    execution_id = current_execution_id.get()
+    task = getattr(event, 'task', None)
+    if execution_id is None or task is None or not task.name:
+        return
+    get_execution_store().record_stage(execution_id, task.name, status, event.timestamp, current_run_id.get())
+
+
+@crewai_event_bus.on(TaskStartedEvent)
+def _on_task_started(source: Any, event: TaskStartedEvent) -> None:
+    _record_stage(event, 'running')
+
+
+@crewai_event_bus.on(TaskCompletedEvent)
+def _on_task_completed(source: Any, event: TaskCompletedEvent) -> None:
+    _record_stage(event, 'succeeded')
+
+
+@crewai_event_bus.on(TaskFailedEvent)
+def _on_task_failed(source: Any, event: TaskFailedEvent) -> None:
+    _record_stage(event, 'failed')
+
+
+_execution_store: Optional[ExecutionStore] = None
+_execution_store_lock = threading.Lock()
+
+
+def get_execution_store() -> ExecutionStore:
+    """Return the process-wide execution store"""
+    global _execution_store
+    with _execution_store_lock:
+        if _execution_store is None:
+            _execution_store = ExecutionStore(
+                get_run_history_store(),
+                max_in_memory=Config.EXECUTION_STORE_MAX_IN_MEMORY
+            )
+        return _execution_store
@@ -0,0 +1,162 @@
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta
+from pathlib import Path
+import time
+from config.settings import Config
+from utils.logger import logger
+from utils.post_archive import PostArchive, get_post_archive
+from utils.run_checkpoints import CheckpointStore, get_checkpoint_store
+from utils.run_history import RunHistoryStore, get_run_history_store
+
+
+def _empty_stats() -> Dict[str, int]:
+    return {'files_removed': 0, 'files_compacted': 0, 'bytes_reclaimed': 0}
+
+
+def _remove(path: Path, stats: Dict[str, int]) -> None:
+    try:
+        size = path.stat().st_size
+        path.unlink()
+        stats['files_removed'] += 1
+        stats['bytes_reclaimed'] += size
+    except OSError as e:
+        logger.error(f"Error removing {path}: {str(e)}")
+
+
+def _enforce_retention(files: List[Path], max_age_days: Optional[int], max_bytes: Optional[int], stats: Dict[str, int]) -> None:
+    """Remove files older than max_age_days, then the oldest until the rest fit in max_bytes (0 disables either limit)"""
+    entries = []
+    for path in files:
+        try:
+            info = path.stat()
+        except OSError:
+            continue
+        entries.append((info.st_mtime, info.st_size, path))
+    entries.sort()
+
+    cutoff = time.time() - max_age_days * 86400 if max_age_days else None
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in entries:
+        expired = cutoff is not None and mtime < cutoff
+        oversized = bool(max_bytes) and total > max_bytes
+        if not (expired or oversized):
+            continue
+        _remove(path, stats)
+        total -= size
+
+
+class Housekeeper:
+    """
+    Keeps the data and log directories within their disk budgets.
+
+    - data/output: legacy per-run JSON files are compacted into the post
+      archive, which groups them into one gzip segment per day; files that
+      cannot be compacted are subject to age and size retention
+    - data/archive: whole segments are dropped by age and total size
+    - logs: rotated log files are dropped by age and total size (the live
+      log is rotated by loguru itself)
+    - checkpoints: task outputs of crew runs are dropped by age
+    - run history: finished executions are dropped by age
+    """
+
+    def __init__(
+        self,
+        archive: Optional[PostArchive] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        run_history: Optional[RunHistoryStore] = None
+    ):
+        self.archive = archive or get_post_archive()
+        self.checkpoints = checkpoints or get_checkpoint_store()
+        self.run_history = run_history or get_run_history_store()
+
+    def compact_output(self) -> Dict[str, int]:
+        stats = _empty_stats()
+        compact_before = datetime.now() - timedelta(hours=Config.OUTPUT_COMPACT_AFTER_HOURS)
+        archive_size = self.archive.size()
+
+        for path in sorted(Config.OUTPUT_DIR.glob('linkedin_posts_*.json')):
+            try:
+                info = path.stat()
+            except OSError:
+                continue
+            if datetime.fromtimestamp(info.st_mtime) > compact_before:
+                continue
+            # Unreadable files are left to the retention pass below
+            if self.archive.import_json_file(path) is None:
+                continue
+            path.unlink(missing_ok=True)
+            stats['files_compacted'] += 1
+            stats['bytes_reclaimed'] += info.st_size
+
+        # Net of what the compacted runs added to the archive
+        stats['bytes_reclaimed'] -= self.archive.size() - archive_size
+
+        remaining = sorted(Config.OUTPUT_DIR.glob('*.json'))
+        _enforce_retention(remaining, Config.OUTPUT_RETENTION_DAYS, Config.OUTPUT_MAX_BYTES, stats)
+        return stats
+
+    def prune_archive(self) -> Dict[str, int]:
+        stats = _empty_stats()
+        pruned = self.archive.prune(Config.ARCHIVE_RETENTION_DAYS or None, Config.ARCHIVE_MAX_BYTES or None)
+        stats['files_removed'] = pruned['segments_removed'] + pruned['spool_files_removed']
+        stats['bytes_reclaimed'] = pruned['bytes_reclaimed']
+        return stats
+
+    def prune_logs(self) -> Dict[str, int]:
+        stats = _empty_stats()
+        live_log = Path(Config.LOG_FILE).resolve()
+        rotated = [
+            path for path in Path(Config.LOG_DIR).glob('*.log*')
+            if path.is_file() and path.resolve() != live_log
+        ]
+        _enforce_retention(rotated, Config.LOG_RETENTION_DAYS, Config.LOG_MAX_BYTES, stats)
+        return stats
+
+    def purge_checkpoints(self) -> Dict[str, int]:
+        stats = _empty_stats()
+        if Config.CHECKPOINT_RETENTION_DAYS:
+            purged = self.checkpoints.purge(Config.CHECKPOINT_RETENTION_DAYS)
+            stats['files_removed'] = purged['runs_removed']
+            stats['bytes_reclaimed'] = purged['bytes_reclaimed']
+        return stats
+
+    def purge_run_history(self) -> Dict[str, int]:
+        stats = _empty_stats()
+        if Config.RUN_HISTORY_RETENTION_DAYS:
+            purged = self.run_history.purge(Config.RUN_HISTORY_RETENTION_DAYS)
+            stats['files_removed'] = purged['runs_removed']
+            stats['bytes_reclaimed'] = purged['bytes_reclaimed']
+        return stats
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run every housekeeping step
+
+        Returns:
+            Dict[str, Any]: Per-target stats and total bytes reclaimed
+        """
+        start_time = time.perf_counter()
+        report: Dict[str, Any] = {}
+        steps = (
+            ('output', self.compact_output),
+            ('archive', self.prune_archive),
+            ('logs', self.prune_logs),
+            ('checkpoints', self.purge_checkpoints),
+            ('run_history', self.purge_run_history)
+        )
+        for name, step in steps:
+            try:
+                report[name] = step()
+            except Exception as e:
+                logger.error(f"Housekeeping step '{name}' failed: {str(e)}")
+                report[name] = {**_empty_stats(), 'error': str(e)}
+
+        report['bytes_reclaimed'] = sum(stats['bytes_reclaimed'] for stats in report.values())
+        report['duration_ms'] = round((time.perf_counter() - start_time) * 1000, 1)
+        logger.info(f"Housekeeping reclaimed {report['bytes_reclaimed'] / 1024 / 1024:.1f} MB: {report}")
+        return report
+
+
+def run_housekeeping() -> Dict[str, Any]:
+    """Scheduler entry point"""
+    return Housekeeper().run()
@@ -0,0 +1,322 @@
+from typing import Dict, Any, List, Optional, Tuple
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from pathlib import Path
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+import requests
+from config.settings import Config
+from utils.logger import logger
+
+# External APIs captured by the harness; everything else passes through untouched
+TARGET_HOSTS = (
+    'www.googleapis.com',
+    'gql.hashnode.com',
+    'api.linkedin.com',
+    'hooks.slack.com',
+    'slack.com'
+)
+
+# Query parameters that carry credentials and must never reach a cassette
+REDACTED_PARAMS = {'key', 'access_token', 'token', 'cx'}
+
+
+def _normalize_path(host: str, path: str) -> str:
+    # Slack webhook paths embed the secret token
+    if host == 'hooks.slack.com' and path.startswith('/services/'):
+        return '/services/*'
+    return path or '/'
+
+
+def request_signature(method: str, url: str, body: Optional[bytes]) -> Tuple[str, str]:
+    """
+    Build the (loose, exact) match keys for a request
+
+    The loose key covers method, host, path and non-secret query parameters;
+    the exact key additionally includes a hash of the body.
+    """
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query) if k not in REDACTED_PARAMS)
+    loose = f"{method.upper()} {parts.hostname}{_normalize_path(parts.hostname, parts.path)}?{urlencode(query)}"
+    body_hash = hashlib.sha256(body or b'').hexdigest()[:16]
+    return loose, f"{loose}#{body_hash}"
+
+
+class LatencyProfile:
+    """Injected response latency: base + uniform jitter, with an occasional tail spike"""
+
+    def __init__(self, base_ms: float = 0.0, jitter_ms: float = 0.0, tail_ms: float = 0.0, tail_ratio: float = 0.0):
+        self.base_ms = base_ms
+        self.jitter_ms = jitter_ms
+        self.tail_ms = tail_ms
+        self.tail_ratio = tail_ratio
+
+    def sample(self) -> float:
+        """Return a delay in seconds"""
+        delay = self.base_ms + random.uniform(0, self.jitter_ms)
+        if self.tail_ratio and random.random() < self.tail_ratio:
+            delay += self.tail_ms
+        return delay / 1000.0
+
+    @classmethod
+    def from_config(cls) -> 'LatencyProfile':
+        return cls(
+            base_ms=Config.HTTP_REPLAY_LATENCY_MS,
+            jitter_ms=Config.HTTP_REPLAY_JITTER_MS,
+            tail_ms=Config.HTTP_REPLAY_TAIL_MS,
+            tail_ratio=Config.HTTP_REPLAY_TAIL_RATIO
+        )
+
+
+class CassetteLibrary:
+    """Recorded interactions stored as one JSON cassette file per host"""
+
+    def __init__(self, cassette_dir: Path):
+        self.cassette_dir = Path(cassette_dir)
+        self._lock = threading.Lock()
+        self._exact: Dict[str, List[Dict[str, Any]]] = {}
+        self._loose: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+
+    def _path(self, host: str) -> Path:
+        return self.cassette_dir / f"{host}.json"
+
+    def load(self) -> int:
+        """Load every cassette in the directory. Returns the number of interactions."""
+        count = 0
+        for path in sorted(self.cassette_dir.glob('*.json')):
+            with open(path, 'r', encoding='utf-8') as f:
+                for interaction in json.load(f):
+                    self._index(interaction)
+                    count += 1
+        logger.info(f"Loaded {count} recorded interactions from {self.cassette_dir}")
+        return count
+
+    def _index(self, interaction: Dict[str, Any]) -> None:
+        request = interaction['request']
+        self._exact.setdefault(request['exact'], []).append(interaction)
+        self._loose.setdefault(request['loose'], []).append(interaction)
+
+    def record(self, method: str, url: str, body: Optional[bytes], response: requests.Response) -> None:
+        """Append a real response to the host's cassette"""
+        loose, exact = request_signature(method, url, body)
+        host = urlsplit(url).hostname
+        interaction = {
+            'request': {'method': method.upper(), 'loose': loose, 'exact': exact},
+            'response': {
+                'status': response.status_code,
+                'content_type': response.headers.get('Content-Type', 'application/json'),
+                'body': base64.b64encode(response.content).decode('ascii')
+            },
+            'recorded_at': time.time()
+        }
+
+        with self._lock:
+            self.cassette_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(host)
+            interactions = []
+            if path.exists():
+                with open(path, 'r', encoding='utf-8') as f:
+                    interactions = json.load(f)
+            interactions.append(interaction)
+
+            tmp_path = path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(interactions, f, indent=2)
+            tmp_path.replace(path)
+            self._index(interaction)
+
+    def match(self, method: str, url: str, body: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        """
+        Find the recorded response for a request
+
+        Exact (body-hash) matches are preferred; otherwise any interaction with
+        the same method, path and query is used. Repeated requests cycle through
+        the recorded responses in order.
+        """
+        loose, exact = request_signature(method, url, body)
+        with self._lock:
+            for key, index in ((exact, self._exact), (loose, self._loose)):
+                candidates = index.get(key)
+                if candidates:
+                    position = self._cursor.get(key, 0)
+                    self._cursor[key] = position + 1
+                    return candidates[position % len(candidates)]
+        return None
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server: 'ReplayServer'
+
+    def _serve(self) -> None:
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        body = self.rfile.read(length) if length else b''
+
+        # Requests arrive as /<original host>/<original path>?<query>
+        host, _, rest = self.path.lstrip('/').partition('/')
+        original_url = f"https://{host}/{rest}"
+
+        time.sleep(self.server.latency.sample())
+        interaction = self.server.library.match(self.command, original_url, body)
+
+        if interaction is None:
+            self.server.misses += 1
+            logger.warning(f"No recorded response for {self.command} {original_url}")
+            payload = json.dumps({'error': 'no recorded interaction', 'url': original_url}).encode('utf-8')
+            self.send_response(404)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        self.server.served += 1
+        response = interaction['response']
+        payload = base64.b64decode(response['body'])
+        self.send_response(response['status'])
+        self.send_header('Content-Type', response['content_type'])
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = _serve
+    do_POST = _serve
+    do_PUT = _serve
+    do_DELETE = _serve
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"Replay server: {format % args}")
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Local HTTP stub that serves recorded responses with injected latency"""
+
+    daemon_threads = True
+
+    def __init__(self, library: CassetteLibrary, latency: LatencyProfile, port: int = 0):
+        super().__init__(('127.0.0.1', port), _ReplayHandler)
+        self.library = library
+        self.latency = latency
+        self.served = 0
+        self.misses = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> 'ReplayServer':
+        threading.Thread(target=self.serve_forever, name="http-replay", daemon=True).start()
+        logger.info(f"Replay server listening on {self.url}")
+        return self
+
+
+class HttpReplay:
+    """
+    Record/replay layer for the external APIs used by the pipeline.
+
+    In 'record' mode real responses from TARGET_HOSTS are saved to cassettes.
+    In 'replay' mode those requests are redirected to a ReplayServer (either
+    started in-process or an external one given by HTTP_REPLAY_SERVER_URL).
+    """
+
+    def __init__(self, mode: str, cassette_dir: Path, server_url: Optional[str] = None,
+                 latency: Optional[LatencyProfile] = None):
+        self.mode = mode
+        self.library = CassetteLibrary(cassette_dir)
+        self.server_url = server_url
+        self.latency = latency or LatencyProfile()
+        self.server: Optional[ReplayServer] = None
+        self._original_send = None
+
+    def install(self) -> 'HttpReplay':
+        """Patch requests so target-host traffic is recorded or replayed"""
+        if self.mode not in ('record', 'replay'):
+            return self
+        if self._original_send is not None:
+            return self
+
+        if self.mode == 'replay' and not self.server_url:
+            self.library.load()
+            self.server = ReplayServer(self.library, self.latency).start()
+            self.server_url = self.server.url
+
+        self._original_send = requests.Session.send
+        replay = self
+
+        def send(session: requests.Session, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+            host = urlsplit(request.url).hostname
+            if host not in TARGET_HOSTS:
+                return replay._original_send(session, request, **kwargs)
+
+            body = request.body.encode('utf-8') if isinstance(request.body, str) else request.body
+
+            if replay.mode == 'replay':
+                parts = urlsplit(request.url)
+                request.url = f"{replay.server_url}/{host}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+                return replay._original_send(session, request, **kwargs)
+
+            url = request.url
+            response = replay._original_send(session, request, **kwargs)
+            try:
+                replay.library.record(request.method, url, body, response)
+            except Exception as e:
+                logger.error(f"Failed to record interaction for {host}: {str(e)}")
+            return response
+
+        requests.Session.send = send
+        logger.info(f"HTTP {self.mode} enabled for {', '.join(TARGET_HOSTS)}")
+        return self
+
+    def uninstall(self) -> None:
+        """Restore the original requests transport and stop the stub server"""
+        if self._original_send is not None:
+            requests.Session.send = self._original_send
+            self._original_send = None
+        if self.server is not None:
+            self.server.shutdown()
+            self.server = None
+
+
+_http_replay: Optional[HttpReplay] = None
+
+
+def install_from_env() -> Optional[HttpReplay]:
+    """Enable recording or replay when HTTP_REPLAY_MODE is set"""
+    global _http_replay
+    if _http_replay is None and Config.HTTP_REPLAY_MODE in ('record', 'replay'):
+        _http_replay = HttpReplay(
+            Config.HTTP_REPLAY_MODE,
+            Config.HTTP_CASSETTE_DIR,
+            server_url=Config.HTTP_REPLAY_SERVER_URL,
+            latency=LatencyProfile.from_config()
+        ).install()
+    return _http_replay
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded API responses from cassettes")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--cassettes', default=str(Config.HTTP_CASSETTE_DIR))
+    parser.add_argument('--latency-ms', type=float, default=Config.HTTP_REPLAY_LATENCY_MS)
+    parser.add_argument('--jitter-ms', type=float, default=Config.HTTP_REPLAY_JITTER_MS)
+    parser.add_argument('--tail-ms', type=float, default=Config.HTTP_REPLAY_TAIL_MS)
+    parser.add_argument('--tail-ratio', type=float, default=Config.HTTP_REPLAY_TAIL_RATIO)
+    cli_args = parser.parse_args()
+
+    library = CassetteLibrary(Path(cli_args.cassettes))
+    library.load()
+    server = ReplayServer(
+        library,
+        LatencyProfile(cli_args.latency_ms, cli_args.jitter_ms, cli_args.tail_ms, cli_args.tail_ratio),
+        port=cli_args.port
+    )
+    logger.info(f"Serving cassettes from {cli_args.cassettes} on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
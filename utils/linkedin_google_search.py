@@ -1,14 +1,39 @@
-from typing import List, Dict, Any, Optional, Union, ClassVar
+from typing import List, Dict, Any, Optional, Union, ClassVar, Tuple, Iterator, Callable, Set, Iterable
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
 import json
+import threading
 from crewai.tools import BaseTool
 import requests
 import time
 from utils.logger import logger
+from utils.search_cache import get_search_cache, search_cache_key, GOOGLE_CSE_NAMESPACE
+from utils.seen_url_index import get_seen_url_index
+from utils.rate_limiter import get_cse_rate_limiter, QuotaExceededError
+from utils.near_duplicates import deduplicate_posts
+from utils.post_ranking import EngagementScorer, top_k_posts
+from utils.query_planner import QueryBatch, plan_queries_from_config, attribute_topics
+from utils.post_archive import get_post_archive, ArchiveRunWriter
+from utils.post_store import get_post_store
+from config.settings import Config
 from pydantic import Field, BaseModel
 import os
 
+class RunUrlSet:
+    """URLs collected so far in one search run, shared by the concurrent topic searches"""
+
+    def __init__(self):
+        self._urls: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def claim(self, urls: Iterable[str]) -> Set[str]:
+        """Add urls to the run and return those no earlier page of the run had"""
+        with self._lock:
+            new_urls = {url for url in urls if url and url not in self._urls}
+            self._urls.update(new_urls)
+        return new_urls
+
 class SearchConfig(BaseModel):
     """Configuration model for search parameters"""
     days: int = Field(default=7, description="Number of days to look back")
@@ -21,6 +46,12 @@ class SearchInput(BaseModel):
     days: int = 3
     max_topics: int = 10
     results_per_topic: int = 10
+    max_concurrency: int = Field(default_factory=lambda: Config.SEARCH_MAX_CONCURRENCY)
+    bypass_cache: bool = False
+    min_new_ratio: float = Field(default_factory=lambda: Config.SEARCH_MIN_NEW_RATIO)
+    incremental: bool = False
+    top_k: Optional[int] = Field(default_factory=lambda: Config.SEARCH_TOP_K or None)
+    batch_queries: bool = Field(default_factory=lambda: Config.SEARCH_BATCH_QUERIES)
 
 class LinkedInGoogleSearchTool(BaseTool):
     """Tool for searching LinkedIn posts using Google Custom Search API"""
@@ -37,6 +68,34 @@ class LinkedInGoogleSearchTool(BaseTool):
         default_factory=lambda: os.getenv('GOOGLE_SEARCH_CX'),
         description="Google Custom Search Engine ID"
     )
+    max_concurrency: int = Field(
+        default_factory=lambda: Config.SEARCH_MAX_CONCURRENCY,
+        description="Maximum number of topic searches in flight at once (1 = sequential)"
+    )
+    bypass_cache: bool = Field(
+        default=False,
+        description="Always call the API and do not store responses in the search cache"
+    )
+    incremental: bool = Field(
+        default_factory=lambda: Config.SEARCH_INCREMENTAL,
+        description="Only return posts that are new or changed since earlier runs"
+    )
+    session: requests.Session = Field(
+        default_factory=requests.Session,
+        exclude=True,
+        description="HTTP session reused across searches so connections are pooled"
+    )
+    score_fn: Optional[Callable[[Dict[str, Any]], float]] = Field(
+        default=None,
+        exclude=True,
+        description="Custom post scoring function for top-K ranking; defaults to weighted engagement with recency decay"
+    )
+
+    # Custom Search API paging limits
+    base_url: ClassVar[str] = "https://www.googleapis.com/customsearch/v1"
+    page_size: ClassVar[int] = 10  # API limit per request
+    max_search_results: ClassVar[int] = 100  # API never serves results past start=91
+    max_rate_limit_retries: ClassVar[int] = 5
 
     # Default topics as fallback
     default_topics: ClassVar[List[str]] = [
@@ -131,54 +190,356 @@ class LinkedInGoogleSearchTool(BaseTool):
             logger.error(f"Args: {args}")
             return []
 
-    def _search_linkedin_posts(self, topic: str, days: int, max_results: int = 10) -> List[Dict]:
+    def _fetch_search_page(
+        self,
+        params: Dict[str, Any],
+        stats: Optional[Dict[str, Any]] = None,
+        bypass_cache: bool = False
+    ) -> Dict[str, Any]:
         """
-        Search for LinkedIn posts using Google Custom Search API
+        Fetch one page of Custom Search results, serving repeats from the cache
         
         Args:
-            topic (str): Topic to search for
-            days (int): Number of days to look back
-            max_results (int): Maximum number of results to return
+            params (Dict[str, Any]): Custom Search API query parameters
+            stats (Optional[Dict[str, Any]]): Per-topic stats dict; page and cache counters are updated
+            bypass_cache (bool): Skip the search response cache
+            
+        Returns:
+            Dict[str, Any]: Raw API response
+            
+        Raises:
+            requests.RequestException: If the API request fails
+        """
+        cache = get_search_cache()
+        cache_key = search_cache_key(
+            params['q'], params['dateRestrict'], params['num'], params.get('start'), cx=self.cx
+        )
+        results = cache.get(GOOGLE_CSE_NAMESPACE, cache_key, bypass=bypass_cache)
+
+        if results is None:
+            response = self._request_with_rate_limit(params, stats=stats)
+            results = response.json()
+            cache.set(GOOGLE_CSE_NAMESPACE, cache_key, results, bypass=bypass_cache)
+        elif stats is not None:
+            stats['cache_hits'] = stats.get('cache_hits', 0) + 1
+
+        if stats is not None:
+            stats['pages'] = stats.get('pages', 0) + 1
+        return results
+
+    def _request_with_rate_limit(
+        self,
+        params: Dict[str, Any],
+        stats: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        """
+        Send a Custom Search request through the shared rate limiter
+        
+        Rate-limit responses (429, or 403 with a rate-limit reason) make the
+        limiter back off and the request is retried rather than dropped.
+        
+        Args:
+            params (Dict[str, Any]): Custom Search API query parameters
+            stats (Optional[Dict[str, Any]]): Per-topic stats dict; 'rate_limited' is incremented on throttling
             
         Returns:
-            List[Dict]: List of posts found
+            requests.Response: Successful API response
+            
+        Raises:
+            QuotaExceededError: If the daily quota is used up
+            requests.RequestException: If the request fails for another reason
         """
+        limiter = get_cse_rate_limiter()
+        for attempt in range(self.max_rate_limit_retries + 1):
+            limiter.acquire()
+            response = self.session.get(self.base_url, params=params, timeout=10)
+
+            reason = self._rate_limit_reason(response)
+            if reason is None:
+                response.raise_for_status()
+                limiter.report_success()
+                return response
+
+            if stats is not None:
+                stats['rate_limited'] = stats.get('rate_limited', 0) + 1
+
+            if reason in ('dailyLimitExceeded', 'quotaExceeded'):
+                limiter.report_rate_limited(daily=True)
+                raise QuotaExceededError(f"Custom Search daily quota exceeded ({reason})")
+
+            retry_after = response.headers.get('Retry-After', '')
+            limiter.report_rate_limited(float(retry_after) if retry_after.isdigit() else None)
+            logger.warning(f"Rate limited on attempt {attempt + 1} for query: {params.get('q')}")
+
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _rate_limit_reason(response: requests.Response) -> Optional[str]:
+        """Return the rate-limit reason for a throttled response, or None"""
+        if response.status_code == 429:
+            return 'rateLimitExceeded'
+        if response.status_code != 403:
+            return None
         try:
-            base_url = "https://www.googleapis.com/customsearch/v1"
+            errors = response.json().get('error', {}).get('errors', [])
+        except ValueError:
+            return None
+        for error in errors:
+            if error.get('reason') in ('rateLimitExceeded', 'userRateLimitExceeded', 'dailyLimitExceeded', 'quotaExceeded'):
+                return error['reason']
+        return None
+
+    def _iter_linkedin_post_pages(
+        self,
+        topic: Union[str, QueryBatch],
+        days: int,
+        max_results: int = 10,
+        min_new_ratio: float = 0.0,
+        stats: Optional[Dict[str, Any]] = None,
+        bypass_cache: bool = False,
+        run_urls: Optional[RunUrlSet] = None,
+        skip_seen: bool = False
+    ) -> Iterator[List[Dict]]:
+        """
+        Yield LinkedIn posts for a topic page by page using the CSE 'start' parameter
+        
+        Paging stops when the per-topic budget is spent, the API has no further
+        pages, or the share of new URLs on a page drops below min_new_ratio. A
+        URL is new when no earlier page of the run, for any topic, returned it
+        and, with skip_seen, the seen index has no record of it for the topic.
+        
+        Args:
+            topic (Union[str, QueryBatch]): Topic, or batch of topics combined into one query
+            days (int): Number of days to look back
+            max_results (int): Per-topic budget of results to fetch
+            min_new_ratio (float): Minimum share of new unique URLs for paging to continue
+            stats (Optional[Dict[str, Any]]): Per-topic stats dict
+            bypass_cache (bool): Skip the search response cache
+            run_urls (Optional[RunUrlSet]): URLs collected so far in this run across topics
+            skip_seen (bool): Also treat URLs returned by earlier runs as not new (incremental mode)
+            
+        Yields:
+            List[Dict]: New posts found on each page
+            
+        Raises:
+            requests.RequestException: If a page request fails
+        """
+        batch = topic if isinstance(topic, QueryBatch) else QueryBatch.single(topic)
+        run_urls = run_urls if run_urls is not None else RunUrlSet()
+        seen_index = get_seen_url_index() if skip_seen else None
+        seen_urls = set()
+        remaining = min(max_results, self.max_search_results)
+        start = 1
+
+        while remaining > 0:
+            num = min(remaining, self.page_size)
             params = {
                 'key': self.api_key,
                 'cx': self.cx,
-                'q': f'site:linkedin.com/posts/ {topic}',
+                'q': batch.query,
                 'dateRestrict': f'd{days}',
-                'num': min(max_results, 10)  # API limit is 10
+                'num': num,
+                'start': start
             }
 
-            response = requests.get(base_url, params=params, timeout=10)
-            response.raise_for_status()
-            results = response.json()
+            results = self._fetch_search_page(params, stats=stats, bypass_cache=bypass_cache)
+            items = results.get('items', [])
+            if not items:
+                break
+
+            new_posts = []
+            for item in items:
+                url = item.get('link')
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                new_posts.append(self._build_post(item, batch.topics))
+
+            if new_posts:
+                yield new_posts
+
+            new_urls = run_urls.claim(item.get('link') for item in items)
+            if seen_index is not None:
+                # Results attributed to no topic are recorded under the empty topic
+                new_urls = {url for url in new_urls if not seen_index.was_seen(url, [*batch.topics, ''])}
+            new_ratio = len(new_urls) / len(items)
+            if new_ratio < min_new_ratio:
+                logger.debug(
+                    f"Stopping pagination for topic {batch.label}: only {new_ratio:.0%} new results on page at start={start}"
+                )
+                if stats is not None:
+                    stats['early_stop'] = True
+                break
+
+            if len(items) < num or 'nextPage' not in results.get('queries', {}):
+                break
+
+            remaining -= len(items)
+            start += len(items)
+
+    def _build_post(self, item: Dict[str, Any], topics: List[str]) -> Dict[str, Any]:
+        """Convert a Custom Search result item into a post dict, attributing it to the matching topics"""
+        return {
+            'url': item.get('link'),
+            'title': item.get('title', ''),
+            'text': item.get('snippet', ''),
+            'matched_topics': attribute_topics(item, topics),
+            'query_topics': list(topics),
+            'scraped_at': datetime.now().isoformat(),
+            'metrics': self._extract_metrics(item.get('snippet', '')),
+            'date': self._extract_date(item.get('snippet', ''))
+        }
 
-            posts = []
-            for item in results.get('items', []):
-                # Extract post data
-                post = {
-                    'url': item.get('link'),
-                    'title': item.get('title', ''),
-                    'text': item.get('snippet', ''),
-                    'matched_topics': [topic],
-                    'scraped_at': datetime.now().isoformat(),
-                    'metrics': self._extract_metrics(item.get('snippet', '')),
-                    'date': self._extract_date(item.get('snippet', ''))
-                }
-                posts.append(post)
+    def _search_linkedin_posts(
+        self,
+        topic: Union[str, QueryBatch],
+        days: int,
+        max_results: int = 10,
+        stats: Optional[Dict[str, Any]] = None,
+        bypass_cache: bool = False,
+        min_new_ratio: float = 0.0,
+        archive: Optional[ArchiveRunWriter] = None,
+        run_urls: Optional[RunUrlSet] = None,
+        skip_seen: bool = False
+    ) -> List[Dict]:
+        """
+        Search for LinkedIn posts using Google Custom Search API
+        
+        Args:
+            topic (Union[str, QueryBatch]): Topic, or batch of topics combined into one query
+            days (int): Number of days to look back
+            max_results (int): Maximum number of results to return
+            stats (Optional[Dict[str, Any]]): Per-topic stats dict; 'errors' is incremented on failure
+            bypass_cache (bool): Skip the search response cache
+            min_new_ratio (float): Minimum share of new unique URLs for paging to continue
+            archive (Optional[ArchiveRunWriter]): Run archive each page is streamed into
+            run_urls (Optional[RunUrlSet]): URLs collected so far in this run across topics
+            skip_seen (bool): Count URLs from earlier runs as not new for early stopping
+            
+        Returns:
+            List[Dict]: List of posts found; pages fetched before an error are kept
+        """
+        posts = []
+        try:
+            for page in self._iter_linkedin_post_pages(
+                topic,
+                days,
+                max_results,
+                min_new_ratio=min_new_ratio,
+                stats=stats,
+                bypass_cache=bypass_cache,
+                run_urls=run_urls,
+                skip_seen=skip_seen
+            ):
+                posts.extend(page)
+                if archive is not None:
+                    archive.write_many(page)
+            return posts
 
+        except TimeoutError as e:
+            # Waited the full GOOGLE_CSE_MAX_WAIT for the rate limiter; report it rather than drop the topic quietly
+            logger.error(f"Rate limiter deadline exceeded for topic {getattr(topic, 'label', topic)}: {str(e)}")
+            if stats is not None:
+                stats['errors'] = stats.get('errors', 0) + 1
+                stats['rate_limit_timeouts'] = stats.get('rate_limit_timeouts', 0) + 1
+            return posts
+        except (requests.RequestException, QuotaExceededError) as e:
+            logger.error(f"Search API error for topic {getattr(topic, 'label', topic)}: {str(e)}")
+            if stats is not None:
+                stats['errors'] = stats.get('errors', 0) + 1
+            return posts
+        except Exception as e:
+            logger.error(f"Unexpected error during search for topic {getattr(topic, 'label', topic)}: {str(e)}")
+            if stats is not None:
+                stats['errors'] = stats.get('errors', 0) + 1
             return posts
 
-        except requests.RequestException as e:
-            logger.error(f"Search API error for topic {topic}: {str(e)}")
-            return []
+    def _search_topic(
+        self,
+        topic: Union[str, QueryBatch],
+        search_input: SearchInput,
+        archive: Optional[ArchiveRunWriter] = None,
+        run_urls: Optional[RunUrlSet] = None
+    ) -> Tuple[List[Dict], Dict[str, Any]]:
+        """
+        Search a single topic (or query batch) and measure it
+        
+        Args:
+            topic (Union[str, QueryBatch]): Topic, or batch of topics combined into one query
+            search_input (SearchInput): Validated search parameters
+            archive (Optional[ArchiveRunWriter]): Run archive the raw posts are streamed into
+            run_urls (Optional[RunUrlSet]): URLs collected so far in this run across topics
+            
+        Returns:
+            Tuple[List[Dict], Dict[str, Any]]: Posts found and per-topic stats
+        """
+        label = getattr(topic, 'label', topic)
+        logger.info(f"Processing topic: {label}")
+        stats = {'latency_ms': 0.0, 'errors': 0, 'rate_limit_timeouts': 0, 'posts': 0, 'pages': 0, 'cache_hits': 0}
+        start_time = time.perf_counter()
+        try:
+            posts = self._search_linkedin_posts(
+                topic,
+                search_input.days,
+                search_input.results_per_topic,
+                stats=stats,
+                bypass_cache=search_input.bypass_cache,
+                min_new_ratio=search_input.min_new_ratio,
+                archive=archive,
+                run_urls=run_urls,
+                skip_seen=search_input.incremental
+            )
         except Exception as e:
-            logger.error(f"Unexpected error during search for topic {topic}: {str(e)}")
-            return []
+            logger.error(f"Error processing topic '{label}': {str(e)}")
+            stats['errors'] += 1
+            posts = []
+        stats['latency_ms'] = round((time.perf_counter() - start_time) * 1000, 1)
+        stats['posts'] = len(posts)
+        return posts, stats
+
+    def _search_topics(
+        self,
+        search_input: SearchInput,
+        archive: Optional[ArchiveRunWriter] = None
+    ) -> Dict[str, Tuple[List[Dict], Dict[str, Any]]]:
+        """
+        Fan out topic searches over a bounded thread pool
+        
+        With batch_queries enabled, short topics are first packed into OR
+        queries by the query planner and each batch is searched once.
+        
+        Args:
+            search_input (SearchInput): Validated search parameters, including
+                the topics and the maximum number of searches in flight
+            archive (Optional[ArchiveRunWriter]): Run archive the raw posts are streamed into
+            
+        Returns:
+            Dict[str, Tuple[List[Dict], Dict[str, Any]]]: Posts and stats keyed by topic
+            (or batch label), in the same order as the input topics
+        """
+        if search_input.batch_queries:
+            units = plan_queries_from_config(search_input.topics)
+            logger.info(f"Planned {len(units)} queries for {len(search_input.topics)} topics")
+        else:
+            units = [QueryBatch.single(topic) for topic in search_input.topics]
+
+        run_urls = RunUrlSet()
+        workers = max(1, min(search_input.max_concurrency, len(units)))
+        if workers == 1:
+            return {unit.label: self._search_topic(unit, search_input, archive, run_urls) for unit in units}
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="linkedin-search") as executor:
+            futures = {
+                executor.submit(self._search_topic, unit, search_input, archive, run_urls): unit.label
+                for unit in units
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        # Keep input order so merging stays deterministic
+        return {unit.label: results[unit.label] for unit in units}
 
     def _extract_metrics(self, text: str) -> Dict[str, int]:
         """
@@ -220,17 +581,20 @@ class LinkedInGoogleSearchTool(BaseTool):
             Optional[str]: ISO format date string if found, None otherwise
         """
         try:
-            # Add patterns for different date formats
+            # Each pattern with the formats its matches are parsed with
             date_patterns = [
-                r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})',
-                r'(\d{4}-\d{2}-\d{2})'
+                (r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})', ('%d %b %Y', '%d %B %Y')),
+                (r'(\d{4}-\d{2}-\d{2})', ('%Y-%m-%d',))
             ]
             
-            for pattern in date_patterns:
-                if match := re.search(pattern, text, re.IGNORECASE):
-                    date_str = match.group(1)
-                    date = datetime.strptime(date_str, '%Y-%m-%d')
-                    return date.isoformat()
+            for pattern, formats in date_patterns:
+                for match in re.finditer(pattern, text, re.IGNORECASE):
+                    date_str = ' '.join(match.group(1).split())
+                    for date_format in formats:
+                        try:
+                            return datetime.strptime(date_str, date_format).isoformat()
+                        except ValueError:
+                            continue
             
             return None
             
@@ -238,33 +602,6 @@ class LinkedInGoogleSearchTool(BaseTool):
             logger.error(f"Error extracting date: {str(e)}")
             return None
 
-    def _save_posts_to_json(self, posts: List[Dict], topics: List[str]) -> Optional[str]:
-        try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"linkedin_posts_{timestamp}.json"
-            
-            # Create output structure with metadata
-            output_data = {
-                'metadata': {
-                    'timestamp': timestamp,
-                    'topics_searched': topics,
-                    'total_posts': len(posts)
-                },
-                'posts': posts
-            }
-            
-            # Ensure directory exists
-            os.makedirs("data/output", exist_ok=True)
-            
-            with open(f"data/output/{filename}", 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
-                
-            return filename
-            
-        except Exception as e:
-            logger.error(f"Error saving posts to JSON: {str(e)}")
-            return None
-
     def _run(self, args: Any = None) -> Dict[str, Any]:
         try:
             # Extract and normalize topics
@@ -280,50 +617,95 @@ class LinkedInGoogleSearchTool(BaseTool):
             self._validate_credentials()
 
             # Validate input using Pydantic model
+            options = args if isinstance(args, dict) else {}
             search_input = SearchInput(
                 topics=topics,
-                days=args.get('days', 3) if isinstance(args, dict) else 3,
-                max_topics=args.get('max_topics', 10) if isinstance(args, dict) else 10,
-                results_per_topic=args.get('results_per_topic', 10) if isinstance(args, dict) else 10
+                days=options.get('days', 3),
+                max_topics=options.get('max_topics', 10),
+                results_per_topic=options.get('results_per_topic', 10),
+                max_concurrency=options.get('max_concurrency', self.max_concurrency),
+                bypass_cache=options.get('bypass_cache', self.bypass_cache),
+                min_new_ratio=options.get('min_new_ratio', Config.SEARCH_MIN_NEW_RATIO),
+                incremental=options.get('incremental', self.incremental),
+                top_k=options.get('top_k', Config.SEARCH_TOP_K or None),
+                batch_queries=options.get('batch_queries', Config.SEARCH_BATCH_QUERIES)
             )
 
-            # Process each topic
+            # Process topics concurrently
             all_posts = []
-            successful_topics = []
-
-            for topic in search_input.topics:
-                logger.info(f"Processing topic: {topic}")
-                try:
-                    posts = self._search_linkedin_posts(
-                        topic,
-                        search_input.days,
-                        search_input.results_per_topic
-                    )
-                    if posts:
-                        all_posts.extend(posts)
-                        successful_topics.append(topic)
-                except Exception as e:
-                    logger.error(f"Error processing topic '{topic}': {str(e)}")
+            topic_stats = {}
 
-            # Process results
-            unique_posts = {post['url']: post for post in all_posts}.values()
-            posts_list = sorted(
-                list(unique_posts),
-                key=lambda x: sum(x['metrics'].values()),
-                reverse=True
+            # Raw posts are streamed into the archive page by page as they arrive
+            archive_run = get_post_archive().open_run(
+                topics_searched=search_input.topics,
+                days=search_input.days
             )
+            try:
+                search_start = time.perf_counter()
+                topic_results = self._search_topics(search_input, archive_run)
+                search_duration_ms = round((time.perf_counter() - search_start) * 1000, 1)
+            except Exception:
+                archive_run.close()
+                raise
+
+            for label, (posts, stats) in topic_results.items():
+                topic_stats[label] = stats
+                all_posts.extend(posts)
+
+            # A topic succeeded if at least one post was attributed to it
+            matched = {topic for post in all_posts for topic in post['matched_topics']}
+            successful_topics = [topic for topic in search_input.topics if topic in matched]
 
-            # Save to JSON
-            output_file = self._save_posts_to_json(posts_list, successful_topics)
+            # Process results
+            posts_list, dedup_stats = deduplicate_posts(all_posts)
+
+            archive_run.update_metadata(successful_topics=successful_topics, total_posts=len(posts_list))
+            archive_entry = archive_run.close()
+            get_post_store().upsert_posts(posts_list)
+
+            # Compare against posts returned by earlier runs
+            seen_index = get_seen_url_index()
+            new_posts, unchanged_posts = seen_index.partition(posts_list)
+            seen_index.record(posts_list)
+            new_urls = {post['url'] for post in new_posts}
+            for post in posts_list:
+                post['is_new'] = post['url'] in new_urls
+
+            if search_input.incremental:
+                logger.info(
+                    f"Incremental mode: returning {len(new_posts)} new posts, "
+                    f"skipping {len(unchanged_posts)} unchanged"
+                )
+                posts_list = new_posts
+
+            # Only the top K posts go back to the agent
+            scorer = self.score_fn or EngagementScorer.from_config()
+            ranked_posts = top_k_posts(posts_list, search_input.top_k, scorer)
+            for post in ranked_posts:
+                post['score'] = round(scorer(post), 3)
 
             result = {
                 'status': 'success',
                 'topics_searched': len(successful_topics),
                 'successful_topics': successful_topics,
                 'posts_found': len(posts_list),
-                'output_file': output_file,
-                'posts': posts_list,
-                'original_topics': topics
+                'posts_returned': len(ranked_posts),
+                'url_duplicates_merged': dedup_stats['url_duplicates_merged'],
+                'near_duplicates_merged': dedup_stats['near_duplicates_merged'],
+                'new_posts': len(new_posts),
+                'unchanged_posts': len(unchanged_posts),
+                'incremental': search_input.incremental,
+                'run_id': archive_run.run_id,
+                'output_file': archive_entry['segment'] if archive_entry else None,
+                'posts': ranked_posts,
+                'original_topics': topics,
+                'topic_stats': topic_stats,
+                'total_errors': sum(stats['errors'] for stats in topic_stats.values()),
+                'rate_limit_timeouts': sum(stats['rate_limit_timeouts'] for stats in topic_stats.values()),
+                'api_pages': sum(stats['pages'] for stats in topic_stats.values()),
+                'search_duration_ms': search_duration_ms,
+                'cache_stats': get_search_cache().stats(),
+                'quota': get_cse_rate_limiter().status()
             }
 
             logger.info(f"Search completed successfully with topics: {successful_topics}")
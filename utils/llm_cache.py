@@ -0,0 +1,194 @@
+from typing import Dict, Any, List, Optional, Union
+from contextvars import ContextVar
+import threading
+from crewai import LLM
+from crewai.llms.base_llm import BaseLLM, call_stop_override
+from pydantic import BaseModel, Field
+from config.settings import Config
+from utils.disk_cache import DiskCache
+from utils.logger import logger
+
+LLM_NAMESPACE_PREFIX = "llm:"
+
+# Per-run hit/miss counters, keyed by agent; set by start_llm_cache_report()
+_run_report: ContextVar[Optional[Dict[str, Dict[str, int]]]] = ContextVar('llm_cache_run_report', default=None)
+# Tasks of a DAG run share one report across worker threads
+_run_report_lock = threading.Lock()
+
+_llm_cache: Optional[DiskCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> DiskCache:
+    """Return the process-wide LLM response cache"""
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = DiskCache(
+                Config.LLM_CACHE_PATH,
+                ttls={f"{LLM_NAMESPACE_PREFIX}{agent}": ttl for agent, ttl in Config.LLM_CACHE_TTLS.items()},
+                default_ttl=Config.LLM_CACHE_DEFAULT_TTL,
+                max_bytes=Config.LLM_CACHE_MAX_BYTES
+            )
+            logger.info(f"LLM cache initialized at {Config.LLM_CACHE_PATH}")
+        return _llm_cache
+
+
+def _count(agent: str, outcome: str) -> None:
+    report = _run_report.get()
+    if report is not None:
+        with _run_report_lock:
+            counters = report.setdefault(agent, {'hits': 0, 'misses': 0})
+            counters[outcome] += 1
+
+
+class CachedLLM(BaseLLM):
+    """
+    Wraps an LLM with a content-addressed response cache.
+
+    Responses are keyed by model, messages, temperature, stop words and
+    response model, and stored in a per-agent namespace so each agent can
+    have its own TTL. Only text and structured (response_model) answers are
+    cached. Calls offering tools bypass the cache entirely, since the inner
+    LLM runs those tools itself and a cached answer would skip them.
+    """
+
+    llm_type: str = "cached"
+    inner: BaseLLM = Field(..., exclude=True, description="LLM that serves cache misses")
+    agent_name: str = Field(..., description="Agent the cache namespace and TTL belong to")
+
+    @classmethod
+    def wrap(cls, llm: BaseLLM, agent_name: str) -> 'CachedLLM':
+        return cls(
+            inner=llm,
+            agent_name=agent_name,
+            model=llm.model,
+            temperature=llm.temperature,
+            stop=list(llm.stop),
+            provider=llm.provider
+        )
+
+    @property
+    def namespace(self) -> str:
+        return f"{LLM_NAMESPACE_PREFIX}{self.agent_name}"
+
+    def _key_parts(
+        self,
+        messages: Union[str, List[Dict[str, Any]]],
+        response_model: Optional[type]
+    ) -> Dict[str, Any]:
+        if isinstance(messages, str):
+            messages = [{'role': 'user', 'content': messages}]
+        return {
+            'model': self.inner.model,
+            'messages': [
+                {'role': message.get('role'), 'content': message.get('content')}
+                for message in messages
+            ],
+            'temperature': self.inner.temperature,
+            'stop': sorted(self.stop_sequences),
+            'response_model': response_model.model_json_schema() if response_model else None
+        }
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, Any]]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+        response_model: Optional[type] = None
+    ) -> Any:
+        cacheable = not tools and not available_functions
+        cache = get_llm_cache()
+        key_parts = self._key_parts(messages, response_model)
+
+        if cacheable:
+            cached = cache.get(self.namespace, key_parts)
+            if cached is not None:
+                _count(self.agent_name, 'hits')
+                if response_model is not None and cached.get('structured'):
+                    return response_model.model_validate(cached['value'])
+                return cached['value']
+            _count(self.agent_name, 'misses')
+
+        # Stop words the executor set on this wrapper for the call must reach the inner LLM
+        with call_stop_override(self.inner, self.stop_sequences):
+            result = self.inner.call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+                response_model=response_model
+            )
+
+        if not cacheable:
+            return result
+        if isinstance(result, str) and result.strip():
+            cache.set(self.namespace, key_parts, {'structured': False, 'value': result})
+        elif isinstance(result, BaseModel):
+            cache.set(self.namespace, key_parts, {'structured': True, 'value': result.model_dump(mode='json')})
+        return result
+
+    def supports_function_calling(self) -> bool:
+        return self.inner.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+    def supports_multimodal(self) -> bool:
+        return self.inner.supports_multimodal()
+
+    def get_token_usage_summary(self) -> Any:
+        return self.inner.get_token_usage_summary()
+
+
+def build_llm(model: str, agent_name: str) -> BaseLLM:
+    """
+    LLM for an agent: cached when the LLM cache is enabled for that agent,
+    otherwise the plain LLM for the model.
+    """
+    llm = LLM(model=model)
+    if not Config.LLM_CACHE_ENABLED or agent_name not in Config.LLM_CACHE_AGENTS:
+        return llm
+    return CachedLLM.wrap(llm, agent_name)
+
+
+def reset_llm_state(llm: BaseLLM) -> None:
+    """Clear the token usage and response chain an LLM kept from its previous run"""
+    if isinstance(llm, CachedLLM):
+        reset_llm_state(llm.inner)
+    llm._token_usage = {key: 0 for key in llm._token_usage}
+    for reset in ('reset_chain', 'reset_reasoning_chain'):
+        if hasattr(llm, reset):
+            getattr(llm, reset)()
+
+
+def start_llm_cache_report() -> Dict[str, Dict[str, int]]:
+    """Start counting cache hits for the current run (thread/context)"""
+    report: Dict[str, Dict[str, int]] = {}
+    _run_report.set(report)
+    return report
+
+
+def log_llm_cache_report(report: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+    """Log and return the hit report of a run"""
+    _run_report.set(None)
+    if not Config.LLM_CACHE_ENABLED:
+        return {}
+    hits = sum(counters['hits'] for counters in report.values())
+    calls = hits + sum(counters['misses'] for counters in report.values())
+    summary = {
+        'hits': hits,
+        'calls': calls,
+        'hit_rate': round(hits / calls, 3) if calls else 0.0,
+        'agents': report
+    }
+    logger.info(f"LLM cache: {hits}/{calls} calls served from cache {report}")
+    return summary
@@ -24,8 +24,8 @@ def setup_logger():
     # Add file logging
     logger.add(
         str(log_dir / "app.log"),
-        rotation="500 MB",
-        retention="10 days",
+        rotation=Config.LOG_ROTATION,
+        retention=f"{Config.LOG_RETENTION_DAYS} days" if Config.LOG_RETENTION_DAYS else None,
         compression="zip",
         level=Config.LOG_LEVEL,
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
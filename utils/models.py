@@ -20,6 +20,7 @@ class PostMetrics(BaseModel):
 class LinkedInPost(BaseModel):
     """Model for LinkedIn post data."""
     post_id: Optional[str] = Field(default=None, description="Unique identifier for the post")
+    title: Optional[str] = Field(default=None, description="Title of the search result for the post")
     text: str = Field(..., description="Content of the post")
     date: Optional[str] = Field(default=None, description="Post creation date")
     metrics: PostMetrics = Field(default_factory=PostMetrics, description="Engagement metrics")
@@ -28,6 +29,8 @@ class LinkedInPost(BaseModel):
     scraped_at: datetime = Field(default_factory=datetime.now, description="Timestamp of when the post was scraped")
     is_ai_related: bool = Field(default=False, description="Whether the post is AI-related")
     matched_ai_topics: List[str] = Field(default_factory=list, description="AI topics found in the post")
+    matched_topics: List[str] = Field(default_factory=list, description="Search topics the post was found for")
+    query_topics: List[str] = Field(default_factory=list, description="Topics of the (possibly batched) query that returned the post")
 
 class LinkedInPostContent(BaseModel):
     """Model for structured LinkedIn post content"""
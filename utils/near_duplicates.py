@@ -0,0 +1,179 @@
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import hashlib
+import re
+import numpy as np
+from config.settings import Config
+from utils.logger import logger
+
+# Query parameters LinkedIn and share links add for tracking only
+TRACKING_PARAMS = re.compile(r'^(utm_.*|trk.*|rcm|lipi|originalSubdomain|li_.*|ref.*|src)$', re.IGNORECASE)
+ACTIVITY_ID = re.compile(r'(?:activity|ugcPost|share)[-:](\d{15,})')
+TOKEN = re.compile(r'[a-z0-9]+')
+
+# Mersenne prime keeps (a * h + b) inside uint64 for 31-bit shingle hashes
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+def canonical_url(url: Optional[str]) -> Optional[str]:
+    """
+    Normalize a LinkedIn URL so tracking variants of the same post compare equal
+
+    Posts carrying an activity id collapse to that id; other URLs lose their
+    tracking parameters, fragment, trailing slash and country subdomain.
+    """
+    if not url:
+        return url
+    if match := ACTIVITY_ID.search(url):
+        return f"linkedin:activity:{match.group(1)}"
+
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.endswith('linkedin.com'):
+        host = 'www.linkedin.com'
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not TRACKING_PARAMS.match(k)])
+    return urlunsplit(('https', host, parts.path.rstrip('/'), query, ''))
+
+
+class MinHashDeduplicator:
+    """
+    Near-duplicate detection over post title + snippet with MinHash and LSH banding.
+
+    Each post gets a MinHash signature of its word shingles. Signatures are cut
+    into bands; posts sharing any band bucket become candidates and are merged
+    when their estimated Jaccard similarity reaches the threshold. Cost is
+    linear in the number of posts plus the (small) number of candidate pairs.
+    """
+
+    max_bucket_pairs_size = 32
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.7, shingle_size: int = 3, seed: int = 42):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def _shingles(self, text: str) -> set:
+        tokens = TOKEN.findall(text.lower())
+        if len(tokens) < self.shingle_size:
+            return set(tokens)
+        return {' '.join(tokens[i:i + self.shingle_size]) for i in range(len(tokens) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Return the MinHash signature of a text, or None if it has no tokens"""
+        shingles = self._shingles(text)
+        if not shingles:
+            return None
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'big') & 0x7FFFFFFF
+             for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def clusters(self, texts: List[str]) -> List[List[int]]:
+        """Group text indices into near-duplicate clusters (singletons included)"""
+        parent = list(range(len(texts)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        signatures = [self.signature(text) for text in texts]
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        for index, sig in enumerate(signatures):
+            if sig is None:
+                continue
+            for band in range(self.bands):
+                key = (band, sig[band * self.rows:(band + 1) * self.rows].tobytes())
+                buckets.setdefault(key, []).append(index)
+
+        checked = set()
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            # Oversized buckets are only compared against their first member to stay near-linear
+            pairs = (
+                ((a, b) for i, a in enumerate(members) for b in members[i + 1:])
+                if len(members) <= self.max_bucket_pairs_size
+                else ((members[0], b) for b in members[1:])
+            )
+            for first, other in pairs:
+                if (first, other) in checked or find(first) == find(other):
+                    continue
+                checked.add((first, other))
+                similarity = float(np.mean(signatures[first] == signatures[other]))
+                if similarity >= self.threshold:
+                    parent[find(other)] = find(first)
+
+        groups: Dict[int, List[int]] = {}
+        for index in range(len(texts)):
+            groups.setdefault(find(index), []).append(index)
+        return list(groups.values())
+
+
+def _engagement(post: Dict[str, Any]) -> int:
+    return sum((post.get('metrics') or {}).values())
+
+
+def _merge_group(posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge duplicate posts into the most engaged one, combining their topics and URLs"""
+    representative = dict(max(posts, key=_engagement))
+    topics: List[str] = []
+    urls: List[str] = []
+    for post in posts:
+        for topic in post.get('matched_topics', []):
+            if topic not in topics:
+                topics.append(topic)
+        for url in [post.get('url')] + post.get('duplicate_urls', []):
+            if url and url != representative.get('url') and url not in urls:
+                urls.append(url)
+    representative['matched_topics'] = topics
+    if urls:
+        representative['duplicate_urls'] = urls
+    return representative
+
+
+def deduplicate_posts(
+    posts: List[Dict[str, Any]],
+    deduplicator: Optional[MinHashDeduplicator] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Collapse exact (canonical URL) and near-duplicate posts
+
+    Args:
+        posts (List[Dict[str, Any]]): Posts as produced by the search tool
+        deduplicator (Optional[MinHashDeduplicator]): Custom deduplicator; defaults to Config thresholds
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, int]]: Deduplicated posts and merge counts
+    """
+    by_url: Dict[Any, List[Dict[str, Any]]] = {}
+    for index, post in enumerate(posts):
+        # Posts without a URL can only be merged by the near-duplicate stage
+        by_url.setdefault(canonical_url(post.get('url')) or index, []).append(post)
+    url_unique = [_merge_group(group) for group in by_url.values()]
+
+    deduplicator = deduplicator or MinHashDeduplicator(threshold=Config.NEAR_DUPLICATE_THRESHOLD)
+    texts = [f"{post.get('title', '')} {post.get('text', '')}" for post in url_unique]
+    unique_posts = [
+        _merge_group([url_unique[i] for i in cluster])
+        for cluster in deduplicator.clusters(texts)
+    ]
+
+    stats = {
+        'url_duplicates_merged': len(posts) - len(url_unique),
+        'near_duplicates_merged': len(url_unique) - len(unique_posts)
+    }
+    logger.debug(f"Deduplicated {len(posts)} posts to {len(unique_posts)}: {stats}")
+    return unique_posts, stats
@@ -1,14 +1,28 @@
 # utils/notification_slack_tool.py
 from crewai.tools import BaseTool
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from pydantic import Field
 from utils.logger import logger
+from utils.run_checkpoints import current_run_id
 import requests
 import os
 import re
 
+# The actions block of a review message is tagged with the crew run that drafted the post
+RUN_BLOCK_PREFIX = "run:"
+
+
+def run_id_from_block_id(block_id: Optional[str]) -> Optional[str]:
+    """Run id carried by an actions block, or None for messages sent without one"""
+    if block_id and block_id.startswith(RUN_BLOCK_PREFIX):
+        return block_id[len(RUN_BLOCK_PREFIX):] or None
+    return None
+
+
 class NotificationSlackTool(BaseTool):
     name: str = "Slack Notification Tool"
     description: str = "Sends notifications to a Slack channel."
+    session: requests.Session = Field(default_factory=requests.Session, exclude=True)
 
     def _clean_content(self, text: str) -> str:
         """
@@ -26,6 +40,70 @@ class NotificationSlackTool(BaseTool):
         # Rejoin with proper spacing
         return '\n\n'.join(paragraphs)
 
+    def _post_blocks(self, title: str, content: str, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Header, content, divider and review buttons of one post"""
+        blocks: List[Dict[str, Any]] = [
+            {
+                "type": "header",
+                "text": {
+                    "type": "plain_text",
+                    "text": f"📝 {title}"[:150]  # Slack header limit
+                }
+            }
+        ]
+
+        # Handle long content by splitting into multiple blocks if needed
+        max_block_size = 3000  # Slack's limit per block
+        if len(content) > max_block_size:
+            content_chunks = [
+                content[i:i + max_block_size]
+                for i in range(0, len(content), max_block_size)
+            ]
+            for i, chunk in enumerate(content_chunks):
+                blocks.append({
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": f"Content (Part {i+1}/{len(content_chunks)}):\n{chunk}"
+                    }
+                })
+        else:
+            blocks.append({
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"Content:\n{content}"
+                }
+            })
+
+        actions = {
+            "type": "actions",
+            "elements": [
+                {
+                    "type": "button",
+                    "text": {
+                        "type": "plain_text",
+                        "text": "👍 Approve"
+                    },
+                    "style": "primary",
+                    "value": "approve"
+                },
+                {
+                    "type": "button",
+                    "text": {
+                        "type": "plain_text",
+                        "text": "🔄 Regenerate"
+                    },
+                    "style": "danger",
+                    "value": "regenerate"
+                }
+            ]
+        }
+        if run_id:
+            actions["block_id"] = f"{RUN_BLOCK_PREFIX}{run_id}"
+        blocks.extend([{"type": "divider"}, actions])
+        return blocks
+
     def _run(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Send notifications to a Slack channel."""
         logger.info("NotificationAgent: Starting notification process")
@@ -46,76 +124,10 @@ class NotificationSlackTool(BaseTool):
                 }
 
             # Format message for Slack with clear spacing
-            message = {
-                "blocks": [
-                    {
-                        "type": "header",
-                        "text": {
-                            "type": "plain_text",
-                            "text": f"📝 {post_data['title']}"[:150]  # Slack header limit
-                        }
-                    },
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"Content:\n{post_data['content']}"
-                        }
-                    },
-                    {
-                        "type": "divider"
-                    },
-                    {
-                        "type": "actions",
-                        "elements": [
-                            {
-                                "type": "button",
-                                "text": {
-                                    "type": "plain_text",
-                                    "text": "👍 Approve"
-                                },
-                                "style": "primary",
-                                "value": "approve"
-                            },
-                            {
-                                "type": "button",
-                                "text": {
-                                    "type": "plain_text",
-                                    "text": "🔄 Regenerate"
-                                },
-                                "style": "danger",
-                                "value": "regenerate"
-                            }
-                        ]
-                    }
-                ]
-            }
-
-            # Handle long content by splitting into multiple blocks if needed
-            max_block_size = 3000  # Slack's limit per block
-            if len(post_data['content']) > max_block_size:
-                # Remove the original content block
-                message["blocks"].pop(1)
-                
-                # Split content into chunks
-                content_chunks = [
-                    post_data['content'][i:i + max_block_size] 
-                    for i in range(0, len(post_data['content']), max_block_size)
-                ]
-                
-                # Insert content blocks after header
-                for i, chunk in enumerate(content_chunks):
-                    content_block = {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"Content (Part {i+1}/{len(content_chunks)}):\n{chunk}"
-                        }
-                    }
-                    message["blocks"].insert(i + 1, content_block)
+            message = {"blocks": self._post_blocks(post_data['title'], post_data['content'], current_run_id.get())}
 
             # Send to Slack
-            response = requests.post(webhook_url, json=message)
+            response = self.session.post(webhook_url, json=message)
             response.raise_for_status()
 
             logger.info("Slack notification sent successfully")
@@ -130,4 +142,76 @@ class NotificationSlackTool(BaseTool):
                 "sent": False,
                 "status": "error",
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+
+    def send_digest(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Send the posts of a multi-topic run as one digest, each with its own review buttons
+
+        Args:
+            results (List[Dict[str, Any]]): Per-pipeline results with 'topics', 'run_id',
+                'post' ({'title', 'content'}) and 'error'
+
+        Returns:
+            Dict[str, Any]: Whether the digest was sent, and the error if not
+        """
+        try:
+            webhook_url = os.getenv('SLACK_WEBHOOK_URL')
+            if not webhook_url:
+                raise ValueError("Slack webhook URL not configured")
+
+            drafted = [result for result in results if result.get('post')]
+            failed = [result for result in results if not result.get('post')]
+
+            posts = [
+                self._post_blocks(
+                    self._clean_content(result['post'].get('title', 'New LinkedIn Post')),
+                    self._clean_content(result['post'].get('content', 'No content available')),
+                    result.get('run_id')
+                )
+                for result in drafted
+            ]
+            failure_blocks = []
+            if failed:
+                failure_blocks.append({
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": "Failed topics:\n" + "\n".join(
+                            f"• {', '.join(result['topics'])}: {result.get('error') or 'no post drafted'}"
+                            for result in failed
+                        )[:3000]
+                    }
+                })
+
+            # Slack accepts at most 50 blocks per message; posts are never split across messages
+            max_blocks = 50
+            messages: List[List[Dict[str, Any]]] = [[{
+                "type": "header",
+                "text": {
+                    "type": "plain_text",
+                    "text": f"📰 LinkedIn post digest: {len(drafted)} drafts"
+                }
+            }]]
+            for blocks in posts + ([failure_blocks] if failure_blocks else []):
+                if len(messages[-1]) + len(blocks) > max_blocks:
+                    messages.append([])
+                messages[-1].extend(blocks)
+
+            for blocks in messages:
+                response = self.session.post(webhook_url, json={"blocks": blocks})
+                response.raise_for_status()
+
+            logger.info(f"Slack digest sent with {len(drafted)} posts and {len(failed)} failed topics")
+            return {
+                "sent": True,
+                "status": "success"
+            }
+
+        except Exception as e:
+            logger.error(f"Slack digest failed: {str(e)}")
+            return {
+                "sent": False,
+                "status": "error",
+                "error": str(e)
+            }
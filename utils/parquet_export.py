@@ -0,0 +1,215 @@
+from typing import List, Dict, Any, Optional
+from datetime import date, datetime
+from pathlib import Path
+import json
+import os
+import threading
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from config.settings import Config
+from utils.logger import logger
+from utils.near_duplicates import canonical_url
+from utils.post_archive import PostArchive, get_post_archive
+from utils.post_ranking import EngagementScorer
+
+POST_SCHEMA = pa.schema([
+    ('run_id', pa.string()),
+    ('url', pa.string()),
+    ('title', pa.string()),
+    ('text', pa.string()),
+    ('topics', pa.list_(pa.string())),
+    ('reactions', pa.int32()),
+    ('comments', pa.int32()),
+    ('shares', pa.int32()),
+    ('engagement_score', pa.float64()),
+    ('post_date', pa.timestamp('us')),
+    ('scraped_at', pa.timestamp('us'))
+])
+
+
+def _run_rows(run_id: str, posts: List[Dict[str, Any]], scorer: EngagementScorer) -> List[Dict[str, Any]]:
+    """Flatten one archived run, merging posts found for several topics into one row"""
+    rows: Dict[str, Dict[str, Any]] = {}
+    for post in posts:
+        url = canonical_url(post.get('url'))
+        if not url:
+            continue
+        if url in rows:
+            for topic in post.get('matched_topics', []):
+                if topic not in rows[url]['topics']:
+                    rows[url]['topics'].append(topic)
+            continue
+        metrics = post.get('metrics') or {}
+        rows[url] = {
+            'run_id': run_id,
+            'url': url,
+            'title': post.get('title'),
+            'text': post.get('text'),
+            'topics': list(post.get('matched_topics', [])),
+            'reactions': metrics.get('reactions', 0),
+            'comments': metrics.get('comments', 0),
+            'shares': metrics.get('shares', 0),
+            'engagement_score': scorer({'metrics': metrics}),
+            'post_date': post.get('date'),
+            'scraped_at': post.get('scraped_at')
+        }
+    return list(rows.values())
+
+
+class ParquetExporter:
+    """
+    Compacts archived search runs into Parquet, partitioned by scrape day.
+
+    Layout under the export root:
+        date=YYYY-MM-DD/part-<run_id>.parquet  posts of one run scraped that day
+        _compacted.json                         run ids already exported
+
+    Each run is exported once; re-running compaction only picks up runs
+    archived since the last pass.
+    """
+
+    def __init__(self, root: Path, archive: Optional[PostArchive] = None):
+        self.root = Path(root)
+        self.archive = archive or get_post_archive()
+        self.state_path = self.root / '_compacted.json'
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _load_state(self) -> List[str]:
+        if not self.state_path.exists():
+            return []
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('runs', [])
+
+    def _save_state(self, runs: List[str]) -> None:
+        tmp_path = self.state_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'runs': runs, 'updated_at': datetime.now().isoformat()}, f)
+        tmp_path.replace(self.state_path)
+
+    def compacted_runs(self) -> List[str]:
+        """Ids of the runs already exported, in export order"""
+        with self._lock:
+            return self._load_state()
+
+    def _to_frame(self, rows: List[Dict[str, Any]]) -> pd.DataFrame:
+        frame = pd.DataFrame(rows, columns=POST_SCHEMA.names)
+        for column in ('post_date', 'scraped_at'):
+            frame[column] = pd.to_datetime(frame[column], errors='coerce', format='ISO8601').dt.tz_localize(None)
+        for column in ('reactions', 'comments', 'shares'):
+            frame[column] = frame[column].fillna(0).astype('int32')
+        return frame
+
+    def _write_partitions(self, run_id: str, frame: pd.DataFrame) -> int:
+        files = 0
+        days = frame['scraped_at'].dt.date.fillna(date.today())
+        for day, part in frame.groupby(days):
+            partition = self.root / f"date={day.isoformat()}"
+            partition.mkdir(parents=True, exist_ok=True)
+            path = partition / f"part-{run_id}.parquet"
+            tmp_path = path.with_suffix('.parquet.tmp')
+            table = pa.Table.from_pandas(part, schema=POST_SCHEMA, preserve_index=False)
+            pq.write_table(table, tmp_path, compression='zstd')
+            os.replace(tmp_path, path)
+            files += 1
+        return files
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Export archived runs that are not in Parquet yet
+
+        Returns:
+            Dict[str, int]: Runs exported, partition files written and posts exported
+        """
+        stats = {'runs': 0, 'files': 0, 'posts': 0}
+        with self._lock:
+            compacted = self._load_state()
+            done = set(compacted)
+            scorer = EngagementScorer.from_config(decay=False)
+
+            for entry in self.archive.runs():
+                if entry['run_id'] in done:
+                    continue
+                try:
+                    rows = _run_rows(entry['run_id'], list(self.archive.read_entry(entry)), scorer)
+                    if rows:
+                        stats['files'] += self._write_partitions(entry['run_id'], self._to_frame(rows))
+                except (OSError, ValueError, pa.ArrowException) as e:
+                    logger.error(f"Error compacting run {entry['run_id']} to Parquet: {str(e)}")
+                    continue
+
+                compacted.append(entry['run_id'])
+                done.add(entry['run_id'])
+                self._save_state(compacted)
+                stats['runs'] += 1
+                stats['posts'] += len(rows)
+
+        if stats['runs']:
+            logger.info(f"Compacted {stats['runs']} runs ({stats['posts']} posts) into {stats['files']} Parquet files")
+        return stats
+
+    def partitions(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Path]:
+        """Partition directories for days within [start, end], oldest first"""
+        selected = []
+        for partition in sorted(self.root.glob('date=*')):
+            try:
+                day = date.fromisoformat(partition.name.split('=', 1)[1])
+            except ValueError:
+                continue
+            if (start and day < start) or (end and day > end):
+                continue
+            selected.append(partition)
+        return selected
+
+    def load(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load exported posts into a DataFrame
+
+        Files are memory-mapped and only the requested columns and day
+        partitions are read.
+
+        Args:
+            start (Optional[date]): First scrape day to include
+            end (Optional[date]): Last scrape day to include
+            columns (Optional[List[str]]): Columns to read; defaults to all
+
+        Returns:
+            pd.DataFrame: One row per post per run, typed per POST_SCHEMA
+        """
+        schema = pa.schema([POST_SCHEMA.field(name) for name in columns]) if columns else POST_SCHEMA
+        tables = [
+            pq.read_table(path, columns=columns, memory_map=True)
+            for partition in self.partitions(start, end)
+            for path in sorted(partition.glob('part-*.parquet'))
+        ]
+        if not tables:
+            return schema.empty_table().to_pandas()
+        return pa.concat_tables(tables).to_pandas()
+
+
+_parquet_exporter: Optional[ParquetExporter] = None
+_parquet_exporter_lock = threading.Lock()
+
+
+def get_parquet_exporter() -> ParquetExporter:
+    """Return the process-wide Parquet exporter"""
+    global _parquet_exporter
+    with _parquet_exporter_lock:
+        if _parquet_exporter is None:
+            _parquet_exporter = ParquetExporter(Config.PARQUET_DIR)
+        return _parquet_exporter
+
+
+def compact_archive_to_parquet() -> Dict[str, int]:
+    """Scheduler entry point: export newly archived runs"""
+    try:
+        return get_parquet_exporter().compact()
+    except Exception as e:
+        logger.error(f"Parquet compaction failed: {str(e)}")
+        return {'runs': 0, 'files': 0, 'posts': 0}
@@ -0,0 +1,334 @@
+from typing import List, Dict, Any, Optional, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+import fcntl
+import gzip
+import json
+import os
+import threading
+import uuid
+from config.settings import Config
+from utils.logger import logger
+
+
+def new_run_id() -> str:
+    """Timestamped run id, unique even when runs start in the same second"""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+
+class ArchiveRunWriter:
+    """
+    Streams one run's posts into the archive.
+
+    Posts are compressed into a spool file as they arrive. On close the spool
+    (a single gzip member) is appended to the current segment and the run's
+    offset, length and metadata are added to the index.
+    """
+
+    def __init__(self, archive: 'PostArchive', run_id: str, metadata: Optional[Dict[str, Any]] = None):
+        self.archive = archive
+        self.run_id = run_id
+        self.metadata = dict(metadata or {})
+        self.started_at = datetime.now().isoformat()
+        self.count = 0
+        self._lock = threading.Lock()
+        self._spool_path = archive.spool_dir / f"{run_id}.jsonl.gz.part"
+        self._spool = gzip.open(self._spool_path, 'wt', encoding='utf-8')
+        self._closed = False
+
+    def write(self, post: Dict[str, Any]) -> None:
+        self.write_many([post])
+
+    def write_many(self, posts: List[Dict[str, Any]]) -> None:
+        """Append posts to the run; safe to call from several threads"""
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                for post in posts:
+                    self._spool.write(json.dumps(post, ensure_ascii=False, default=str))
+                    self._spool.write('\n')
+                    self.count += 1
+            except (OSError, TypeError, ValueError) as e:
+                logger.error(f"Error archiving posts for run {self.run_id}: {str(e)}")
+
+    def update_metadata(self, **metadata: Any) -> None:
+        self.metadata.update(metadata)
+
+    def close(self) -> Optional[Dict[str, Any]]:
+        """Commit the run to the archive. Returns its index entry."""
+        with self._lock:
+            if self._closed:
+                return None
+            self._closed = True
+            self._spool.close()
+
+        try:
+            entry = self.archive._commit(self)
+            logger.info(f"Archived {self.count} posts for run {self.run_id} in {entry['segment']}")
+            return entry
+        except OSError as e:
+            logger.error(f"Error committing archive run {self.run_id}: {str(e)}")
+            return None
+        finally:
+            self._spool_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'ArchiveRunWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class PostArchive:
+    """
+    Append-only archive of search results.
+
+    Layout under the archive root:
+        segments/posts-YYYYMMDD-NNN.jsonl.gz  gzip members, one per run
+        index.jsonl                           one line per run: segment, offset, length, metadata
+
+    Reading a run seeks straight to its member, and time-range queries only
+    consult the index, so neither needs to open unrelated segments.
+    """
+
+    def __init__(self, root: Path, segment_max_bytes: int = 64 * 1024 * 1024):
+        self.root = Path(root)
+        self.segment_dir = self.root / 'segments'
+        self.spool_dir = self.root / 'spool'
+        self.index_path = self.root / 'index.jsonl'
+        self.lock_path = self.root / '.lock'
+        self.segment_max_bytes = segment_max_bytes
+
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+
+    def open_run(self, run_id: Optional[str] = None, **metadata: Any) -> ArchiveRunWriter:
+        """Start streaming a new run into the archive"""
+        return ArchiveRunWriter(self, run_id or new_run_id(), metadata)
+
+    def import_json_file(self, path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Archive a legacy linkedin_posts_*.json output file as its own run
+
+        Args:
+            path (Path): JSON file written by the old per-run output
+
+        Returns:
+            Optional[Dict[str, Any]]: Index entry (the existing one if the file was imported before),
+            or None if the file was unreadable
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Error reading legacy output {path}: {str(e)}")
+            return None
+
+        metadata = data.get('metadata', {})
+        timestamp = metadata.get('timestamp') or Path(path).stem.replace('linkedin_posts_', '')
+        run_id = f"{timestamp}_legacy"
+        existing = self.get_run(run_id)
+        if existing:
+            return existing
+
+        writer = self.open_run(
+            run_id,
+            topics_searched=metadata.get('topics_searched', []),
+            total_posts=metadata.get('total_posts'),
+            source_file=Path(path).name
+        )
+        try:
+            writer.started_at = datetime.strptime(timestamp, '%Y%m%d_%H%M%S').isoformat()
+        except ValueError:
+            pass
+        writer.write_many(data.get('posts', []))
+        return writer.close()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # The file lock serializes writers from other processes sharing the archive
+        with open(self.lock_path, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _current_segment(self, size_hint: int, day: str) -> Path:
+        existing = {}
+        for segment in self.segment_dir.glob(f"posts-{day}-*.jsonl.gz"):
+            suffix = segment.name[:-len('.jsonl.gz')].rsplit('-', 1)[-1]
+            if suffix.isdigit():
+                existing[int(suffix)] = segment
+        if not existing:
+            return self.segment_dir / f"posts-{day}-000.jsonl.gz"
+
+        # Pruning leaves gaps in the numbering, so the next segment follows the highest one rather than the count
+        last = max(existing)
+        if existing[last].stat().st_size + size_hint <= self.segment_max_bytes:
+            return existing[last]
+        return self.segment_dir / f"posts-{day}-{last + 1:03d}.jsonl.gz"
+
+    def _commit(self, writer: ArchiveRunWriter) -> Dict[str, Any]:
+        length = writer._spool_path.stat().st_size
+        # Runs land in the segment of the day they started, which keeps imported runs in their own day
+        day = datetime.fromisoformat(writer.started_at).strftime('%Y%m%d')
+
+        with self._locked():
+            segment = self._current_segment(length, day)
+            with open(segment, 'ab') as out, open(writer._spool_path, 'rb') as spool:
+                offset = out.tell()
+                while chunk := spool.read(1024 * 1024):
+                    out.write(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+
+            entry = {
+                'run_id': writer.run_id,
+                'segment': segment.name,
+                'offset': offset,
+                'length': length,
+                'count': writer.count,
+                'started_at': writer.started_at,
+                'finished_at': datetime.now().isoformat(),
+                **writer.metadata
+            }
+            with open(self.index_path, 'a', encoding='utf-8') as index:
+                index.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+            return entry
+
+    def prune(self, max_age_days: Optional[int] = None, max_bytes: Optional[int] = None) -> Dict[str, int]:
+        """
+        Drop whole segments older than max_age_days, then the oldest ones until
+        the archive fits in max_bytes. The newest segment is always kept.
+        Abandoned spool files from crashed runs are removed as well.
+
+        Args:
+            max_age_days (Optional[int]): Maximum segment age in days
+            max_bytes (Optional[int]): Maximum total size of all segments
+
+        Returns:
+            Dict[str, int]: Segments and spool files removed and bytes reclaimed
+        """
+        stats = {'segments_removed': 0, 'spool_files_removed': 0, 'bytes_reclaimed': 0}
+
+        with self._locked():
+            segments = sorted(self.segment_dir.glob('posts-*.jsonl.gz'))
+            sizes = {segment: segment.stat().st_size for segment in segments}
+            total = sum(sizes.values())
+            cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime('%Y%m%d') if max_age_days else None
+
+            doomed = []
+            for segment in segments[:-1]:
+                expired = cutoff is not None and segment.name.split('-')[1] < cutoff
+                oversized = max_bytes is not None and total > max_bytes
+                if not (expired or oversized):
+                    break
+                doomed.append(segment)
+                total -= sizes[segment]
+
+            if doomed:
+                names = {segment.name for segment in doomed}
+                kept = [entry for entry in self.runs() if entry['segment'] not in names]
+                tmp_path = self.index_path.with_suffix('.jsonl.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as index:
+                    for entry in kept:
+                        index.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+                tmp_path.replace(self.index_path)
+                for segment in doomed:
+                    segment.unlink(missing_ok=True)
+                    stats['bytes_reclaimed'] += sizes[segment]
+                stats['segments_removed'] = len(doomed)
+
+        # Live runs rewrite their spool continuously, so only long-idle ones are abandoned
+        stale_before = datetime.now().timestamp() - 24 * 3600
+        for spool in self.spool_dir.glob('*.part'):
+            try:
+                info = spool.stat()
+                if info.st_mtime < stale_before:
+                    spool.unlink()
+                    stats['spool_files_removed'] += 1
+                    stats['bytes_reclaimed'] += info.st_size
+            except OSError:
+                continue
+
+        return stats
+
+    def runs(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        List archived runs, optionally limited to those started within [start, end]
+
+        Args:
+            start (Optional[datetime]): Earliest run start time
+            end (Optional[datetime]): Latest run start time
+
+        Returns:
+            List[Dict[str, Any]]: Index entries in archive order
+        """
+        if not self.index_path.exists():
+            return []
+
+        entries = []
+        with open(self.index_path, 'r', encoding='utf-8') as index:
+            for line in index:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt archive index line: {line[:80]}")
+                    continue
+                started = datetime.fromisoformat(entry['started_at'])
+                if (start and started < start) or (end and started > end):
+                    continue
+                entries.append(entry)
+        return entries
+
+    def size(self) -> int:
+        """Total bytes of all segments"""
+        return sum(segment.stat().st_size for segment in self.segment_dir.glob('posts-*.jsonl.gz'))
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        return next((entry for entry in self.runs() if entry['run_id'] == run_id), None)
+
+    def read_entry(self, entry: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield the posts of one index entry"""
+        with open(self.segment_dir / entry['segment'], 'rb') as segment:
+            segment.seek(entry['offset'])
+            data = gzip.decompress(segment.read(entry['length']))
+        for line in data.decode('utf-8').splitlines():
+            if line:
+                yield json.loads(line)
+
+    def read_run(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield the posts of a run, or nothing if the run is unknown"""
+        entry = self.get_run(run_id)
+        if entry:
+            yield from self.read_entry(entry)
+
+    def read_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the posts of every run started within [start, end]"""
+        for entry in self.runs(start, end):
+            yield from self.read_entry(entry)
+
+
+_post_archive: Optional[PostArchive] = None
+_post_archive_lock = threading.Lock()
+
+
+def get_post_archive() -> PostArchive:
+    """Return the process-wide post archive"""
+    global _post_archive
+    with _post_archive_lock:
+        if _post_archive is None:
+            _post_archive = PostArchive(Config.ARCHIVE_DIR, Config.ARCHIVE_SEGMENT_MAX_BYTES)
+        return _post_archive
+
+
+if __name__ == "__main__":
+    # Import the per-run JSON files written before the archive existed
+    archive = get_post_archive()
+    imported = [archive.import_json_file(path) for path in sorted(Config.OUTPUT_DIR.glob('linkedin_posts_*.json'))]
+    logger.info(f"Imported {sum(1 for entry in imported if entry)} legacy output files into {archive.root}")
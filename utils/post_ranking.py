@@ -0,0 +1,88 @@
+from typing import List, Dict, Any, Optional, Callable
+from datetime import datetime
+import heapq
+from config.settings import Config
+from utils.logger import logger
+
+ScoreFunction = Callable[[Dict[str, Any]], float]
+
+
+class EngagementScorer:
+    """
+    Weighted engagement score with optional exponential recency decay.
+
+    score = sum(weight[metric] * value) * 0.5 ** (age_hours / half_life_hours)
+
+    The age is taken from the post 'date' when known, otherwise 'scraped_at'.
+    """
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        half_life_hours: Optional[float] = None,
+        now: Optional[datetime] = None
+    ):
+        self.weights = weights or {'reactions': 1.0, 'comments': 1.0, 'shares': 1.0}
+        self.half_life_hours = half_life_hours
+        self.now = now or datetime.now()
+
+    @classmethod
+    def from_config(cls, decay: bool = True) -> 'EngagementScorer':
+        """Scorer with the configured weights; decay=False gives a time-independent score for storage"""
+        return cls(
+            weights={
+                'reactions': Config.RANKING_WEIGHT_REACTIONS,
+                'comments': Config.RANKING_WEIGHT_COMMENTS,
+                'shares': Config.RANKING_WEIGHT_SHARES
+            },
+            half_life_hours=(Config.RANKING_HALF_LIFE_HOURS or None) if decay else None
+        )
+
+    def _age_hours(self, post: Dict[str, Any]) -> Optional[float]:
+        for field in ('date', 'scraped_at'):
+            value = post.get(field)
+            if not value:
+                continue
+            try:
+                timestamp = value if isinstance(value, datetime) else datetime.fromisoformat(value)
+                return max((self.now - timestamp.replace(tzinfo=None)).total_seconds() / 3600, 0.0)
+            except (TypeError, ValueError):
+                continue
+        return None
+
+    def __call__(self, post: Dict[str, Any]) -> float:
+        metrics = post.get('metrics') or {}
+        score = sum(self.weights.get(metric, 1.0) * value for metric, value in metrics.items())
+        if self.half_life_hours:
+            age = self._age_hours(post)
+            if age is not None:
+                score *= 0.5 ** (age / self.half_life_hours)
+        return score
+
+
+def top_k_posts(
+    posts: List[Dict[str, Any]],
+    k: Optional[int] = None,
+    score: Optional[ScoreFunction] = None
+) -> List[Dict[str, Any]]:
+    """
+    Return the K best posts by score, best first
+
+    Uses a bounded heap (O(n log k)) when k is smaller than the input and a
+    full sort otherwise. Ties keep their input order.
+
+    Args:
+        posts (List[Dict[str, Any]]): Posts to rank
+        k (Optional[int]): Number of posts to keep; None or 0 keeps all
+        score (Optional[ScoreFunction]): Scoring function; defaults to EngagementScorer.from_config()
+
+    Returns:
+        List[Dict[str, Any]]: Ranked posts
+    """
+    score = score or EngagementScorer.from_config()
+    if k and k < len(posts):
+        ranked = heapq.nlargest(k, posts, key=score)
+    else:
+        ranked = sorted(posts, key=score, reverse=True)
+    logger.debug(f"Ranked {len(posts)} posts, keeping {len(ranked)}")
+    return ranked
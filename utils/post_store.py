@@ -0,0 +1,324 @@
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import json
+import os
+import sqlite3
+import threading
+from pydantic import ValidationError
+from config.settings import Config
+from utils.logger import logger
+from utils.models import LinkedInPost
+from utils.near_duplicates import canonical_url
+from utils.post_ranking import EngagementScorer
+
+# Columns /api/posts may sort by, mapped to their ORDER BY clause
+SORT_COLUMNS = {
+    'engagement_score': 'p.engagement_score DESC, p.id DESC',
+    'scraped_at': 'p.scraped_at DESC, p.id DESC',
+    'reactions': 'p.reactions DESC, p.id DESC',
+    'comments': 'p.comments DESC, p.id DESC'
+}
+
+PostRow = Tuple[Dict[str, Any], List[str]]
+
+
+def post_to_row(post: Dict[str, Any], scorer: Optional[EngagementScorer] = None) -> Optional[PostRow]:
+    """
+    Validate a post dict against LinkedInPost and flatten it into a table row
+
+    Args:
+        post (Dict[str, Any]): Post as produced by the search tool
+        scorer (Optional[EngagementScorer]): Scorer for the engagement_score column
+
+    Returns:
+        Optional[PostRow]: Column values and topics, or None if the post has no URL or is invalid
+    """
+    try:
+        model = LinkedInPost(**post)
+    except ValidationError as e:
+        logger.debug(f"Skipping invalid post {post.get('url')}: {str(e)}")
+        return None
+    if not model.url:
+        return None
+
+    # Stored scores are undecayed so they stay comparable over time; recency is a query filter
+    scorer = scorer or EngagementScorer.from_config(decay=False)
+    metrics = model.metrics.model_dump()
+    row = {
+        'url': canonical_url(model.url),
+        'source_url': model.url,
+        'title': model.title,
+        'text': model.text,
+        'post_date': model.date,
+        'reactions': metrics['reactions'],
+        'comments': metrics['comments'],
+        'shares': metrics['shares'],
+        'engagement_score': scorer({'metrics': metrics}),
+        'scraped_at': model.scraped_at.isoformat()
+    }
+    topics = list(dict.fromkeys(topic.lower() for topic in model.matched_topics))
+    return row, topics
+
+
+def _load_output_file(path: str) -> Tuple[str, List[PostRow]]:
+    """Parse one legacy output file into rows (runs in a worker process)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    scorer = EngagementScorer.from_config(decay=False)
+    fallback_topics = data.get('metadata', {}).get('topics_searched', [])
+    rows = []
+    for post in data.get('posts', []):
+        if not post.get('matched_topics') and fallback_topics:
+            post = {**post, 'matched_topics': fallback_topics}
+        row = post_to_row(post, scorer)
+        if row:
+            rows.append(row)
+    return path, rows
+
+
+class PostStore:
+    """
+    SQLite store of every post the search tool has returned.
+
+    Posts are keyed by canonical URL and upserted, so re-scraping a post
+    refreshes its metrics while keeping the first time it was seen. Topics live
+    in a separate table so topic filters are an index lookup rather than a
+    scan over JSON.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS posts (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE,
+                source_url TEXT NOT NULL,
+                title TEXT,
+                text TEXT NOT NULL,
+                post_date TEXT,
+                reactions INTEGER NOT NULL DEFAULT 0,
+                comments INTEGER NOT NULL DEFAULT 0,
+                shares INTEGER NOT NULL DEFAULT 0,
+                engagement_score REAL NOT NULL DEFAULT 0,
+                first_seen TEXT NOT NULL,
+                scraped_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS post_topics (
+                post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+                topic TEXT NOT NULL,
+                PRIMARY KEY (post_id, topic)
+            );
+            CREATE INDEX IF NOT EXISTS idx_posts_scraped_at ON posts (scraped_at);
+            CREATE INDEX IF NOT EXISTS idx_posts_engagement ON posts (engagement_score);
+            CREATE INDEX IF NOT EXISTS idx_post_topics_topic ON post_topics (topic, post_id);
+            """
+        )
+        self._conn.commit()
+
+    def _upsert_rows(self, rows: Iterable[PostRow]) -> int:
+        count = 0
+        for row, topics in rows:
+            post_id = self._conn.execute(
+                """
+                INSERT INTO posts (url, source_url, title, text, post_date, reactions, comments, shares,
+                                   engagement_score, first_seen, scraped_at)
+                VALUES (:url, :source_url, :title, :text, :post_date, :reactions, :comments, :shares,
+                        :engagement_score, :scraped_at, :scraped_at)
+                ON CONFLICT(url) DO UPDATE SET
+                    source_url = excluded.source_url,
+                    title = COALESCE(excluded.title, posts.title),
+                    text = excluded.text,
+                    post_date = COALESCE(excluded.post_date, posts.post_date),
+                    reactions = excluded.reactions,
+                    comments = excluded.comments,
+                    shares = excluded.shares,
+                    engagement_score = excluded.engagement_score,
+                    first_seen = MIN(posts.first_seen, excluded.first_seen),
+                    scraped_at = MAX(posts.scraped_at, excluded.scraped_at)
+                WHERE excluded.scraped_at >= posts.scraped_at
+                RETURNING id
+                """,
+                row
+            ).fetchone()
+            if post_id is None:
+                # An older scrape of a post we already have; only its first sighting and topics are merged
+                post_id = self._conn.execute(
+                    "UPDATE posts SET first_seen = MIN(first_seen, ?) WHERE url = ? RETURNING id",
+                    (row['scraped_at'], row['url'])
+                ).fetchone()
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO post_topics (post_id, topic) VALUES (?, ?)",
+                [(post_id[0], topic) for topic in topics]
+            )
+            count += 1
+        return count
+
+    def upsert_posts(self, posts: List[Dict[str, Any]]) -> int:
+        """
+        Insert or refresh posts from a search run
+
+        Args:
+            posts (List[Dict[str, Any]]): Posts as produced by the search tool
+
+        Returns:
+            int: Number of posts stored
+        """
+        scorer = EngagementScorer.from_config(decay=False)
+        rows = [row for row in (post_to_row(post, scorer) for post in posts) if row]
+        with self._lock:
+            try:
+                count = self._upsert_rows(rows)
+                self._conn.commit()
+                return count
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.error(f"Error storing posts: {str(e)}")
+                return 0
+
+    def ingest_output_files(self, paths: Optional[List[Path]] = None, max_workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Bulk-load legacy linkedin_posts_*.json files
+
+        Files are parsed and validated in parallel worker processes; rows are
+        written from this process in a single transaction.
+
+        Args:
+            paths (Optional[List[Path]]): Files to load; defaults to every output file in Config.OUTPUT_DIR
+            max_workers (Optional[int]): Parser processes; defaults to the CPU count
+
+        Returns:
+            Dict[str, int]: Files loaded, files failed and posts stored
+        """
+        if paths is None:
+            paths = sorted(Config.OUTPUT_DIR.glob('linkedin_posts_*.json'))
+        stats = {'files': 0, 'failed': 0, 'posts': 0}
+        if not paths:
+            return stats
+
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(paths)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_load_output_file, str(path)) for path in paths]
+            with self._lock:
+                try:
+                    for path, future in zip(paths, futures):
+                        try:
+                            _, rows = future.result()
+                        except Exception as e:
+                            # A malformed file (or a crashed parser) only loses that file
+                            logger.error(f"Error loading output file {path}: {type(e).__name__}: {str(e)}")
+                            stats['failed'] += 1
+                            continue
+                        stats['posts'] += self._upsert_rows(rows)
+                        stats['files'] += 1
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    self._conn.rollback()
+                    logger.error(f"Error ingesting output files: {str(e)}")
+                    raise
+
+        logger.info(f"Ingested {stats['posts']} posts from {stats['files']} output files ({stats['failed']} failed)")
+        return stats
+
+    def query_posts(
+        self,
+        topic: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        min_score: Optional[float] = None,
+        sort: str = 'engagement_score',
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Query stored posts
+
+        Args:
+            topic (Optional[str]): Only posts matched to this topic (case-insensitive)
+            since (Optional[datetime]): Only posts scraped at or after this time
+            until (Optional[datetime]): Only posts scraped before this time
+            min_score (Optional[float]): Minimum engagement score
+            sort (str): One of SORT_COLUMNS
+            limit (int): Page size
+            offset (int): Rows to skip
+
+        Returns:
+            Tuple[int, List[Dict[str, Any]]]: Total matching posts and the requested page
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unsupported sort '{sort}', expected one of {', '.join(SORT_COLUMNS)}")
+
+        joins, conditions, params = [], [], []
+        if topic:
+            joins.append("JOIN post_topics t ON t.post_id = p.id AND t.topic = ?")
+            params.append(topic.lower())
+        if since:
+            conditions.append("p.scraped_at >= ?")
+            params.append(since.isoformat())
+        if until:
+            conditions.append("p.scraped_at < ?")
+            params.append(until.isoformat())
+        if min_score is not None:
+            conditions.append("p.engagement_score >= ?")
+            params.append(min_score)
+
+        from_clause = f"FROM posts p {' '.join(joins)} {'WHERE ' + ' AND '.join(conditions) if conditions else ''}"
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) {from_clause}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"""
+                SELECT p.*, (SELECT GROUP_CONCAT(topic, '|') FROM post_topics WHERE post_id = p.id) AS topics
+                {from_clause}
+                ORDER BY {SORT_COLUMNS[sort]}
+                LIMIT ? OFFSET ?
+                """,
+                params + [limit, offset]
+            ).fetchall()
+
+        posts = []
+        for row in rows:
+            post = dict(row)
+            post['metrics'] = {
+                'reactions': post.pop('reactions'),
+                'comments': post.pop('comments'),
+                'shares': post.pop('shares')
+            }
+            post['topics'] = post['topics'].split('|') if post['topics'] else []
+            posts.append(post)
+        return total, posts
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'posts': self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0],
+                'topics': self._conn.execute("SELECT COUNT(DISTINCT topic) FROM post_topics").fetchone()[0]
+            }
+
+
+_post_store: Optional[PostStore] = None
+_post_store_lock = threading.Lock()
+
+
+def get_post_store() -> PostStore:
+    """Return the process-wide post store"""
+    global _post_store
+    with _post_store_lock:
+        if _post_store is None:
+            _post_store = PostStore(Config.POST_STORE_PATH)
+            logger.info(f"Post store initialized at {Config.POST_STORE_PATH}")
+        return _post_store
+
+
+if __name__ == "__main__":
+    # Load the per-run JSON files written before the store existed
+    get_post_store().ingest_output_files()
@@ -0,0 +1,124 @@
+from typing import List, Dict, Any
+import re
+from pydantic import BaseModel, Field
+from config.settings import Config
+
+SITE_FILTER = "site:linkedin.com/posts/"
+TOKEN = re.compile(r'[a-z0-9]+')
+STOPWORDS = {'a', 'an', 'and', 'the', 'of', 'for', 'in', 'on', 'to', 'with', 'ai'}
+
+
+class QueryBatch(BaseModel):
+    """One Custom Search query covering one or more topics"""
+    topics: List[str] = Field(..., description="Topics searched by this query")
+    query: str = Field(..., description="Custom Search query string")
+
+    @property
+    def label(self) -> str:
+        return " OR ".join(self.topics)
+
+    @classmethod
+    def single(cls, topic: str) -> 'QueryBatch':
+        return cls(topics=[topic], query=f"{SITE_FILTER} {topic}")
+
+
+def _topic_tokens(topic: str) -> List[str]:
+    tokens = TOKEN.findall(topic.lower())
+    return [t for t in tokens if t not in STOPWORDS] or tokens
+
+
+def _quoted(topic: str) -> str:
+    cleaned = re.sub(r'["()]', ' ', topic)
+    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    return f'"{cleaned}"' if ' ' in cleaned else cleaned
+
+
+def build_batch_query(topics: List[str]) -> str:
+    """Combine topics into a single OR query"""
+    if len(topics) == 1:
+        return QueryBatch.single(topics[0]).query
+    return f"{SITE_FILTER} ({' OR '.join(_quoted(t) for t in topics)})"
+
+
+def _query_words(query: str) -> int:
+    return len(query.replace('(', ' ').replace(')', ' ').split())
+
+
+def plan_queries(
+    topics: List[str],
+    max_topics_per_query: int = 5,
+    max_query_words: int = 32,
+    max_topic_words: int = 3
+) -> List[QueryBatch]:
+    """
+    Pack short topics into OR queries within Google's query-length limits
+
+    Topics longer than max_topic_words keep a query of their own, since OR-ing
+    long phrases dilutes results and makes attribution unreliable.
+
+    Args:
+        topics (List[str]): Topics to search
+        max_topics_per_query (int): Maximum topics combined into one query
+        max_query_words (int): Google ignores words beyond 32 per query
+        max_topic_words (int): Topics with more words are not batched
+
+    Returns:
+        List[QueryBatch]: Planned queries, covering every topic exactly once
+    """
+    batches: List[QueryBatch] = []
+    current: List[str] = []
+
+    for topic in dict.fromkeys(topics):
+        if len(topic.split()) > max_topic_words:
+            batches.append(QueryBatch.single(topic))
+            continue
+
+        candidate = current + [topic]
+        if current and (
+            len(candidate) > max_topics_per_query
+            or _query_words(build_batch_query(candidate)) > max_query_words
+        ):
+            batches.append(QueryBatch(topics=current, query=build_batch_query(current)))
+            candidate = [topic]
+        current = candidate
+
+    if current:
+        batches.append(QueryBatch(topics=current, query=build_batch_query(current)))
+    return batches
+
+
+def plan_queries_from_config(topics: List[str]) -> List[QueryBatch]:
+    return plan_queries(
+        topics,
+        max_topics_per_query=Config.SEARCH_BATCH_MAX_TOPICS,
+        max_query_words=Config.SEARCH_BATCH_MAX_WORDS
+    )
+
+
+def attribute_topics(item: Dict[str, Any], topics: List[str]) -> List[str]:
+    """
+    Work out which of a batch's topics a search result belongs to
+
+    A topic matches when all of its keywords appear in the title and snippet.
+    Failing that, the topics with the highest share of matching keywords (at
+    least half) are used. A result that matches none of them is attributed to
+    no topic rather than to all of them; the post keeps the batch's topics in
+    query_topics instead, so it is still traceable to the query that found it.
+    """
+    if len(topics) == 1:
+        return list(topics)
+
+    text_tokens = set(TOKEN.findall(f"{item.get('title', '')} {item.get('snippet', '')}".lower()))
+    coverage = {}
+    for topic in topics:
+        keywords = _topic_tokens(topic)
+        coverage[topic] = sum(k in text_tokens for k in keywords) / len(keywords) if keywords else 0.0
+
+    full_matches = [t for t in topics if coverage[t] == 1.0]
+    if full_matches:
+        return full_matches
+
+    best = max(coverage.values())
+    if best >= 0.5:
+        return [t for t in topics if coverage[t] == best]
+    return []
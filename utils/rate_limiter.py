@@ -0,0 +1,205 @@
+from typing import Dict, Any, Optional
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+import sqlite3
+import threading
+import time
+from config.settings import Config
+from utils.logger import logger
+
+
+class QuotaExceededError(Exception):
+    """Raised when the daily API quota is used up"""
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with a daily quota and adaptive backoff.
+
+    Callers block in acquire() until a token is available instead of having
+    their request dropped. Rate-limit responses from the API pause all callers
+    with an exponentially growing backoff that resets on the next success.
+    Backoffs, server Retry-After values included, are capped at max_wait so a
+    pause never outlasts the callers waiting for it.
+    Daily usage can be persisted to SQLite so it survives restarts and is
+    shared by every process using the same file.
+    """
+
+    def __init__(
+        self,
+        per_minute: int,
+        daily_quota: int,
+        burst: int = 10,
+        state_path: Optional[Path] = None,
+        max_wait: float = 120.0,
+        base_backoff: float = 2.0,
+        max_backoff: float = 300.0,
+        quota_timezone: str = "America/Los_Angeles"
+    ):
+        self.per_minute = per_minute
+        self.daily_quota = daily_quota
+        self.burst = max(1, burst)
+        self.max_wait = max_wait
+        self.base_backoff = base_backoff
+        self.max_backoff = min(max_backoff, max_wait)
+        self.quota_timezone = ZoneInfo(quota_timezone)
+
+        self._condition = threading.Condition()
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._strikes = 0
+        self._waiting = 0
+        self._daily_exhausted_on: Optional[str] = None
+        self._memory_usage: Dict[str, int] = {}
+
+        self._conn = None
+        if state_path:
+            Path(state_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(state_path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS quota_usage (day TEXT PRIMARY KEY, used INTEGER NOT NULL)"
+            )
+
+    def _today(self) -> str:
+        # Google resets Custom Search quotas at midnight Pacific time
+        return datetime.now(self.quota_timezone).strftime('%Y-%m-%d')
+
+    def _used_today(self) -> int:
+        day = self._today()
+        if self._conn is None:
+            return self._memory_usage.get(day, 0)
+        row = self._conn.execute("SELECT used FROM quota_usage WHERE day = ?", (day,)).fetchone()
+        return row[0] if row else 0
+
+    def _consume_quota(self) -> None:
+        """Atomically count one request against today's quota"""
+        day = self._today()
+        if self._conn is None:
+            used = self._memory_usage.get(day, 0)
+            if used >= self.daily_quota:
+                raise QuotaExceededError(f"Daily quota of {self.daily_quota} requests reached")
+            self._memory_usage = {day: used + 1}
+            return
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute("SELECT used FROM quota_usage WHERE day = ?", (day,)).fetchone()
+            used = row[0] if row else 0
+            if used >= self.daily_quota:
+                raise QuotaExceededError(f"Daily quota of {self.daily_quota} requests reached")
+            self._conn.execute(
+                "INSERT INTO quota_usage (day, used) VALUES (?, 1) "
+                "ON CONFLICT (day) DO UPDATE SET used = used + 1",
+                (day,)
+            )
+            self._conn.execute("DELETE FROM quota_usage WHERE day < ?", (day,))
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.per_minute / 60.0)
+        self._last_refill = now
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent
+
+        Raises:
+            QuotaExceededError: If today's quota is used up
+            TimeoutError: If no token became available within max_wait seconds
+        """
+        deadline = time.monotonic() + self.max_wait
+        with self._condition:
+            self._waiting += 1
+            try:
+                while True:
+                    if self._daily_exhausted_on == self._today():
+                        raise QuotaExceededError("Daily quota reported exhausted by the API")
+
+                    now = time.monotonic()
+                    self._refill()
+                    wait = max(self._paused_until - now, 0.0)
+                    if wait == 0.0 and self._tokens >= 1:
+                        self._consume_quota()
+                        self._tokens -= 1
+                        return
+                    if wait == 0.0:
+                        wait = (1 - self._tokens) * 60.0 / self.per_minute
+
+                    if now + wait > deadline:
+                        raise TimeoutError(f"Rate limiter wait exceeded {self.max_wait:.0f}s")
+                    self._condition.wait(timeout=wait)
+            finally:
+                self._waiting -= 1
+
+    def report_rate_limited(self, retry_after: Optional[float] = None, daily: bool = False) -> float:
+        """
+        Pause all callers after a rate-limit response
+
+        Args:
+            retry_after (Optional[float]): Server-provided delay in seconds, if any
+            daily (bool): The API reported the daily quota as exhausted
+
+        Returns:
+            float: Backoff applied in seconds
+        """
+        with self._condition:
+            if daily:
+                self._daily_exhausted_on = self._today()
+                logger.error("Daily search quota exhausted according to the API")
+                self._condition.notify_all()
+                return 0.0
+
+            self._strikes += 1
+            backoff = min(
+                self.max_backoff,
+                retry_after if retry_after else self.base_backoff * (2 ** (self._strikes - 1))
+            )
+            self._paused_until = max(self._paused_until, time.monotonic() + backoff)
+            self._tokens = 0.0
+            logger.warning(f"Search API rate limited, backing off for {backoff:.1f}s")
+            return backoff
+
+    def report_success(self) -> None:
+        """Reset the adaptive backoff after a successful request"""
+        with self._condition:
+            self._strikes = 0
+
+    def status(self) -> Dict[str, Any]:
+        """Return current quota and backoff state"""
+        with self._condition:
+            used = self._used_today()
+            exhausted = self._daily_exhausted_on == self._today()
+            return {
+                'daily_quota': self.daily_quota,
+                'used_today': used,
+                'remaining_today': 0 if exhausted else max(self.daily_quota - used, 0),
+                'per_minute': self.per_minute,
+                'queued_requests': self._waiting,
+                'backoff_remaining': round(max(self._paused_until - time.monotonic(), 0.0), 1)
+            }
+
+
+_cse_rate_limiter: Optional[RateLimiter] = None
+_cse_rate_limiter_lock = threading.Lock()
+
+
+def get_cse_rate_limiter() -> RateLimiter:
+    """Return the rate limiter shared by all Google Custom Search tool instances"""
+    global _cse_rate_limiter
+    with _cse_rate_limiter_lock:
+        if _cse_rate_limiter is None:
+            _cse_rate_limiter = RateLimiter(
+                per_minute=Config.GOOGLE_CSE_PER_MINUTE,
+                daily_quota=Config.GOOGLE_CSE_DAILY_QUOTA,
+                burst=Config.GOOGLE_CSE_BURST,
+                state_path=Config.GOOGLE_CSE_QUOTA_PATH if Config.GOOGLE_CSE_PERSIST_QUOTA else None,
+                max_wait=Config.GOOGLE_CSE_MAX_WAIT
+            )
+        return _cse_rate_limiter
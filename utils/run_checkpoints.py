@@ -0,0 +1,275 @@
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+from contextvars import ContextVar
+from pathlib import Path
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from crewai import Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+from config.settings import Config
+from utils.logger import logger
+from utils.post_archive import new_run_id
+
+# Id of the crew run executing in the current context, for tools that need to reference it
+current_run_id: ContextVar[Optional[str]] = ContextVar('current_run_id', default=None)
+
+
+def input_fingerprint(inputs: Dict[str, Any]) -> str:
+    """Stable hash of a run's kickoff inputs"""
+    raw = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class CheckpointStore:
+    """
+    SQLite store of finished task outputs, scoped to a crew run.
+
+    Each run is recorded with the fingerprint of its kickoff inputs. Task
+    outputs are written as each task completes, so a run cut short by a
+    restart can be picked up again: a later run with the same inputs resumes
+    the most recent interrupted run and only executes the tasks it is
+    missing. Failed runs are only resumed when asked for by run id, and runs
+    still executing in this process are never resumed by another run.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._active: Dict[str, int] = {}
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoint_runs (
+                run_id TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                inputs TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS checkpoint_tasks (
+                run_id TEXT NOT NULL REFERENCES checkpoint_runs(run_id) ON DELETE CASCADE,
+                task_name TEXT NOT NULL,
+                output TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (run_id, task_name)
+            );
+            CREATE INDEX IF NOT EXISTS idx_checkpoint_runs_fingerprint ON checkpoint_runs (fingerprint, status, updated_at);
+            """
+        )
+        self._conn.commit()
+
+    def begin_run(self, inputs: Dict[str, Any], run_id: Optional[str] = None) -> Tuple[str, bool]:
+        """
+        Start a run, or resume an interrupted one with the same inputs
+
+        Only runs left 'running' by a process that stopped are resumed
+        automatically; a failed run is resumed only when its run_id is given.
+
+        Args:
+            inputs (Dict[str, Any]): Kickoff inputs of the run
+            run_id (Optional[str]): Run to resume explicitly; a new run is started
+                under this id if it is unknown
+
+        Returns:
+            Tuple[str, bool]: Run id and whether an earlier run is being resumed
+        """
+        fingerprint = input_fingerprint(inputs)
+        now = time.time()
+        with self._lock:
+            if run_id is None:
+                resume_after = now - Config.CHECKPOINT_RESUME_MAX_AGE_HOURS * 3600
+                for row in self._conn.execute(
+                    """
+                    SELECT run_id FROM checkpoint_runs
+                    WHERE fingerprint = ? AND status = 'running' AND updated_at >= ?
+                    ORDER BY updated_at DESC
+                    """,
+                    (fingerprint, resume_after)
+                ):
+                    if row['run_id'] not in self._active:
+                        run_id = row['run_id']
+                        break
+
+            existing = None
+            if run_id is not None:
+                existing = self._conn.execute(
+                    "SELECT fingerprint FROM checkpoint_runs WHERE run_id = ?", (run_id,)
+                ).fetchone()
+                if existing is not None and existing['fingerprint'] != fingerprint:
+                    raise ValueError(f"Run {run_id} was started with different inputs")
+
+            run_id = run_id or new_run_id()
+            self._conn.execute(
+                """
+                INSERT INTO checkpoint_runs (run_id, fingerprint, inputs, status, created_at, updated_at)
+                VALUES (?, ?, ?, 'running', ?, ?)
+                ON CONFLICT(run_id) DO UPDATE SET status = 'running', updated_at = excluded.updated_at
+                """,
+                (run_id, fingerprint, json.dumps(inputs, default=str), now, now)
+            )
+            self._conn.commit()
+            self._active[run_id] = self._active.get(run_id, 0) + 1
+
+        if existing is not None:
+            logger.info(f"Resuming crew run {run_id} from its checkpoints")
+        return run_id, existing is not None
+
+    def save_output(self, run_id: str, output: TaskOutput) -> None:
+        """Persist a finished task's output; the task is identified by output.name"""
+        record = {
+            'output': output.model_dump(mode='json', exclude={'pydantic', 'messages'}),
+            'pydantic': output.pydantic.model_dump(mode='json') if output.pydantic is not None else None
+        }
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO checkpoint_tasks (run_id, task_name, output, created_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (run_id, output.name, json.dumps(record, default=str), now)
+                )
+                self._conn.execute("UPDATE checkpoint_runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.error(f"Error checkpointing task '{output.name}' of run {run_id}: {str(e)}")
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Inputs and status of a recorded run, or None if it is unknown or purged"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id, inputs, status, created_at, updated_at FROM checkpoint_runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {**dict(row), 'inputs': json.loads(row['inputs'])}
+
+    def load_outputs(self, run_id: str) -> Dict[str, Dict[str, Any]]:
+        """Checkpointed output records of a run, keyed by task name in completion order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT task_name, output FROM checkpoint_tasks WHERE run_id = ? ORDER BY created_at", (run_id,)
+            ).fetchall()
+        return {row['task_name']: json.loads(row['output']) for row in rows}
+
+    def discard_outputs(self, run_id: str, task_names: Iterable[str]) -> int:
+        """Delete the checkpoints of tasks about to be run again, so a failed rerun cannot restore them"""
+        task_names = list(task_names)
+        if not task_names:
+            return 0
+        with self._lock:
+            deleted = self._conn.execute(
+                f"DELETE FROM checkpoint_tasks WHERE run_id = ? AND task_name IN ({','.join('?' * len(task_names))})",
+                (run_id, *task_names)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def finish_run(self, run_id: str, status: str) -> None:
+        """Mark a run completed or failed; failed runs can still be resumed by run id"""
+        with self._lock:
+            self._active[run_id] = self._active.get(run_id, 1) - 1
+            if self._active[run_id] <= 0:
+                del self._active[run_id]
+            self._conn.execute(
+                "UPDATE checkpoint_runs SET status = ?, updated_at = ? WHERE run_id = ?",
+                (status, time.time(), run_id)
+            )
+            self._conn.commit()
+
+    def purge(self, max_age_days: int) -> Dict[str, int]:
+        """
+        Delete runs not updated within max_age_days, except those executing now
+
+        Returns:
+            Dict[str, int]: Runs removed and output bytes reclaimed
+        """
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock:
+            expired = [
+                row['run_id'] for row in self._conn.execute(
+                    "SELECT run_id FROM checkpoint_runs WHERE updated_at < ?", (cutoff,)
+                )
+                if row['run_id'] not in self._active
+            ]
+            if not expired:
+                return {'runs_removed': 0, 'bytes_reclaimed': 0}
+            placeholders = ','.join('?' * len(expired))
+            reclaimed = self._conn.execute(
+                f"SELECT COALESCE(SUM(LENGTH(output)), 0) FROM checkpoint_tasks WHERE run_id IN ({placeholders})",
+                expired
+            ).fetchone()[0]
+            self._conn.execute(f"DELETE FROM checkpoint_runs WHERE run_id IN ({placeholders})", expired)
+            self._conn.commit()
+        return {'runs_removed': len(expired), 'bytes_reclaimed': reclaimed}
+
+
+def restore_task_output(task: Task, record: Dict[str, Any]) -> TaskOutput:
+    """Rebuild a checkpointed TaskOutput, revalidating structured output against the task's model"""
+    pydantic_output = None
+    if record.get('pydantic') is not None and task.output_pydantic is not None:
+        pydantic_output = task.output_pydantic.model_validate(record['pydantic'])
+    return TaskOutput(**record['output'], pydantic=pydantic_output)
+
+
+def apply_checkpoints(tasks: List[Task], records: Dict[str, Dict[str, Any]], rerun: Iterable[str] = ()) -> List[Task]:
+    """
+    Restore the outputs of checkpointed tasks and return the tasks still to run
+
+    Restored tasks keep their output, so tasks that list them as context read
+    it as if they had just run.
+
+    Args:
+        tasks (List[Task]): Tasks of the run in crew order
+        records (Dict[str, Dict[str, Any]]): Checkpoint records of the run
+        rerun (Iterable[str]): Tasks to run again even though they are checkpointed
+
+    Returns:
+        List[Task]: Tasks without a usable checkpoint
+    """
+    rerun = set(rerun)
+    remaining = []
+    for task in tasks:
+        if task.name in records and task.name not in rerun:
+            task.output = restore_task_output(task, records[task.name])
+        else:
+            remaining.append(task)
+    if len(remaining) < len(tasks):
+        logger.info(f"Restored {len(tasks) - len(remaining)} task outputs from checkpoints")
+    return remaining
+
+
+def crew_output_from_checkpoints(records: Dict[str, Dict[str, Any]]) -> CrewOutput:
+    """CrewOutput of a run whose tasks had all finished before it was interrupted"""
+    outputs = [
+        TaskOutput(**record['output']) if record.get('pydantic') is None
+        else TaskOutput(**{**record['output'], 'json_dict': record['pydantic']})
+        for record in records.values()
+    ]
+    final = outputs[-1]
+    return CrewOutput(raw=final.raw, json_dict=final.json_dict, tasks_output=outputs)
+
+
+_checkpoint_store: Optional[CheckpointStore] = None
+_checkpoint_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Return the process-wide checkpoint store"""
+    global _checkpoint_store
+    with _checkpoint_store_lock:
+        if _checkpoint_store is None:
+            _checkpoint_store = CheckpointStore(Config.CHECKPOINT_DB_PATH)
+            logger.info(f"Checkpoint store initialized at {Config.CHECKPOINT_DB_PATH}")
+        return _checkpoint_store
@@ -0,0 +1,181 @@
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+import json
+import sqlite3
+import threading
+import time
+from config.settings import Config
+from utils.logger import logger
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+class RunHistoryStore:
+    """
+    SQLite history of workflow executions.
+
+    One row per execution holds the full execution record (trigger, status,
+    topics, per-stage timings, result) as JSON, next to indexed columns for
+    the filters and orderings the status API uses. Rows are upserted on every
+    state change, so the history survives restarts; executions still active
+    when a process stopped are marked interrupted by the next one.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS run_history (
+                execution_id TEXT PRIMARY KEY,
+                trigger TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                record TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_run_history_created ON run_history (created_at);
+            CREATE INDEX IF NOT EXISTS idx_run_history_status ON run_history (status, finished_at);
+            CREATE INDEX IF NOT EXISTS idx_run_history_started ON run_history (started_at);
+            CREATE INDEX IF NOT EXISTS idx_run_history_status_started ON run_history (status, started_at);
+            """
+        )
+        self._conn.commit()
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Write the current state of an execution record (JSON-mode dump)"""
+        with self._lock:
+            try:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO run_history
+                        (execution_id, trigger, status, created_at, started_at, finished_at, record)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        record['execution_id'],
+                        record['trigger'],
+                        record['status'],
+                        _timestamp(record['created_at']),
+                        _timestamp(record.get('started_at')),
+                        _timestamp(record.get('finished_at')),
+                        json.dumps(record, default=str)
+                    )
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.error(f"Error recording execution {record['execution_id']}: {str(e)}")
+
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM run_history WHERE execution_id = ?", (execution_id,)
+            ).fetchone()
+        return json.loads(row['record']) if row else None
+
+    def list_runs(
+        self,
+        status: Optional[str] = None,
+        trigger: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Executions newest first, optionally filtered by status and trigger
+
+        Returns:
+            Tuple[int, List[Dict[str, Any]]]: Total matching executions and the requested page
+        """
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if trigger:
+            clauses.append("trigger = ?")
+            params.append(trigger)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM run_history {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT record FROM run_history {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                [*params, limit, offset]
+            ).fetchall()
+        return total, [json.loads(row['record']) for row in rows]
+
+    def summary(self) -> Dict[str, Any]:
+        """Last started and last successful execution, answered from the indexes"""
+        with self._lock:
+            last_started = self._conn.execute(
+                "SELECT execution_id, status, started_at FROM run_history WHERE started_at IS NOT NULL "
+                "ORDER BY started_at DESC LIMIT 1"
+            ).fetchone()
+            last_succeeded = self._conn.execute(
+                "SELECT execution_id, finished_at FROM run_history WHERE status = 'succeeded' "
+                "ORDER BY finished_at DESC LIMIT 1"
+            ).fetchone()
+        return {
+            'last_execution': last_started['started_at'] if last_started else None,
+            'last_execution_id': last_started['execution_id'] if last_started else None,
+            'last_execution_status': last_started['status'] if last_started else None,
+            'last_success': last_succeeded['finished_at'] if last_succeeded else None
+        }
+
+    def mark_interrupted(self) -> int:
+        """Close out executions a previous process left queued or running"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT record FROM run_history WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))})",
+                ACTIVE_STATUSES
+            ).fetchall()
+            for row in rows:
+                record = json.loads(row['record'])
+                record.update(status='interrupted', stage=None, error='Process stopped before the execution finished')
+                self._conn.execute(
+                    "UPDATE run_history SET status = 'interrupted', record = ? WHERE execution_id = ?",
+                    (json.dumps(record, default=str), record['execution_id'])
+                )
+            self._conn.commit()
+        return len(rows)
+
+    def purge(self, max_age_days: int) -> Dict[str, int]:
+        """Delete finished executions created more than max_age_days ago"""
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock:
+            placeholders = ','.join('?' * len(ACTIVE_STATUSES))
+            reclaimed = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(LENGTH(record)), 0) FROM run_history "
+                f"WHERE created_at < ? AND status NOT IN ({placeholders})",
+                (cutoff, *ACTIVE_STATUSES)
+            ).fetchone()
+            self._conn.execute(
+                f"DELETE FROM run_history WHERE created_at < ? AND status NOT IN ({placeholders})",
+                (cutoff, *ACTIVE_STATUSES)
+            )
+            self._conn.commit()
+        return {'runs_removed': reclaimed[0], 'bytes_reclaimed': reclaimed[1]}
+
+
+_run_history_store: Optional[RunHistoryStore] = None
+_run_history_store_lock = threading.Lock()
+
+
+def get_run_history_store() -> RunHistoryStore:
+    """Return the process-wide run history store"""
+    global _run_history_store
+    with _run_history_store_lock:
+        if _run_history_store is None:
+            _run_history_store = RunHistoryStore(Config.SCHEDULER_DB_PATH)
+            logger.info(f"Run history store initialized at {Config.SCHEDULER_DB_PATH}")
+        return _run_history_store
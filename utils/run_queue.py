@@ -0,0 +1,178 @@
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+from collections import deque
+from enum import IntEnum
+import asyncio
+import itertools
+import math
+import time
+from utils.logger import logger
+
+
+class RunPriority(IntEnum):
+    """Priority classes of queued runs; lower values are served first"""
+    MANUAL = 0
+    SCHEDULED = 1
+    SPECULATIVE = 2
+
+
+class QueueFullError(Exception):
+    """Raised when a run is submitted while the queue is at its maximum depth"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RunQueue:
+    """
+    Bounded priority queue of crew runs served by a fixed pool of workers.
+
+    Runs are coroutine factories. Higher priority classes are served first
+    and runs of the same class in submission order. Submitting while max_depth
+    runs are waiting raises QueueFullError with an estimate of when to retry,
+    instead of silently dropping the run. Wait and run times of recent runs
+    are kept for the metrics.
+    """
+
+    def __init__(self, workers: int = 1, max_depth: int = 10, default_retry_after: int = 60, window: int = 200):
+        self.workers = max(1, workers)
+        self.max_depth = max(1, max_depth)
+        self.default_retry_after = default_retry_after
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._sequence = itertools.count()
+        self._depth_by_priority: Dict[RunPriority, int] = {priority: 0 for priority in RunPriority}
+        self._running = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_times: deque = deque(maxlen=window)
+        self._run_times: deque = deque(maxlen=window)
+
+    @property
+    def depth(self) -> int:
+        return sum(self._depth_by_priority.values())
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def start(self) -> None:
+        """Start the workers; must be called from the event loop"""
+        if self._workers:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"run-queue-worker-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"Run queue started with {self.workers} workers (max depth {self.max_depth})")
+
+    def stop(self) -> None:
+        """Cancel the workers and every run still waiting"""
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        while self._queue is not None and not self._queue.empty():
+            _, _, _, _, future = self._queue.get_nowait()
+            future.cancel()
+        self._depth_by_priority = {priority: 0 for priority in RunPriority}
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to free up, from recent run times"""
+        if not self._run_times:
+            return self.default_retry_after
+        average = sum(self._run_times) / len(self._run_times)
+        return max(1, math.ceil(average * (self.depth // self.workers + 1)))
+
+    def submit(
+        self,
+        run: Callable[[], Awaitable[Any]],
+        priority: RunPriority = RunPriority.MANUAL,
+        name: str = "run"
+    ) -> asyncio.Future:
+        """
+        Queue a run
+
+        Args:
+            run (Callable[[], Awaitable[Any]]): Coroutine factory executing the run
+            priority (RunPriority): Priority class of the run
+            name (str): Name used in logs
+
+        Returns:
+            asyncio.Future: Resolves with the run's result once a worker has executed it
+
+        Raises:
+            QueueFullError: If max_depth runs are already waiting
+        """
+        if self._queue is None:
+            raise RuntimeError("Run queue has not been started")
+        if self.depth >= self.max_depth:
+            self._rejected += 1
+            retry_after = self.retry_after()
+            raise QueueFullError(f"Run queue is full ({self.depth} runs waiting)", retry_after)
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((int(priority), next(self._sequence), time.monotonic(), (name, run), future))
+        self._depth_by_priority[priority] += 1
+        self._submitted += 1
+        logger.info(f"Queued {name} with {priority.name.lower()} priority ({self.depth} waiting, {self._running} running)")
+        return future
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            priority, _, enqueued_at, (name, run), future = await self._queue.get()
+            self._depth_by_priority[RunPriority(priority)] -= 1
+            if future.cancelled():
+                continue
+
+            waited = time.monotonic() - enqueued_at
+            self._wait_times.append(waited)
+            self._running += 1
+            started = time.monotonic()
+            logger.info(f"Worker {index} starting {name} after {waited:.1f}s in queue")
+            try:
+                result = await run()
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                self._failed += 1
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self._completed += 1
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._running -= 1
+                self._run_times.append(time.monotonic() - started)
+
+    @staticmethod
+    def _summary(samples: deque) -> Dict[str, Optional[float]]:
+        if not samples:
+            return {'last': None, 'avg': None, 'p95': None, 'max': None}
+        ordered = sorted(samples)
+        return {
+            'last': round(samples[-1], 3),
+            'avg': round(sum(ordered) / len(ordered), 3),
+            'p95': round(ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)], 3),
+            'max': round(ordered[-1], 3)
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, worker usage, counters and recent wait/run times in seconds"""
+        return {
+            'workers': self.workers,
+            'running': self._running,
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'depth_by_priority': {priority.name.lower(): count for priority, count in self._depth_by_priority.items()},
+            'submitted': self._submitted,
+            'rejected': self._rejected,
+            'completed': self._completed,
+            'failed': self._failed,
+            'wait_s': self._summary(self._wait_times),
+            'run_s': self._summary(self._run_times)
+        }
@@ -0,0 +1,87 @@
+from typing import Dict, Any, Optional
+import re
+import threading
+from crewai_tools import SerperDevTool
+from pydantic import Field
+from config.settings import Config
+from utils.disk_cache import DiskCache
+from utils.logger import logger
+
+GOOGLE_CSE_NAMESPACE = "google_cse"
+SERPER_NAMESPACE = "serper"
+
+_search_cache: Optional[DiskCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> DiskCache:
+    """Return the process-wide search response cache"""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = DiskCache(
+                Config.SEARCH_CACHE_PATH,
+                ttls={
+                    GOOGLE_CSE_NAMESPACE: Config.SEARCH_CACHE_TTL_GOOGLE_CSE,
+                    SERPER_NAMESPACE: Config.SEARCH_CACHE_TTL_SERPER
+                },
+                max_bytes=Config.SEARCH_CACHE_MAX_BYTES,
+                bypass=Config.SEARCH_CACHE_BYPASS
+            )
+            logger.info(f"Search cache initialized at {Config.SEARCH_CACHE_PATH}")
+        return _search_cache
+
+
+def search_cache_key(
+    query: str,
+    date_restrict: Optional[str] = None,
+    num: Optional[int] = None,
+    start: Optional[int] = None,
+    **extra: Any
+) -> Dict[str, Any]:
+    """
+    Build normalized cache key parts for a search request
+
+    Queries are lower-cased and whitespace-collapsed so trivially different
+    spellings of the same search share one entry.
+    """
+    key = {
+        'query': re.sub(r'\s+', ' ', (query or '').strip().lower()),
+        'dateRestrict': date_restrict,
+        'num': num,
+        'start': start or 1
+    }
+    key.update({k: v for k, v in extra.items() if v is not None})
+    return key
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """SerperDevTool that serves repeated queries from the on-disk search cache"""
+
+    bypass_cache: bool = Field(
+        default=False,
+        description="Always call Serper and do not store the response"
+    )
+
+    def _run(self, **kwargs: Any) -> Any:
+        query = kwargs.get('search_query') or kwargs.get('query') or ''
+        cache = get_search_cache()
+        key = search_cache_key(
+            query,
+            num=getattr(self, 'n_results', None),
+            start=kwargs.get('page'),
+            search_type=kwargs.get('search_type', getattr(self, 'search_type', None)),
+            country=getattr(self, 'country', None) or None,
+            location=getattr(self, 'location', None) or None,
+            locale=getattr(self, 'locale', None) or None
+        )
+
+        cached = cache.get(SERPER_NAMESPACE, key, bypass=self.bypass_cache)
+        if cached is not None:
+            logger.debug(f"Serper cache hit for query: {query}")
+            return cached
+
+        result = super()._run(**kwargs)
+        if result:
+            cache.set(SERPER_NAMESPACE, key, result, bypass=self.bypass_cache)
+        return result
@@ -0,0 +1,214 @@
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+from datetime import datetime
+from pathlib import Path
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+from config.settings import Config
+from utils.logger import logger
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over a blake2b digest"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01, bits: Optional[bytes] = None):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / self.capacity * math.log(2))))
+        num_bytes = (self.size + 7) // 8
+        self.bits = bytearray(bits) if bits and len(bits) == num_bytes else bytearray(num_bytes)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.bits)
+
+
+class SeenUrlIndex:
+    """
+    Persistent index of LinkedIn posts already returned by earlier runs.
+
+    Entries are keyed by (url, topic) and store a fingerprint of the post
+    content and metrics, so a post is only reported as new when it was never
+    seen for that topic or its content/engagement changed. A Bloom filter in
+    front of the SQLite table answers most "never seen" lookups without a query.
+    """
+
+    def __init__(self, db_path: Path, capacity: int = 100000, error_rate: float = 0.01):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen_posts (
+                url TEXT NOT NULL,
+                topic TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                PRIMARY KEY (url, topic)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS bloom_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                capacity INTEGER NOT NULL,
+                error_rate REAL NOT NULL,
+                bits BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._bloom = self._load_bloom(capacity, error_rate)
+
+    def _load_bloom(self, capacity: int, error_rate: float) -> BloomFilter:
+        """Load the persisted Bloom filter, rebuilding it from the table if missing or too small"""
+        row = self._conn.execute("SELECT capacity, error_rate, bits FROM bloom_state WHERE id = 1").fetchone()
+        count = self._conn.execute("SELECT COUNT(*) FROM seen_posts").fetchone()[0]
+
+        if row and row[0] >= count:
+            return BloomFilter(row[0], row[1], row[2])
+
+        return self._rebuild_bloom(max(capacity, count * 2), error_rate)
+
+    def _rebuild_bloom(self, capacity: int, error_rate: float) -> BloomFilter:
+        bloom = BloomFilter(capacity, error_rate)
+        for url, topic in self._conn.execute("SELECT url, topic FROM seen_posts"):
+            bloom.add(self._bloom_key(url, topic))
+        self._save_bloom(bloom)
+        logger.info(f"Rebuilt seen-URL Bloom filter with capacity {capacity}")
+        return bloom
+
+    def _save_bloom(self, bloom: BloomFilter) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO bloom_state (id, capacity, error_rate, bits) VALUES (1, ?, ?, ?)",
+            (bloom.capacity, bloom.error_rate, bloom.to_bytes())
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _bloom_key(url: str, topic: str) -> str:
+        return f"{url}\n{topic.lower()}"
+
+    @staticmethod
+    def fingerprint(post: Dict[str, Any]) -> str:
+        """Hash of the post fields that matter downstream (content and engagement)"""
+        raw = json.dumps(
+            {
+                'title': post.get('title', ''),
+                'text': post.get('text', ''),
+                'metrics': post.get('metrics', {})
+            },
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _is_unchanged(self, url: str, topic: str, fingerprint: str) -> bool:
+        if self._bloom_key(url, topic) not in self._bloom:
+            return False
+        row = self._conn.execute(
+            "SELECT fingerprint FROM seen_posts WHERE url = ? AND topic = ?",
+            (url, topic.lower())
+        ).fetchone()
+        return row is not None and row[0] == fingerprint
+
+    def was_seen(self, url: str, topics: List[str]) -> bool:
+        """Whether an earlier run returned url for any of the topics, whatever its content"""
+        with self._lock:
+            for topic in topics or ['']:
+                if self._bloom_key(url, topic) not in self._bloom:
+                    continue
+                if self._conn.execute(
+                    "SELECT 1 FROM seen_posts WHERE url = ? AND topic = ?", (url, topic.lower())
+                ).fetchone() is not None:
+                    return True
+        return False
+
+    def partition(self, posts: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Split posts into new-or-changed and unchanged ones
+
+        Args:
+            posts (List[Dict]): Posts with 'url' and 'matched_topics'
+
+        Returns:
+            Tuple[List[Dict], List[Dict]]: (new or changed posts, unchanged posts)
+        """
+        new_posts, unchanged_posts = [], []
+        with self._lock:
+            for post in posts:
+                fingerprint = self.fingerprint(post)
+                topics = post.get('matched_topics') or ['']
+                if post.get('url') and all(
+                    self._is_unchanged(post['url'], topic, fingerprint) for topic in topics
+                ):
+                    unchanged_posts.append(post)
+                else:
+                    new_posts.append(post)
+        return new_posts, unchanged_posts
+
+    def record(self, posts: List[Dict]) -> None:
+        """Mark posts as seen for each of their matched topics"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            try:
+                rows = [
+                    (post['url'], topic.lower(), self.fingerprint(post), now, now)
+                    for post in posts if post.get('url')
+                    for topic in (post.get('matched_topics') or [''])
+                ]
+                self._conn.executemany(
+                    """
+                    INSERT INTO seen_posts (url, topic, fingerprint, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (url, topic) DO UPDATE SET
+                        fingerprint = excluded.fingerprint,
+                        last_seen = excluded.last_seen
+                    """,
+                    rows
+                )
+                self._conn.commit()
+
+                count = self._conn.execute("SELECT COUNT(*) FROM seen_posts").fetchone()[0]
+                if count > self._bloom.capacity:
+                    self._bloom = self._rebuild_bloom(count * 2, self._bloom.error_rate)
+                else:
+                    for url, topic, *_ in rows:
+                        self._bloom.add(self._bloom_key(url, topic))
+                    self._save_bloom(self._bloom)
+
+            except sqlite3.Error as e:
+                logger.error(f"Error recording seen posts: {str(e)}")
+
+
+_seen_url_index: Optional[SeenUrlIndex] = None
+_seen_url_index_lock = threading.Lock()
+
+
+def get_seen_url_index() -> SeenUrlIndex:
+    """Return the process-wide seen-URL index"""
+    global _seen_url_index
+    with _seen_url_index_lock:
+        if _seen_url_index is None:
+            _seen_url_index = SeenUrlIndex(Config.SEEN_URL_INDEX_PATH)
+        return _seen_url_index
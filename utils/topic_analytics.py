@@ -0,0 +1,261 @@
+from typing import List, Dict, Any, Optional, Set, Tuple
+from datetime import datetime, timedelta
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from config.settings import Config
+from utils.logger import logger
+from utils.near_duplicates import canonical_url
+from utils.parquet_export import ParquetExporter, get_parquet_exporter
+from utils.post_archive import PostArchive, get_post_archive
+
+METRICS = ['reactions', 'comments', 'shares']
+COUNTERS = ['posts'] + METRICS + ['engagement']
+ROW_COLUMNS = ['url', 'topic', 'date', 'scraped_at'] + METRICS
+
+
+def _to_timestamps(values: pd.Series) -> pd.Series:
+    return pd.to_datetime(values, errors='coerce', format='ISO8601').dt.tz_localize(None)
+
+
+class TopicTrendAnalyzer:
+    """
+    Per-topic engagement trends over every archived search run.
+
+    Posts are folded into running per-(topic, day) sums. Each (post, topic)
+    pair is counted once, on the day it was posted (or first scraped when the
+    date is unknown), with the metrics of its latest scrape: a re-scrape swaps
+    the old metrics out of the sums, so it refreshes engagement without
+    inflating volume. Only runs archived since the last call are read, from
+    the Parquet export when they have been compacted and from the archive
+    otherwise, so a refresh costs time proportional to the new data rather
+    than the whole history.
+
+    Posts dated before the retention horizon (Config.TOPIC_TRENDS_RETENTION_DAYS)
+    are aged out of both the sums and the per-post state, which keeps memory
+    bounded by the horizon rather than the archive.
+    """
+
+    def __init__(
+        self,
+        archive: Optional[PostArchive] = None,
+        weights: Optional[Dict[str, float]] = None,
+        exporter: Optional[ParquetExporter] = None
+    ):
+        self.archive = archive or get_post_archive()
+        # The shared exporter only mirrors the shared archive
+        self.exporter = exporter or (get_parquet_exporter() if archive is None else None)
+        weights = weights or {
+            'reactions': Config.RANKING_WEIGHT_REACTIONS,
+            'comments': Config.RANKING_WEIGHT_COMMENTS,
+            'shares': Config.RANKING_WEIGHT_SHARES
+        }
+        self._weights = np.array([weights.get(metric, 1.0) for metric in METRICS], dtype=np.float64)
+        self._lock = threading.Lock()
+        self._folded_runs: Set[str] = set()
+        # (url, topic) -> (day, scraped_at, metrics) of the scrape currently in the sums
+        self._posts: Dict[Tuple[str, str], Tuple[pd.Timestamp, pd.Timestamp, Tuple[float, ...]]] = {}
+        self._daily = pd.DataFrame(
+            columns=COUNTERS,
+            index=pd.MultiIndex.from_arrays([[], pd.DatetimeIndex([])], names=['topic', 'day']),
+            dtype=np.float64
+        )
+
+    def _archive_rows(self, entry: Dict[str, Any]) -> pd.DataFrame:
+        """One row per (post, topic) of an archived run"""
+        rows = []
+        for post in self.archive.read_entry(entry):
+            url = canonical_url(post.get('url'))
+            if not url:
+                continue
+            metrics = post.get('metrics') or {}
+            for topic in post.get('matched_topics', []):
+                rows.append((url, topic.lower(), post.get('date'), post.get('scraped_at'),
+                             *(metrics.get(metric, 0) for metric in METRICS)))
+        frame = pd.DataFrame(rows, columns=ROW_COLUMNS)
+        frame['date'] = _to_timestamps(frame['date'])
+        frame['scraped_at'] = _to_timestamps(frame['scraped_at'])
+        return frame
+
+    def _parquet_rows(self, run_ids: Set[str], since: pd.Timestamp) -> pd.DataFrame:
+        """One row per (post, topic) of compacted runs, reading only partitions scraped since `since`"""
+        frame = self.exporter.load(
+            start=since.date(),
+            columns=['run_id', 'url', 'topics', 'post_date', 'scraped_at'] + METRICS
+        )
+        frame = frame[frame['run_id'].isin(run_ids)].explode('topics').dropna(subset=['topics'])
+        frame['topic'] = frame['topics'].str.lower()
+        return frame.rename(columns={'post_date': 'date'})[ROW_COLUMNS]
+
+    def _read_runs(self, entries: List[Dict[str, Any]], horizon: pd.Timestamp) -> Tuple[List[pd.DataFrame], List[str]]:
+        """Rows of the given runs and the ids of the runs that could be read"""
+        frames, read = [], []
+        compacted = set(self.exporter.compacted_runs()) if self.exporter else set()
+        from_parquet = [entry for entry in entries if entry['run_id'] in compacted]
+        if from_parquet:
+            # A run's posts are scraped on or after the day it started
+            since = max(horizon, min(pd.Timestamp(entry['started_at']).normalize() for entry in from_parquet))
+            try:
+                frames.append(self._parquet_rows({entry['run_id'] for entry in from_parquet}, since))
+                read.extend(entry['run_id'] for entry in from_parquet)
+            except (OSError, ValueError, pa.ArrowException) as e:
+                logger.error(f"Error reading compacted runs, falling back to the archive: {str(e)}")
+
+        for entry in entries:
+            if entry['run_id'] in read:
+                continue
+            try:
+                frames.append(self._archive_rows(entry))
+            except (OSError, ValueError) as e:
+                logger.error(f"Error reading archived run {entry['run_id']}: {str(e)}")
+                continue
+            read.append(entry['run_id'])
+        return frames, read
+
+    def _fold(self, frame: pd.DataFrame, horizon: pd.Timestamp) -> int:
+        """Fold rows into the sums, replacing older scrapes of the same (post, topic). Returns rows applied"""
+        frame = frame.assign(day=frame['date'].fillna(frame['scraped_at']).dt.normalize())
+        frame = frame.dropna(subset=['day', 'scraped_at'])
+        frame = frame[frame['day'] >= horizon].sort_values('scraped_at', kind='stable').copy()
+        frame[METRICS] = frame[METRICS].fillna(0).astype(np.float64)
+
+        deltas, applied = [], 0
+        for url, topic, day, scraped_at, *metrics in frame[['url', 'topic', 'day', 'scraped_at'] + METRICS].itertuples(index=False, name=None):
+            key = (url, topic)
+            previous = self._posts.get(key)
+            if previous:
+                if previous[1] >= scraped_at:
+                    continue
+                # A post stays on the day it was first counted; only its metrics move
+                day = previous[0]
+                deltas.append((topic, day, -1.0, *(-value for value in previous[2])))
+            self._posts[key] = (day, scraped_at, tuple(metrics))
+            deltas.append((topic, day, 1.0, *metrics))
+            applied += 1
+
+        if deltas:
+            delta = pd.DataFrame(deltas, columns=['topic', 'day', 'posts'] + METRICS)
+            delta['engagement'] = delta[METRICS].to_numpy() @ self._weights
+            self._daily = self._daily.add(delta.groupby(['topic', 'day'])[COUNTERS].sum(), fill_value=0)
+        return applied
+
+    def _expire(self, horizon: pd.Timestamp) -> None:
+        self._posts = {key: state for key, state in self._posts.items() if state[0] >= horizon}
+        self._daily = self._daily[self._daily.index.get_level_values('day') >= horizon]
+
+    def refresh(self, now: Optional[datetime] = None) -> int:
+        """
+        Fold runs archived since the last refresh into the totals
+
+        Args:
+            now (Optional[datetime]): Reference time for the retention horizon; defaults to now
+
+        Returns:
+            int: Number of runs folded in
+        """
+        horizon = pd.Timestamp(now or datetime.now()).normalize() - timedelta(days=Config.TOPIC_TRENDS_RETENTION_DAYS)
+        with self._lock:
+            entries = self.archive.runs()
+            # Runs pruned from the archive never come back, so they need no tracking
+            self._folded_runs &= {entry['run_id'] for entry in entries}
+            entries = [entry for entry in entries if entry['run_id'] not in self._folded_runs]
+
+            frames, read = self._read_runs(entries, horizon) if entries else ([], [])
+            applied = self._fold(pd.concat(frames, ignore_index=True), horizon) if frames else 0
+            self._folded_runs.update(read)
+            self._expire(horizon)
+
+            if read:
+                logger.debug(f"Folded {len(read)} archived runs ({applied} topic post scrapes) into topic trends")
+            return len(read)
+
+    def trends(self, now: Optional[datetime] = None, window_days: int = 7) -> List[Dict[str, Any]]:
+        """
+        Engagement velocity, volume and growth per topic
+
+        The latest window ends today (inclusive) and is compared with the
+        window before it, so week-over-week growth never compares a partial
+        week with a full one.
+
+        Args:
+            now (Optional[datetime]): End of the latest window; defaults to now
+            window_days (int): Window length in days
+
+        Returns:
+            List[Dict[str, Any]]: One entry per topic, highest velocity first
+        """
+        self.refresh(now)
+        with self._lock:
+            daily = self._daily.copy()
+        if daily.empty:
+            return []
+
+        today = pd.Timestamp(now or datetime.now()).normalize()
+        current_start = today - timedelta(days=window_days - 1)
+        previous_start = current_start - timedelta(days=window_days)
+
+        days = daily.index.get_level_values('day')
+        totals = daily.groupby(level='topic').sum()
+        current = daily[(days >= current_start) & (days <= today)].groupby(level='topic').sum().reindex(totals.index, fill_value=0)
+        previous = daily[(days >= previous_start) & (days < current_start)].groupby(level='topic').sum().reindex(totals.index, fill_value=0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            engagement_growth = np.where(previous['engagement'] > 0, current['engagement'] / previous['engagement'] - 1, np.nan)
+            volume_growth = np.where(previous['posts'] > 0, current['posts'] / previous['posts'] - 1, np.nan)
+            engagement_per_post = np.where(current['posts'] > 0, current['engagement'] / current['posts'], 0.0)
+
+        result = pd.DataFrame({
+            'topic': totals.index,
+            'velocity': (current['engagement'] / window_days).to_numpy(),
+            'volume': current['posts'].to_numpy(),
+            'previous_volume': previous['posts'].to_numpy(),
+            'engagement': current['engagement'].to_numpy(),
+            'previous_engagement': previous['engagement'].to_numpy(),
+            'engagement_per_post': engagement_per_post,
+            'wow_engagement_growth': engagement_growth,
+            'wow_volume_growth': volume_growth,
+            'total_posts': totals['posts'].to_numpy(),
+            'total_engagement': totals['engagement'].to_numpy()
+        }).sort_values(['velocity', 'volume'], ascending=False)
+
+        result = result.round(4).astype(object).where(result.notna(), None)
+        for column in ('volume', 'previous_volume', 'total_posts'):
+            result[column] = result[column].astype(int)
+        return result.to_dict(orient='records')
+
+    def status(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'runs_folded': len(self._folded_runs),
+                'topics': int(self._daily.index.get_level_values('topic').nunique()),
+                'topic_posts': len(self._posts)
+            }
+
+
+_topic_trend_analyzer: Optional[TopicTrendAnalyzer] = None
+_topic_trend_analyzer_lock = threading.Lock()
+
+
+def get_topic_trend_analyzer() -> TopicTrendAnalyzer:
+    """Return the process-wide topic trend analyzer"""
+    global _topic_trend_analyzer
+    with _topic_trend_analyzer_lock:
+        if _topic_trend_analyzer is None:
+            _topic_trend_analyzer = TopicTrendAnalyzer()
+        return _topic_trend_analyzer
+
+
+def topic_trend_report(window_days: int = 7, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Compute topic trends and timing for the analytics endpoint"""
+    analyzer = get_topic_trend_analyzer()
+    start_time = time.perf_counter()
+    topics = analyzer.trends(window_days=window_days)
+    return {
+        'window_days': window_days,
+        'generated_at': datetime.now().isoformat(),
+        'compute_ms': round((time.perf_counter() - start_time) * 1000, 1),
+        **analyzer.status(),
+        'topics': topics[:limit] if limit else topics
+    }